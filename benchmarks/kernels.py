@@ -0,0 +1,58 @@
+"""Compares the compiled kernels of the numpy core against the NumPy
+expressions they replace. Requires numba.
+
+Usage: python benchmarks/kernels.py [locations] [activities]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from economic_complexity.numpy import _kernels
+
+
+def timeit(label: str, func, repeat: int = 5):
+    results = {}
+    for enabled in (False, True):
+        _kernels.ENABLED = enabled
+        func()  # warm up, and compile the kernels
+        results[enabled] = min(_elapsed(func) for _ in range(repeat))
+    speedup = results[False] / results[True]
+    print(
+        f"{label:<20} numpy {results[False] * 1000:>9.1f} ms"
+        f"   numba {results[True] * 1000:>9.1f} ms   x{speedup:.1f}"
+    )
+
+
+def _elapsed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(locations: int = 2000, activities: int = 5000):
+    if not _kernels.HAS_NUMBA:
+        raise SystemExit("numba is not installed")
+
+    rng = np.random.default_rng(0)
+    rcas = rng.lognormal(-0.5, 1, size=(locations, activities))
+    mcp = np.greater_equal(rcas, 1).astype(float)
+    cooccurrence = mcp.T.dot(mcp)
+    kp0 = mcp.sum(axis=0)
+    wcp = rng.random((locations, activities))
+    pci = rng.normal(size=activities)
+    pci[rng.random(activities) < 0.1] = np.nan
+
+    print(f"{locations} locations, {activities} activities")
+    timeit("proximity_ratio", lambda: _kernels.proximity_ratio(cooccurrence, kp0))
+    timeit(
+        "cross_minimum",
+        lambda: _kernels.cross_minimum(cooccurrence, kp0, kp0[::-1].copy()),
+    )
+    timeit("masked_zscore", lambda: _kernels.masked_zscore(wcp, rcas, 1))
+    timeit("masked_mean", lambda: _kernels.masked_mean(rcas, pci, 1))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
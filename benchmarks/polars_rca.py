@@ -0,0 +1,88 @@
+"""Compares the window-expression RCA of the polars backend against the
+previous implementation, based on group-by aggregations joined back to the
+tidy frame.
+
+Usage: python benchmarks/polars_rca.py [locations] [activities] [years]
+"""
+
+import sys
+import time
+
+import numpy as np
+import polars as pl
+
+from economic_complexity.polars import rca
+
+params = {"activity": "activity", "location": "location", "measure": "value"}
+
+
+def join_rca(lf: pl.LazyFrame, *, activity: str, location: str, measure: str):
+    lf = lf.fill_nan(0).fill_null(0)
+    total_activity = lf.group_by(activity).agg(
+        pl.sum(measure).alias("_sum_by_activity")
+    )
+    total_location = lf.group_by(location).agg(
+        pl.sum(measure).alias("_sum_by_location")
+    )
+    merged = lf.join(total_activity, on=activity).join(total_location, on=location)
+    rca_expr = (pl.col(measure) / pl.col("_sum_by_location")) / (
+        pl.col("_sum_by_activity") / pl.sum(measure)
+    )
+    return merged.with_columns(rca_expr.alias(measure + " RCA")).drop(
+        ["_sum_by_activity", "_sum_by_location"]
+    )
+
+
+def make_data(locations: int, activities: int, years: int) -> pl.DataFrame:
+    rng = np.random.default_rng(0)
+    size = locations * activities * years
+    return pl.DataFrame(
+        {
+            "year": np.repeat(np.arange(years), locations * activities),
+            "location": np.tile(np.repeat(np.arange(locations), activities), years),
+            "activity": np.tile(np.arange(activities), locations * years),
+            "value": rng.lognormal(10, 2, size=size),
+        }
+    )
+
+
+def timeit(label: str, func, repeat: int = 3):
+    best = min(_elapsed(func) for _ in range(repeat))
+    print(f"{label:<40} {best * 1000:>10.1f} ms")
+
+
+def _elapsed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(locations: int = 1000, activities: int = 5000, years: int = 1):
+    df = make_data(locations, activities, years)
+    print(f"{df.height:,} rows, {years} year(s)")
+
+    lf = df.filter(pl.col("year") == 0).lazy()
+    timeit("join (one year)", lambda: join_rca(lf, **params).collect())
+    timeit("window (one year)", lambda: rca(lf, **params).collect())
+    timeit(
+        "window, sparse (one year)",
+        lambda: rca(lf, sparse=True, **params).collect(),
+    )
+
+    if years > 1:
+        lf = df.lazy()
+        timeit(
+            "join (loop over years)",
+            lambda: pl.concat(
+                join_rca(lf.filter(pl.col("year") == year), **params).collect()
+                for year in range(years)
+            ),
+        )
+        timeit(
+            "window (group by year)",
+            lambda: rca(lf, group="year", **params).collect(),
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
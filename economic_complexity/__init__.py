@@ -1,38 +1,163 @@
 """Economic Complexity calculations module.
 
 This module contains functions to ease the calculation of Economic Complexity values.
+
+The names exported by this module are loaded on first access, so importing the
+package doesn't require pandas, and using the `economic_complexity.polars` or
+`economic_complexity.numpy` interfaces doesn't pay the import cost of pandas.
 """
 
-from .complexity import complexity
-from .cross_space import cross_proximity, cross_relatedness
-from .product_space import (
-    distance,
-    opportunity_gain,
-    peii,
-    pgi,
-    proximity,
-    relatedness,
-    relative_relatedness,
-    similarity,
-)
-from .rca import rca
-from .subnational import complexity_subnational
+import importlib
+import sys
+import types
+from typing import TYPE_CHECKING
 
 __version_info__ = ("0", "3", "0")
 __version__ = ".".join(__version_info__)
 
 __all__ = (
+    "Backtest",
+    "ComplexityState",
+    "PortfolioScorer",
+    "PortfolioScores",
+    "ProximitySignificance",
+    "RankingIndex",
+    "RollingWindow",
+    "Rollup",
+    "SharedArrays",
+    "WhatIf",
+    "attach_shared",
+    "backbone",
+    "backtest",
+    "cached_artifact",
     "complexity",
     "complexity_subnational",
     "cross_proximity",
     "cross_relatedness",
     "distance",
+    "input_hash",
+    "load_artifact",
     "opportunity_gain",
     "peii",
     "pgi",
     "proximity",
+    "proximity_significance",
+    "publish_shared",
     "rca",
     "relatedness",
     "relative_relatedness",
+    "rolling_rca",
+    "rollup",
+    "save_artifact",
     "similarity",
+    "stream_tidy",
+    "what_if",
+    "write_tidy",
 )
+
+# Maps each exported name to the submodule where it is defined
+_LAZY_IMPORTS = {
+    "Backtest": ".backtest",
+    "ComplexityState": ".complexity",
+    "PortfolioScorer": ".scorer",
+    "PortfolioScores": ".scorer",
+    "ProximitySignificance": ".null_model",
+    "RankingIndex": ".query",
+    "RollingWindow": ".rolling",
+    "Rollup": ".hierarchy",
+    "SharedArrays": ".shared",
+    "WhatIf": ".scenarios",
+    "attach_shared": ".shared",
+    "backbone": ".backbone",
+    "backtest": ".backtest",
+    "cached_artifact": ".artifacts",
+    "complexity": ".complexity",
+    "complexity_subnational": ".subnational",
+    "cross_proximity": ".cross_space",
+    "cross_relatedness": ".cross_space",
+    "distance": ".product_space",
+    "input_hash": ".artifacts",
+    "load_artifact": ".artifacts",
+    "opportunity_gain": ".product_space",
+    "peii": ".product_space",
+    "pgi": ".product_space",
+    "proximity": ".product_space",
+    "proximity_significance": ".null_model",
+    "publish_shared": ".shared",
+    "rca": ".rca",
+    "relatedness": ".product_space",
+    "relative_relatedness": ".product_space",
+    "rolling_rca": ".rolling",
+    "rollup": ".hierarchy",
+    "save_artifact": ".artifacts",
+    "similarity": ".product_space",
+    "stream_tidy": ".streaming",
+    "what_if": ".scenarios",
+    "write_tidy": ".streaming",
+}
+
+if TYPE_CHECKING:
+    from .artifacts import cached_artifact, input_hash, load_artifact, save_artifact
+    from .backbone import backbone
+    from .backtest import Backtest, backtest
+    from .complexity import ComplexityState, complexity
+    from .cross_space import cross_proximity, cross_relatedness
+    from .hierarchy import Rollup, rollup
+    from .null_model import ProximitySignificance, proximity_significance
+    from .product_space import (
+        distance,
+        opportunity_gain,
+        peii,
+        pgi,
+        proximity,
+        relatedness,
+        relative_relatedness,
+        similarity,
+    )
+    from .query import RankingIndex
+    from .rca import rca
+    from .rolling import RollingWindow, rolling_rca
+    from .scenarios import WhatIf, what_if
+    from .scorer import PortfolioScorer, PortfolioScores
+    from .shared import SharedArrays, attach_shared, publish_shared
+    from .streaming import stream_tidy, write_tidy
+    from .subnational import complexity_subnational
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+
+    if module_name is None:
+        # Allow access to submodules like `economic_complexity.polars`
+        try:
+            return importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as exc:
+            if exc.name != f"{__name__}.{name}":
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _PackageModule(types.ModuleType):
+    """Prevents the import system from replacing an exported function with the
+    submodule of the same name (like `rca` and `complexity`) when the submodule
+    is loaded by another module before the function is accessed."""
+
+    def __setattr__(self, name: str, value):
+        if (
+            name in _LAZY_IMPORTS
+            and isinstance(value, types.ModuleType)
+            and value.__name__ == f"{__name__}.{name}"
+        ):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _PackageModule
@@ -0,0 +1,51 @@
+"""Helpers to move data between pandas objects and the numpy core.
+
+Instead of letting pandas align the labels of the operands on each operation,
+the labels are resolved once into positional indexers, and the values are
+passed to the numpy core as plain arrays.
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .numpy.labels import take
+
+
+def to_array(obj: Union[pd.DataFrame, pd.Series]) -> np.ndarray:
+    """Returns the values of a pandas object as a float array, with missing
+    values as NaN. Avoids a copy when the object already holds float64 data."""
+    return obj.to_numpy(dtype=float, na_value=np.nan)
+
+
+def aligned(
+    df: pd.DataFrame,
+    index: pd.Index,
+    columns: Optional[pd.Index] = None,
+) -> np.ndarray:
+    """Returns the values of `df` with its rows in the order of `index`, and
+    optionally its columns in the order of `columns`. Like the implicit
+    alignment of `pandas.DataFrame.dot`, both must contain the same labels."""
+    values = to_array(df)
+    if not df.index.equals(index):
+        values = values[_positions(df.index, index)]
+    if columns is not None and not df.columns.equals(columns):
+        values = values[:, _positions(df.columns, columns)]
+    return values
+
+
+def reindexed(series: pd.Series, labels: pd.Index) -> np.ndarray:
+    """Returns the values of `series` in the order of `labels`, using NaN for
+    the labels not present in the series."""
+    values = to_array(series)
+    if series.index.equals(labels):
+        return values
+    return take(values, series.index.get_indexer(labels))
+
+
+def _positions(source: pd.Index, target: pd.Index) -> np.ndarray:
+    positions = source.get_indexer(target)
+    if len(source) != len(target) or (positions < 0).any():
+        raise ValueError("matrices are not aligned")
+    return positions
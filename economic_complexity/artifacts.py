@@ -0,0 +1,406 @@
+"""Artifacts module
+
+Stores the outputs of the calculation functions in a binary columnar format,
+so they can be reopened quickly by other processes.
+
+Each artifact is a directory containing one or more `.npy` files with the
+numeric data, and a `meta.json` sidecar with the labels of the rows/columns
+and the metadata of the calculation (cutoff, procedure, iterations, the hash
+of the input data, etc). As the values are stored as plain `.npy` files, they
+can be reopened as memory-mapped arrays: the resulting objects are zero-copy
+views over the page cache, shared by all the processes reading the same file.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import date, datetime, time, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, TypeVar, Union
+
+import numpy as np
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+SCHEMA_FILE = "schema.arrow"
+VALUES_FILE = "values.npy"
+
+PathLike = Union[str, "os.PathLike[str]"]
+T = TypeVar("T")
+
+
+def input_hash(*objs: Any, **params: Any) -> str:
+    """Calculates a stable hash for the input data of a calculation.
+
+    Supports numpy arrays, pandas DataFrame/Series, polars DataFrame/Series,
+    and any JSON-serializable value; other objects raise a TypeError. Keyword
+    arguments are hashed along their names, so the same data with different
+    parameters yields different hashes.
+
+    ### Args:
+    * *objs -- The objects to include in the hash.
+
+    ### Keyword Args:
+    * **params -- Named parameters to include in the hash.
+
+    ### Returns:
+    (str) -- An hexadecimal digest of the input.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for obj in objs:
+        _update_hash(hasher, obj)
+    for key in sorted(params):
+        hasher.update(key.encode("utf-8"))
+        _update_hash(hasher, params[key])
+    return hasher.hexdigest()
+
+
+def save_artifact(
+    path: PathLike,
+    obj: Any,
+    *,
+    params: Optional[Mapping[str, Any]] = None,
+    input_hash: Optional[str] = None,
+) -> Path:
+    """Saves the result of a calculation as an artifact directory.
+
+    Supported objects are numpy arrays, pandas DataFrame/Series with numeric
+    values, polars DataFrames, and tuples of the former (like the output of
+    the `complexity` function). If an artifact already exists in `path`, it
+    will be replaced. The files are written in a temporary directory first,
+    so readers never get a partially written artifact.
+
+    ### Args:
+    * path (str | os.PathLike) -- The directory where the artifact will be stored.
+    * obj (Any) -- The object to store.
+
+    ### Keyword Args:
+    * params (Mapping[str, Any], optional) -- The parameters used in the
+        calculation, like `cutoff`, `procedure` or `iterations`. Must be
+        JSON-serializable.
+    * input_hash (str, optional) -- The hash of the input data, as returned
+        by the `input_hash` function.
+
+    ### Returns:
+    (pathlib.Path) -- The path to the artifact directory.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    tmpdir = Path(tempfile.mkdtemp(prefix=f".{target.name}.", dir=target.parent))
+    try:
+        meta = _write_object(tmpdir, obj)
+        meta.update(
+            {
+                "format": FORMAT_VERSION,
+                "created": datetime.now(timezone.utc).isoformat(),
+                "params": dict(params or {}),
+                "input_hash": input_hash,
+            }
+        )
+        with open(tmpdir / META_FILE, "w", encoding="utf-8") as fileio:
+            json.dump(meta, fileio, default=_json_default)
+
+        if target.exists():
+            shutil.rmtree(target)
+        os.replace(tmpdir, target)
+    except BaseException:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        raise
+
+    return target
+
+
+def load_artifact(path: PathLike, *, mmap: bool = True) -> Any:
+    """Loads an artifact stored with the `save_artifact` function.
+
+    ### Args:
+    * path (str | os.PathLike) -- The directory of the artifact.
+
+    ### Keyword Args:
+    * mmap (bool, optional) -- Open the arrays as read-only memory-mapped
+        files. The returned objects will be zero-copy views over the files.
+        Default value: `True`.
+
+    ### Returns:
+    (Any) -- The object in the same type it was saved.
+    """
+    source = Path(path)
+    return _read_object(source, read_metadata(source), mmap=mmap)
+
+
+def read_metadata(path: PathLike) -> Dict[str, Any]:
+    """Returns the contents of the metadata sidecar of an artifact.
+
+    ### Args:
+    * path (str | os.PathLike) -- The directory of the artifact.
+
+    ### Returns:
+    (dict) -- The metadata of the artifact.
+    """
+    with open(Path(path) / META_FILE, encoding="utf-8") as fileio:
+        meta = json.load(fileio)
+
+    if meta.get("format") != FORMAT_VERSION:
+        raise ValueError(
+            "Artifact at '%s' uses an unsupported format version: %r"
+            % (path, meta.get("format"))
+        )
+    return meta
+
+
+def cached_artifact(
+    path: PathLike,
+    func: Callable[..., T],
+    *args: Any,
+    mmap: bool = True,
+    **kwargs: Any,
+) -> T:
+    """Returns the result of `func(*args, **kwargs)`, reusing a stored artifact
+    if it was calculated from the same inputs.
+
+    The hash of the positional and keyword arguments (and the name of the
+    function) is compared against the hash stored in the artifact at `path`;
+    if they match, the artifact is loaded instead of calling the function.
+    Otherwise, the function is called and its result is saved in `path`.
+
+    ```
+    prox = cached_artifact("out/proximity", proximity, rcas, cutoff=1)
+    ```
+
+    ### Args:
+    * path (str | os.PathLike) -- The directory of the artifact.
+    * func (Callable) -- The calculation function.
+    * *args -- Positional arguments for the function.
+
+    ### Keyword Args:
+    * mmap (bool, optional) -- Open the stored artifact as memory-mapped files.
+        Default value: `True`.
+    * **kwargs -- Keyword arguments for the function.
+
+    ### Returns:
+    (Any) -- The result of the calculation.
+    """
+    func_name = "%s.%s" % (func.__module__, func.__qualname__)
+    digest = input_hash(func_name, *args, **kwargs)
+
+    source = Path(path)
+    if (source / META_FILE).exists():
+        try:
+            meta = read_metadata(source)
+        except ValueError:
+            meta = {}
+        if meta.get("input_hash") == digest:
+            return _read_object(source, meta, mmap=mmap)
+
+    result = func(*args, **kwargs)
+    params = {key: value for key, value in kwargs.items() if _is_json_scalar(value)}
+    params["function"] = func_name
+    save_artifact(source, result, params=params, input_hash=digest)
+    return result
+
+
+def _write_object(folder: Path, obj: Any) -> Dict[str, Any]:
+    """Writes the data files of an object in a folder, and returns the
+    metadata needed to rebuild it."""
+    if isinstance(obj, tuple):
+        items = []
+        for i, item in enumerate(obj):
+            subfolder = folder / str(i)
+            subfolder.mkdir()
+            items.append(_write_object(subfolder, item))
+        return {"kind": "tuple", "items": items}
+
+    if isinstance(obj, np.ndarray):
+        _save_array(folder / VALUES_FILE, obj)
+        return {"kind": "numpy.ndarray"}
+
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(obj, (pd.DataFrame, pd.Series)):
+        _save_array(folder / VALUES_FILE, obj.to_numpy())
+        if isinstance(obj, pd.Series):
+            return {
+                "kind": "pandas.Series",
+                "name": obj.name,
+                "index": _dump_index(obj.index),
+            }
+        return {
+            "kind": "pandas.DataFrame",
+            "index": _dump_index(obj.index),
+            "columns": _dump_index(obj.columns),
+        }
+
+    pl = sys.modules.get("polars")
+    if pl is not None and isinstance(obj, pl.DataFrame):
+        # an empty frame keeps the exact dtypes, the columns are cast back to
+        # them when loaded
+        obj.head(0).write_ipc(folder / SCHEMA_FILE)
+        columns = []
+        for i, series in enumerate(obj.iter_columns()):
+            filename = "col_%d.npy" % i
+            nulls = None
+            if series.dtype.is_numeric() or series.dtype.is_temporal():
+                # temporal values are stored in their physical integer form
+                categories = None
+                physical = series.to_physical()
+                if physical.null_count() > 0:
+                    nulls = "nulls_%d.npy" % i
+                    _save_array(folder / nulls, physical.is_null().to_numpy())
+                    physical = physical.fill_null(0)
+                _save_array(folder / filename, physical.to_numpy())
+            else:
+                uniques = series.unique(maintain_order=True)
+                codes = series.replace_strict(
+                    uniques,
+                    pl.int_range(len(uniques), eager=True),
+                    return_dtype=pl.UInt32,
+                )
+                categories = uniques.to_list()
+                _save_array(folder / filename, codes.to_numpy())
+            columns.append(
+                {
+                    "name": series.name,
+                    "dtype": str(series.dtype),
+                    "file": filename,
+                    "nulls": nulls,
+                    "categories": categories,
+                }
+            )
+        return {"kind": "polars.DataFrame", "schema": SCHEMA_FILE, "columns": columns}
+
+    raise TypeError("Object of type '%s' can't be stored as an artifact" % type(obj))
+
+
+def _read_object(folder: Path, meta: Dict[str, Any], *, mmap: bool) -> Any:
+    """Rebuilds an object from the data files in a folder and its metadata."""
+    kind = meta["kind"]
+    mmap_mode = "r" if mmap else None
+
+    if kind == "tuple":
+        return tuple(
+            _read_object(folder / str(i), item, mmap=mmap)
+            for i, item in enumerate(meta["items"])
+        )
+
+    if kind == "numpy.ndarray":
+        return np.load(folder / VALUES_FILE, mmap_mode=mmap_mode)
+
+    if kind in ("pandas.DataFrame", "pandas.Series"):
+        import pandas as pd
+
+        values = np.load(folder / VALUES_FILE, mmap_mode=mmap_mode)
+        index = _load_index(meta["index"])
+        if kind == "pandas.Series":
+            return pd.Series(values, index=index, name=meta["name"], copy=False)
+        columns = _load_index(meta["columns"])
+        return pd.DataFrame(values, index=index, columns=columns, copy=False)
+
+    if kind == "polars.DataFrame":
+        import polars as pl
+
+        schema = pl.read_ipc_schema(folder / meta["schema"])
+        columns = []
+        for column in meta["columns"]:
+            name = column["name"]
+            values = np.load(folder / column["file"], mmap_mode=mmap_mode)
+            if column["categories"] is None:
+                series = pl.Series(name, values)
+            else:
+                series = pl.Series(name, column["categories"]).gather(values)
+            if column["nulls"] is not None:
+                nulls = np.load(folder / column["nulls"])
+                series = series.scatter(np.flatnonzero(nulls), None)
+            columns.append(series.cast(schema[name]))
+        return pl.DataFrame(columns)
+
+    raise ValueError("Artifact kind '%s' is unknown" % kind)
+
+
+def _save_array(path: Path, values: np.ndarray):
+    """Saves a numeric array as a `.npy` file, rejecting object arrays."""
+    if values.dtype.kind not in "biuf":
+        raise TypeError(
+            "Only numeric arrays can be stored as artifacts, got dtype '%s'"
+            % values.dtype
+        )
+    np.save(path, values, allow_pickle=False)
+
+
+def _dump_index(index) -> Dict[str, Any]:
+    """Serializes a pandas Index to a JSON-compatible dict."""
+    return {
+        "names": list(index.names),
+        "values": index.tolist(),
+    }
+
+
+def _load_index(data: Dict[str, Any]):
+    """Rebuilds a pandas Index from the output of `_dump_index`."""
+    import pandas as pd
+
+    names: List[Any] = data["names"]
+    if len(names) > 1:
+        return pd.MultiIndex.from_tuples(
+            [tuple(item) for item in data["values"]], names=names
+        )
+    return pd.Index(data["values"], name=names[0])
+
+
+def _update_hash(hasher, obj: Any):
+    """Feeds the contents of an object to a hashlib hasher."""
+    if isinstance(obj, np.ndarray):
+        hasher.update(str((obj.dtype.str, obj.shape)).encode("utf-8"))
+        if obj.dtype.kind in "biufcmM":
+            hasher.update(np.ascontiguousarray(obj).data)
+        else:
+            hasher.update(json.dumps(obj.tolist(), default=str).encode("utf-8"))
+        return
+
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(obj, (pd.DataFrame, pd.Series)):
+        hasher.update(type(obj).__name__.encode("utf-8"))
+        _update_hash(hasher, _dump_index(obj.index))
+        if isinstance(obj, pd.DataFrame):
+            _update_hash(hasher, _dump_index(obj.columns))
+        else:
+            _update_hash(hasher, obj.name)
+        _update_hash(hasher, obj.to_numpy())
+        return
+
+    pl = sys.modules.get("polars")
+    if pl is not None and isinstance(obj, pl.LazyFrame):
+        obj = obj.collect()
+    if pl is not None and isinstance(obj, pl.DataFrame):
+        hasher.update(b"polars.DataFrame")
+        for series in obj.iter_columns():
+            _update_hash(hasher, series)
+        return
+    if pl is not None and isinstance(obj, pl.Series):
+        hasher.update(str((obj.name, obj.dtype)).encode("utf-8"))
+        if obj.dtype.is_numeric() or obj.dtype.is_temporal():
+            _update_hash(hasher, obj.to_physical().to_numpy())
+        else:
+            _update_hash(hasher, obj.to_list())
+        return
+
+    dumped = json.dumps(obj, sort_keys=True, default=_json_default)
+    hasher.update(dumped.encode("utf-8"))
+
+
+def _is_json_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (bool, int, float, str))
+
+
+def _json_default(obj: Any):
+    """Converts numpy scalars, sets and dates for the JSON encoder."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    # a repr can include memory addresses, which would make the hash unstable
+    raise TypeError("Object of type '%s' is not JSON serializable" % type(obj))
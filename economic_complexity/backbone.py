@@ -0,0 +1,49 @@
+"""Product Space backbone module
+"""
+
+from typing import Optional
+
+import pandas as pd
+
+from ._pandas import to_array
+from .numpy.backbone import calculate_backbone
+
+
+def backbone(
+    proximities: pd.DataFrame,
+    *,
+    threshold: Optional[float] = None,
+    max_links: Optional[int] = None,
+    name: str = "proximity",
+) -> pd.DataFrame:
+    """Extracts the backbone of a Product Space network: its maximum spanning
+    tree, plus the links with a proximity over a `threshold`.
+
+    ### Args:
+    * proximities (pd.DataFrame) -- A square matrix with the proximity between
+        the elements, as returned by `proximity`.
+
+    ### Keyword Args:
+    * threshold (float, optional) -- Also include the links with a proximity
+        greater or equal than this value. By default, only the spanning tree
+        is returned.
+    * max_links (int, optional) -- The maximum amount of links added over the
+        spanning tree because of the `threshold`, keeping the strongest ones.
+    * name (str, optional) -- The name of the column with the proximity of
+        each link. Default value: `"proximity"`.
+
+    ### Returns:
+    (pd.DataFrame) -- An edge list, with the `source` and `target` elements
+        of each link, and its proximity.
+    """
+    edges, weights = calculate_backbone(
+        to_array(proximities), threshold=threshold, max_links=max_links
+    )
+    labels = proximities.index
+    return pd.DataFrame(
+        {
+            "source": labels[edges[:, 0]],
+            "target": labels[edges[:, 1]],
+            name: weights,
+        }
+    )
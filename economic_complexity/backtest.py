@@ -0,0 +1,140 @@
+"""Relatedness backtesting module
+
+Measures how well the Relatedness of each period predicts the comparative
+advantages that the locations gain (entries) and lose (exits) after a
+horizon, to validate the Principle of Relatedness on a panel of data:
+
+```
+rcas = {year: rca(tbl) for year, tbl in tbls.items()}
+result = backtest(rcas, horizon=5)
+result.summary.loc[2015, "entry_auc"]
+```
+
+See `economic_complexity.numpy.backtest` for the definition of each
+statistic.
+"""
+
+from typing import Hashable, List, Mapping, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from ._pandas import to_array
+from .numpy.backtest import calculate_backtest
+from .numpy.labels import take
+
+
+class Backtest(NamedTuple):
+    """The predictive power of the relatedness of each period."""
+
+    # the pooled statistics, with a row for each period
+    summary: pd.DataFrame
+    # the statistics of each location, with a row for each period
+    auc: pd.DataFrame
+    precision: pd.DataFrame
+
+
+def backtest(
+    rcas: Mapping[Hashable, pd.DataFrame],
+    relatedness: Optional[Mapping[Hashable, pd.DataFrame]] = None,
+    *,
+    horizon: int = 1,
+    cutoff: float = 1,
+    k: int = 10,
+    max_workers: Optional[int] = None,
+) -> Backtest:
+    """Evaluates the relatedness of each period as a predictor of the entries
+    and exits of comparative advantages after `horizon` periods.
+
+    ### Args:
+    * rcas (Mapping[Hashable, pd.DataFrame]) -- The pivoted RCA matrix of each
+        period, in chronological order. The pairs of labels missing in a
+        period are excluded from the comparisons of that period.
+    * relatedness (Mapping[Hashable, pd.DataFrame], optional) -- The
+        relatedness of each period, with the same periods as `rcas`. By
+        default, calculated from the RCA matrix of each period.
+
+    ### Keyword Args:
+    * horizon (int, optional) -- The amount of periods between the prediction
+        and the outcome. Default value: `1`.
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrices. Default value: `1`.
+    * k (int, optional) -- The amount of activities for the precision of each
+        location. Default value: `10`.
+    * max_workers (int, optional) -- The amount of threads used to evaluate
+        the periods.
+
+    ### Returns:
+    (Backtest) -- The statistics keyed by the period of the prediction: the
+        `summary` frame has the `entry_auc`, `exit_auc`, `entries`, `exits`
+        and `precision_at_k` (the mean over the locations) columns, and the
+        `auc` and `precision` frames have a column for each location.
+    """
+    frames = list(rcas.values())
+    if not frames:
+        raise ValueError("At least one period is required")
+
+    index = frames[0].index.append([df.index for df in frames[1:]]).unique()
+    columns = frames[0].columns.append([df.columns for df in frames[1:]]).unique()
+
+    values = np.empty((len(frames), len(index), len(columns)))
+    for df, out in zip(frames, values):
+        _aligned(df, index, columns, out=out)
+
+    scores = None
+    if relatedness is not None:
+        scores = np.empty_like(values)
+        for period, out in zip(rcas, scores):
+            _aligned(relatedness[period], index, columns, out=out)
+
+    results = calculate_backtest(
+        values,
+        scores,
+        horizon=horizon,
+        cutoff=cutoff,
+        k=k,
+        max_workers=max_workers,
+    )
+
+    periods: List[Hashable] = list(rcas)[: len(results)]
+    summary = pd.DataFrame(
+        {
+            "entry_auc": [item.entry_auc for item in results],
+            "exit_auc": [item.exit_auc for item in results],
+            "entries": [item.entries for item in results],
+            "exits": [item.exits for item in results],
+            "precision_at_k": [np.nanmean(item.precision_at_k) for item in results],
+        },
+        index=pd.Index(periods),
+    )
+    return Backtest(
+        summary=summary,
+        auc=pd.DataFrame(
+            np.stack([item.auc_by_location for item in results]),
+            index=summary.index,
+            columns=index,
+        ),
+        precision=pd.DataFrame(
+            np.stack([item.precision_at_k for item in results]),
+            index=summary.index,
+            columns=index,
+        ),
+    )
+
+
+def _aligned(
+    df: pd.DataFrame,
+    index: pd.Index,
+    columns: pd.Index,
+    *,
+    out: np.ndarray,
+) -> np.ndarray:
+    """Writes the values of `df` into `out`, with the rows and columns in the
+    order of `index` and `columns`, using NaN for the missing labels."""
+    values = to_array(df)
+    if not df.index.equals(index):
+        values = take(values, df.index.get_indexer(index))
+    if not df.columns.equals(columns):
+        values = take(values, df.columns.get_indexer(columns), axis=1)
+    np.copyto(out, values)
+    return out
@@ -0,0 +1,302 @@
+"""Command line interface
+
+Runs the models of `economic_complexity.polars` over Parquet or CSV files,
+and writes the results to a directory:
+
+```
+python -m economic_complexity "exports/*.parquet" \\
+    --activity "HS4 ID" --location "Country ID" --measure "Trade Value" \\
+    --period Year --models eci pci relatedness --output results/ --profile
+```
+
+The inputs are scanned lazily, so only the needed columns and rows are read.
+The calculations are declared as a list of `Job`: the jobs of each period
+share the RCA and the intermediate results (like the proximity used by
+`relatedness` and `opportunity_gain`), and the periods run in parallel in a
+pool of worker processes. Each result is written to `{output}/{model}`, with a
+file per period when `--period` is used: frames as Parquet (or CSV) files, and
+matrices as `.npy` files.
+"""
+
+import argparse
+import functools
+import glob
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, TextIO
+
+import numpy as np
+
+from . import __version__
+
+FORMATS = ("parquet", "csv")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Runs the command line interface, and returns the exit status."""
+    try:
+        import polars  # noqa: F401
+    except ImportError:
+        print(
+            "The command line interface needs polars, available with the "
+            "`polars` extra: pip install economic-complexity[polars]",
+            file=sys.stderr,
+        )
+        return 2
+
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    try:
+        paths = expand_paths(args.inputs)
+    except FileNotFoundError as exc:
+        parser.error(str(exc))
+
+    return run_pipeline(
+        paths,
+        models=args.models,
+        output=Path(args.output),
+        activity=args.activity,
+        location=args.location,
+        measure=args.measure,
+        period=args.period,
+        binary=args.binary,
+        cutoff=args.cutoff,
+        iterations=args.iterations,
+        procedure=args.procedure,
+        output_format=args.format,
+        max_workers=args.workers,
+        profile=args.profile,
+    )
+
+
+def run_pipeline(
+    paths: Sequence[str],
+    *,
+    models: Sequence[str],
+    output: Path,
+    activity: str,
+    location: str,
+    measure: str,
+    period: Optional[str] = None,
+    binary: bool = False,
+    cutoff: float = 1,
+    iterations: int = 20,
+    procedure: str = "max",
+    output_format: str = "parquet",
+    max_workers: Optional[int] = None,
+    profile: bool = False,
+    stream: Optional[TextIO] = None,
+) -> int:
+    """Calculates the models over the files in `paths`, one job per model and
+    period, and writes the results to the `output` directory.
+
+    ### Returns:
+    (int) -- The exit status: `0` if all the jobs succeeded, `1` otherwise.
+    """
+    from .polars.jobs import Job, JobResult, run_jobs
+
+    stream = sys.stderr if stream is None else stream
+    started = time.perf_counter()
+    source = functools.partial(scan_sources, tuple(paths))
+
+    periods: List[Any] = [None]
+    if period is not None:
+        periods = (
+            source()
+            .select(period)
+            .unique()
+            .sort(period)
+            .collect()
+            .get_column(period)
+            .to_list()
+        )
+    scanned = time.perf_counter() - started
+
+    jobs = [
+        Job(
+            name=model if value is None else "%s/%s" % (model, value),
+            model=model,  # type: ignore[arg-type]
+            source=source,
+            activity=activity,
+            location=location,
+            measure=measure,
+            filters={} if value is None else {period: value},
+            binary=binary,
+            cutoff=cutoff,
+            iterations=iterations,
+            procedure=procedure,  # type: ignore[arg-type]
+        )
+        for value in periods
+        for model in models
+    ]
+
+    written: Dict[str, float] = {}
+
+    def on_result(job_result: JobResult):
+        if not job_result.ok:
+            error = "%s failed: %r" % (job_result.job.name, job_result.error)
+            print(error, file=stream)
+            return
+        start = time.perf_counter()
+        job_result.path = write_result(
+            output / job_result.job.name, job_result.result, output_format
+        )
+        written[job_result.job.name] = time.perf_counter() - start
+
+    output.mkdir(parents=True, exist_ok=True)
+    results = run_jobs(jobs, max_workers=max_workers, on_result=on_result)
+
+    if profile:
+        print_profile(
+            results,
+            scanned=scanned,
+            written=written,
+            elapsed=time.perf_counter() - started,
+            stream=stream,
+        )
+
+    return 0 if all(item.ok for item in results) else 1
+
+
+def scan_sources(paths: Sequence[str]):
+    """Returns a LazyFrame over a list of Parquet or CSV files. Defined at the
+    module level, so it can be sent to the worker processes."""
+    import polars as pl
+
+    if all(path.endswith(".csv") for path in paths):
+        return pl.concat([pl.scan_csv(path) for path in paths])
+    return pl.scan_parquet(list(paths))
+
+
+def expand_paths(patterns: Sequence[str]) -> List[str]:
+    """Expands the glob patterns of the inputs, in order."""
+    paths: List[str] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matches or not all(os.path.isfile(path) for path in matches):
+            raise FileNotFoundError("No input files match '%s'" % pattern)
+        paths.extend(matches)
+    return paths
+
+
+def write_result(path: Path, result: Any, output_format: str = "parquet") -> Path:
+    """Writes the result of a model: frames as Parquet or CSV files, matrices
+    as `.npy` files, and other objects as artifacts."""
+    import polars as pl
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if isinstance(result, pl.DataFrame):
+        target = path.with_name(path.name + "." + output_format)
+        if output_format == "csv":
+            result.write_csv(target)
+        else:
+            result.write_parquet(target)
+        return target
+
+    if isinstance(result, np.ndarray):
+        target = path.with_name(path.name + ".npy")
+        np.save(target, result, allow_pickle=False)
+        return target
+
+    from .artifacts import save_artifact
+
+    return save_artifact(path, result)
+
+
+def print_profile(
+    results: Sequence[Any],
+    *,
+    scanned: float,
+    written: Dict[str, float],
+    elapsed: float,
+    stream: TextIO,
+):
+    """Prints the seconds spent in each stage of each job, and the peak memory
+    of the main and the worker processes."""
+    print("%-32s %10s %10s %10s" % ("job", "rca", "model", "write"), file=stream)
+    for item in sorted(results, key=lambda item: item.job.name):
+        print(
+            "%-32s %10.3f %10.3f %10.3f"
+            % (
+                item.job.name,
+                item.timings.get("rca", float("nan")),
+                item.timings.get(item.job.model, float("nan")),
+                written.get(item.job.name, float("nan")),
+            ),
+            file=stream,
+        )
+    print("scan: %.3fs, total: %.3fs" % (scanned, elapsed), file=stream)
+
+    peak = peak_memory()
+    if peak is not None:
+        print(
+            "peak memory: %.1f MB (main), %.1f MB (largest worker)"
+            % (peak[0] / 2**20, peak[1] / 2**20),
+            file=stream,
+        )
+
+
+def peak_memory():
+    """Returns the peak resident memory of this process and of its largest
+    finished child process, in bytes, or `None` if it's not available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # `ru_maxrss` is in kilobytes on linux, and in bytes on macos
+    scale = 1 if sys.platform == "darwin" else 1024
+    main = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return main * scale, children * scale
+
+
+def _parser() -> argparse.ArgumentParser:
+    from .polars.run import AVAILABLE_MODELS
+
+    parser = argparse.ArgumentParser(
+        prog="python -m economic_complexity",
+        description="Calculates Economic Complexity models from tidy data files.",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Parquet or CSV files, or glob patterns like 'data/*.parquet'.",
+    )
+    parser.add_argument("--activity", required=True, help="The activity column.")
+    parser.add_argument("--location", required=True, help="The location column.")
+    parser.add_argument("--measure", required=True, help="The measure column.")
+    parser.add_argument(
+        "--period",
+        help="A time column; the models are calculated for each of its values.",
+    )
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        required=True,
+        choices=AVAILABLE_MODELS,
+        metavar="MODEL",
+        help="The models to calculate: %s." % ", ".join(AVAILABLE_MODELS),
+    )
+    parser.add_argument(
+        "-o", "--output", required=True, help="The directory for the results."
+    )
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--binary", action="store_true", help="Binarize the RCA.")
+    parser.add_argument("--cutoff", type=float, default=1)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--procedure", choices=("max", "sqrt"), default="max")
+    parser.add_argument(
+        "--workers", type=int, help="The amount of worker processes."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the timings of each stage, and the peak memory.",
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+    return parser
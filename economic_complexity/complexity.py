@@ -6,20 +6,41 @@ symmetric set of variables whose nodes correspond to countries and products.
 """
 
 import logging
-from typing import Tuple
+from typing import NamedTuple, Optional, Tuple, Union
 
 import pandas as pd
 
+from ._pandas import reindexed, to_array
+from .numpy.complexity import calculate_complexity
+from .numpy.planner import Engine
+
 logger = logging.getLogger(__name__)
 
 
+class ComplexityState(NamedTuple):
+    """The state of the reflections method after the last iteration, which
+    can be used as the `initial` vectors of the next period."""
+
+    kc: pd.Series
+    kp: pd.Series
+    iterations: int
+    converged: bool
+
+
 def complexity(
     df_rca: pd.DataFrame,
     *,
     cutoff: float = 1,
     drop: bool = True,
     iterations: int = 20,
-) -> Tuple[pd.Series, pd.Series]:
+    engine: Engine = "auto",
+    initial: Optional[Tuple[pd.Series, pd.Series]] = None,
+    tol: Optional[float] = None,
+    return_state: bool = False,
+) -> Union[
+    Tuple[pd.Series, pd.Series],
+    Tuple[pd.Series, pd.Series, ComplexityState],
+]:
     """Calculates Economic Complexity Index (ECI) and Product Complexity
     Index (PCI) from a RCA matrix.
 
@@ -32,6 +53,18 @@ def complexity(
     pci = pci_value.to_frame(name="PCI").reset_index()
     ```
 
+    In panel data, the calculation of each period can start from the results
+    of the previous one, and stop when the values converge:
+
+    ```
+    state = None
+    for year, df_rca in rcas_by_year.items():
+        initial = None if state is None else (state.kc, state.kp)
+        eci, pci, state = complexity(
+            df_rca, iterations=200, tol=1e-6, initial=initial, return_state=True
+        )
+    ```
+
     ### Args:
     * df_rca (pd.DataFrame) -- Pivotted RCA matrix.
 
@@ -41,38 +74,60 @@ def complexity(
         Default value: `True`.
     * iterations (int, optional) -- Limit of recursive calculations for kp and kc.
         Default value: `20`.
+    * engine (str, optional) -- The execution strategy: `"dense"`, `"sparse"`,
+        `"blocked"`, or `"auto"` to choose the fastest one that fits in the
+        memory budget. See `economic_complexity.numpy.planner`.
+        Default value: `"auto"`.
+    * initial ((pd.Series, pd.Series), optional) -- The vectors to start the
+        reflections from, for the locations and the activities, like the ECI
+        and PCI (or the state) of the previous period. They are aligned by
+        label, and the missing labels get the mean value.
+    * tol (float, optional) -- Stop the iterations when the largest change of
+        the values between two steps is under this value. In that case,
+        `iterations` is the upper limit. By default, all the `iterations`
+        are run.
+    * return_state (bool, optional) -- Also return the `ComplexityState` after
+        the last iteration. Default value: `False`.
 
     ### Returns:
-    ((pd.Series, pd.Series)) -- A tuple of ECI and PCI values.
+    ((pd.Series, pd.Series)) -- A tuple of ECI and PCI values, and the final
+        state if `return_state` is `True`.
     """
-    # Binarize input RCA
-    rcas = df_rca.ge(cutoff).astype(int)
-
     # drop columns / rows only if completely nan
-    rcas_clone = rcas.copy(deep=True)
-    rcas_clone = rcas_clone.dropna(how="all")
-    rcas_clone = rcas_clone.dropna(how="all", axis=1)
+    rcas = df_rca.dropna(how="all")
+    rcas = rcas.dropna(how="all", axis=1)
 
-    if rcas_clone.shape != rcas.shape:
+    if rcas.shape != df_rca.shape:
         logger.warning(
             "RCAs contain columns or rows that are entirely comprised of NaN values."
         )
-    if drop:
-        rcas = rcas_clone
-
-    kp = rcas.sum(axis=0)  # sum columns
-    kc = rcas.sum(axis=1)  # sum rows
-    kp0 = kp.copy()
-    kc0 = kc.copy()
+    if not drop:
+        rcas = df_rca
 
-    for i in range(1, iterations):
-        kc_temp = kc.copy()
-        kp_temp = kp.copy()
-        kp = rcas.T.dot(kc_temp) / kp0
-        if i < (iterations - 1):
-            kc = rcas.dot(kp_temp) / kc0
-
-    geo_complexity = (kc - kc.mean()) / kc.std()
-    prod_complexity = (kp - kp.mean()) / kp.std()
+    if initial is not None:
+        initial = (
+            reindexed(initial[0], rcas.index),
+            reindexed(initial[1], rcas.columns),
+        )
 
+    eci, pci, state = calculate_complexity(
+        to_array(rcas),
+        cutoff=cutoff,
+        iterations=iterations,
+        engine=engine,
+        initial=initial,
+        tol=tol,
+        return_state=True,
+    )
+
+    geo_complexity = pd.Series(eci, index=rcas.index)
+    prod_complexity = pd.Series(pci, index=rcas.columns)
+
+    if return_state:
+        return geo_complexity, prod_complexity, ComplexityState(
+            kc=pd.Series(state.kc, index=rcas.index),
+            kp=pd.Series(state.kp, index=rcas.columns),
+            iterations=state.iterations,
+            converged=state.converged,
+        )
     return geo_complexity, prod_complexity
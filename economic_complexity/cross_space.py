@@ -1,15 +1,19 @@
 """Cross-space module
 """
 
-import numpy as np
 import pandas as pd
 
+from ._pandas import aligned, to_array
+from .numpy.cross_space import calculate_cross_proximity, calculate_cross_relatedness
+from .numpy.planner import Engine
+
 
 def cross_proximity(
     rcas_a: pd.DataFrame,
     rcas_b: pd.DataFrame,
     *,
     cutoff: float = 1,
+    engine: Engine = "auto",
 ) -> pd.DataFrame:
     """Calculates the Cross-proximity index between two matrices of RCA.
 
@@ -32,35 +36,21 @@ def cross_proximity(
     * cutoff (float, optional) -- Set the cutoff threshold value for the RCA matrix.
         Internally, RCA values under it will be set to zero, one otherwise.
         Default value: `1`.
+    * engine (str, optional) -- The execution strategy: `"dense"`, `"blocked"`,
+        or `"auto"` to choose the fastest one that fits in the memory budget.
+        See `economic_complexity.numpy.planner`. Default value: `"auto"`.
 
     ### Returns:
     (pd.DataFrame) -- A matrix with the proximity between the two types of evaluated elements that can be used in the calculation of the cross-relatedness.
     """
-    # Trims RCA values to 0 or 1
-    rcas_a = rcas_a.ge(cutoff).astype(int)
-    rcas_b = rcas_b.ge(cutoff).astype(int)
-
-    # Calculates numerator of array
-    numerator = rcas_a.T.dot(rcas_b)
-
-    # Calculates kp0 for rcas_a and rcas_b
-    kp0_a = rcas_a.sum(axis=0)
-    kp0_a = kp0_a.values.reshape((1, len(kp0_a)))
-
-    kp0_b = rcas_b.sum(axis=0)
-    kp0_b = kp0_b.values.reshape((1, len(kp0_b)))
-
-    # Calculates two possible cross proximity values and replace posibles NaN values
-    a = numerator.divide(kp0_b).fillna(0)
-    b = numerator.divide(kp0_a.T).fillna(0)
-
-    # Compares the two previous arrays, and keeps minimum value of each cell
-    x_proximity = pd.DataFrame(
-        [np.minimum(x, y) for x, y in zip(a.values, b.values)],
-        index=a.index,
-        columns=a.columns,
+    # Both matrices must share the same locations in the same order
+    x_proximity = calculate_cross_proximity(
+        to_array(rcas_a),
+        aligned(rcas_b, rcas_a.index),
+        cutoff=cutoff,
+        engine=engine,
     )
-    return x_proximity
+    return pd.DataFrame(x_proximity, index=rcas_a.columns, columns=rcas_b.columns)
 
 
 def cross_relatedness(
@@ -88,6 +78,9 @@ def cross_relatedness(
     x_relatedness.unstack().reset_index(name="cross_relatedness")
     ```
 
+    For large matrices, `stream_tidy` and `write_tidy` produce the same tidy
+    output a block of locations at a time, without holding the wide matrix.
+
     ### Args:
     * df_rca (pd.DataFrame) -- A pivotted table obtained from the RCA function. This table describes the main characteristic to evaluate.
     * x_proximity (pd.DataFrame) -- The cross-proximity matrix obtained between the `rcas` matrix in the first parameter, and another RCA matrix.
@@ -100,10 +93,10 @@ def cross_relatedness(
     ### Returns:
     (pd.DataFrame) -- A matrix with the probability that a location generates comparative advantages in the characteristic to be evaluated considering its proximity with the other evaluated characteristic.
     """
-    rcas = df_rca.ge(cutoff).astype(int)
-
-    numerator = rcas.dot(x_proximity)
-    denominator = np.ones_like(rcas).dot(x_proximity)
-
-    x_relatedness = numerator / denominator
-    return x_relatedness
+    # cross-proximity rows must follow the order of the RCA columns
+    x_relatedness = calculate_cross_relatedness(
+        to_array(df_rca),
+        aligned(x_proximity, df_rca.columns),
+        cutoff=cutoff,
+    )
+    return pd.DataFrame(x_relatedness, index=df_rca.index, columns=x_proximity.columns)
@@ -0,0 +1,115 @@
+"""Hierarchical roll-ups module
+
+Calculates the indicators for several levels of the location and activity
+classifications (like HS2, HS4 and HS6, or regions and municipalities) from a
+single pivoted table at the base level of both hierarchies.
+
+```
+levels = rollup(
+    tbl,
+    activities={"hs2": hs6_to_hs2, "hs4": hs6_to_hs4, "hs6": None},
+)
+eci_hs4 = levels[("base", "hs4")].eci
+```
+"""
+
+from typing import Dict, Hashable, Mapping, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from ._pandas import to_array
+from .numpy.hierarchy import calculate_rollup
+from .numpy.labels import encode
+
+Levels = Mapping[Hashable, Optional[pd.Series]]
+
+
+class Rollup(NamedTuple):
+    """The indicators calculated for a combination of levels."""
+
+    tbl: pd.DataFrame
+    rca: pd.DataFrame
+    eci: pd.Series
+    pci: pd.Series
+
+
+def rollup(
+    tbl: pd.DataFrame,
+    *,
+    locations: Optional[Levels] = None,
+    activities: Optional[Levels] = None,
+    cutoff: float = 1,
+    iterations: int = 20,
+) -> Dict[Tuple[Hashable, Hashable], Rollup]:
+    """Calculates the RCA, ECI and PCI for every combination of location and
+    activity levels, from a pivoted table at the base level.
+
+    ### Args:
+    * tbl (pd.DataFrame) -- A pivoted table using the base-level locations as
+        index, the base-level activities as columns, and the measurement of
+        the data as values.
+
+    ### Keyword Args:
+    * locations (Mapping[Hashable, pd.Series | None], optional) -- The
+        location levels to calculate, as a mapping from the name of the level
+        to a Series with the parent of each base-level location at that level.
+        Use `None` for the base level. Default value: `{"base": None}`.
+    * activities (Mapping[Hashable, pd.Series | None], optional) -- The
+        activity levels to calculate, the same as `locations`, for the
+        columns. Default value: `{"base": None}`.
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrices. Default value: `1`.
+    * iterations (int, optional) -- Limit of recursive calculations for kp
+        and kc. Default value: `20`.
+
+    ### Returns:
+    (Dict[(Hashable, Hashable), Rollup]) -- The indicators for each
+        combination of levels, keyed by `(location level, activity level)`.
+    """
+    locations = {"base": None} if locations is None else locations
+    activities = {"base": None} if activities is None else activities
+
+    location_codes = {
+        name: _parents(parents, tbl.index) for name, parents in locations.items()
+    }
+    activity_codes = {
+        name: _parents(parents, tbl.columns) for name, parents in activities.items()
+    }
+
+    levels = calculate_rollup(
+        to_array(tbl),
+        locations={name: codes for name, (_, codes) in location_codes.items()},
+        activities={name: codes for name, (_, codes) in activity_codes.items()},
+        cutoff=cutoff,
+        iterations=iterations,
+    )
+
+    results = {}
+    for (location_level, activity_level), level in levels.items():
+        index = location_codes[location_level][0]
+        columns = activity_codes[activity_level][0]
+        results[(location_level, activity_level)] = Rollup(
+            tbl=pd.DataFrame(level.tbl, index=index, columns=columns),
+            rca=pd.DataFrame(level.rca, index=index, columns=columns),
+            eci=pd.Series(level.eci, index=index),
+            pci=pd.Series(level.pci, index=columns),
+        )
+
+    return results
+
+
+def _parents(parents: Optional[pd.Series], labels: pd.Index):
+    """Returns the labels of a level, and the code of the parent of each
+    element of `labels` in them."""
+    if parents is None:
+        return labels, None
+
+    values = parents.reindex(labels)
+    if values.isna().any():
+        raise ValueError(
+            "The parent mapping doesn't contain all the labels: %s"
+            % list(labels[values.isna().to_numpy()][:5])
+        )
+
+    uniques, codes = encode(values.to_numpy())
+    return pd.Index(uniques, name=parents.name or labels.name), codes
@@ -0,0 +1,101 @@
+"""Null model module
+
+Tests which links of the Proximity are stronger than expected by chance,
+against random Mcp matrices with the same diversity of each location and the
+same ubiquity of each activity:
+
+```
+result = proximity_significance(df_rca, samples=1000, seed=0)
+links = result.proximity.where(result.pvalues < 0.01)
+```
+
+See `economic_complexity.numpy.null_model`.
+"""
+
+from typing import Literal, NamedTuple, Optional
+
+import pandas as pd
+
+from ._pandas import to_array
+from .numpy.null_model import Seed, calculate_proximity_significance
+
+
+class ProximitySignificance(NamedTuple):
+    """The significance of the Proximity of each pair of activities."""
+
+    proximity: pd.DataFrame
+    # the mean and the standard deviation of the proximity in the null model
+    expected: pd.DataFrame
+    std: pd.DataFrame
+    zscores: pd.DataFrame
+    pvalues: pd.DataFrame
+    samples: int
+
+
+def proximity_significance(
+    df_rca: pd.DataFrame,
+    *,
+    cutoff: float = 1,
+    procedure: Literal["max", "sqrt"] = "max",
+    samples: int = 1000,
+    batchsize: int = 100,
+    burn_in: int = 50,
+    thin: int = 5,
+    seed: Seed = None,
+    max_workers: Optional[int] = None,
+) -> ProximitySignificance:
+    """Compares the Proximity of each pair of activities against random Mcp
+    matrices that preserve the diversity of the locations and the ubiquity of
+    the activities, sampled with the curveball algorithm.
+
+    ### Args:
+    * df_rca (pd.DataFrame) -- Pivotted RCA matrix.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrix. Default value: `1`.
+    * procedure (str, optional) -- Determines how to calcule the denominator
+        of the Proximity. Available options are "sqrt" and "max".
+        Default value: `"max"`.
+    * samples (int, optional) -- The amount of random matrices.
+        Default value: `1000`.
+    * batchsize (int, optional) -- The amount of samples drawn from each
+        independent chain. Default value: `100`.
+    * burn_in (int, optional) -- The amount of curveball steps before the
+        first sample of each chain. Default value: `50`.
+    * thin (int, optional) -- The amount of curveball steps between two
+        samples of a chain. Default value: `5`.
+    * seed (int, optional) -- The seed for the random matrices. The same seed
+        gives the same result, regardless of `max_workers`.
+    * max_workers (int, optional) -- The amount of worker processes.
+
+    ### Returns:
+    (ProximitySignificance) -- The observed Proximity, its expected value and
+        standard deviation under the null model, and the z-score and one-sided
+        p-value of each pair of activities.
+    """
+    result = calculate_proximity_significance(
+        to_array(df_rca),
+        cutoff=cutoff,
+        procedure=procedure,
+        samples=samples,
+        batchsize=batchsize,
+        burn_in=burn_in,
+        thin=thin,
+        seed=seed,
+        max_workers=max_workers,
+    )
+
+    labels = df_rca.columns
+
+    def frame(values):
+        return pd.DataFrame(values, index=labels, columns=labels)
+
+    return ProximitySignificance(
+        proximity=frame(result.proximity),
+        expected=frame(result.expected),
+        std=frame(result.std),
+        zscores=frame(result.zscores),
+        pvalues=frame(result.pvalues),
+        samples=result.samples,
+    )
@@ -0,0 +1,80 @@
+"""Array-level implementation of the Economic Complexity calculations.
+
+All the functions in this module work on plain `numpy.ndarray` matrices, with
+locations as rows and activities as columns, and are used as the common core
+of the pandas and polars interfaces. Matrices are aligned by position; use the
+`encode`, `indexer` and `take` helpers to work with integer-coded labels, and
+the `out` parameter to write the results into preallocated arrays.
+"""
+
+from .backbone import calculate_backbone as backbone
+from .backtest import BacktestPeriod
+from .backtest import calculate_backtest as backtest
+from .complexity import ReflectionState
+from .complexity import calculate_complexity as complexity
+from .cross_space import calculate_cross_proximity as cross_proximity
+from .cross_space import calculate_cross_relatedness as cross_relatedness
+from .hierarchy import aggregate
+from .hierarchy import calculate_rollup as rollup
+from .labels import encode, indexer, pivot, take
+from .null_model import NullProximity, curveball
+from .null_model import calculate_proximity_significance as proximity_significance
+from .planner import plan, set_memory_budget
+from .product_space import calculate_distance as distance
+from .product_space import calculate_opportunity_gain as opportunity_gain
+from .product_space import calculate_pmi as pmi
+from .product_space import calculate_proximity as proximity
+from .product_space import calculate_relatedness as relatedness
+from .product_space import calculate_relative_relatedness as relative_relatedness
+from .product_space import calculate_similarity as similarity
+from .rca import binarize
+from .rca import calculate_rca as rca
+from .rolling import calculate_rolling_rca as rolling_rca
+from .scenarios import Baseline, ScenarioResult, evaluate_scenarios, prepare_baseline
+from .scorer import PortfolioScorer, PortfolioScores
+from .sharded import sharded_complexity, sharded_proximity
+from .streaming import iter_tidy
+from .subnational import calculate_complexity_subnational as complexity_subnational
+from .threads import thread_budget
+
+__all__ = (
+    "BacktestPeriod",
+    "Baseline",
+    "NullProximity",
+    "PortfolioScorer",
+    "PortfolioScores",
+    "ReflectionState",
+    "ScenarioResult",
+    "aggregate",
+    "backbone",
+    "backtest",
+    "binarize",
+    "complexity",
+    "complexity_subnational",
+    "cross_proximity",
+    "cross_relatedness",
+    "curveball",
+    "distance",
+    "encode",
+    "evaluate_scenarios",
+    "indexer",
+    "iter_tidy",
+    "opportunity_gain",
+    "pivot",
+    "plan",
+    "pmi",
+    "prepare_baseline",
+    "proximity",
+    "proximity_significance",
+    "rca",
+    "relatedness",
+    "relative_relatedness",
+    "rolling_rca",
+    "rollup",
+    "set_memory_budget",
+    "sharded_complexity",
+    "sharded_proximity",
+    "similarity",
+    "take",
+    "thread_budget",
+)
@@ -0,0 +1,142 @@
+"""Fused kernels for the element-wise hot spots of the numpy core.
+
+Some steps of the calculations don't map to BLAS operations, and their NumPy
+expressions allocate several temporary matrices of the same size as the
+result. When numba is installed (`pip install economic-complexity[jit]`),
+these steps are compiled into single-pass parallel loops; otherwise, the
+NumPy expressions are used. Both paths return the same values.
+
+The compiled kernels can be disabled setting the environment variable
+`ECONOMIC_COMPLEXITY_JIT=0`, or changing `ENABLED` at runtime.
+"""
+
+import importlib.util
+import os
+import threading
+import warnings
+from typing import Optional
+
+import numpy as np
+
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
+ENABLED = HAS_NUMBA and os.environ.get("ECONOMIC_COMPLEXITY_JIT", "1") != "0"
+
+
+def proximity_ratio(
+    cooccurrence: np.ndarray,
+    kp0: np.ndarray,
+    *,
+    sqrt: bool = False,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Divides the co-occurrence matrix by the maximum (or the geometric mean,
+    if `sqrt`) of the ubiquities of each pair, and sets the diagonal to zero.
+    `out` can be `cooccurrence` itself."""
+    if ENABLED:
+        if out is None:
+            out = np.empty(cooccurrence.shape, dtype=float)
+        return _compiled().proximity_ratio(cooccurrence, kp0.astype(float), sqrt, out)
+
+    kp0_trans = kp0.reshape((len(kp0), 1))
+    if sqrt:
+        denominator = np.power(kp0_trans * kp0, 0.5)
+    else:
+        denominator = np.maximum(kp0, kp0_trans)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        phi = np.divide(cooccurrence, denominator, out=out)
+    np.fill_diagonal(phi, 0)
+    return phi
+
+
+def cross_minimum(
+    numerator: np.ndarray,
+    kp0_a: np.ndarray,
+    kp0_b: np.ndarray,
+    *,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculates the minimum of the two conditional probabilities of the
+    cross-proximity, `numerator / kp0_b` and `numerator / kp0_a.T`, with
+    undefined values set to zero. `out` can be `numerator` itself."""
+    if ENABLED:
+        if out is None:
+            out = np.empty(numerator.shape, dtype=float)
+        return _compiled().cross_minimum(
+            numerator, kp0_a.astype(float), kp0_b.astype(float), out
+        )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        b = numerator / kp0_a.reshape((len(kp0_a), 1))
+        a = np.divide(numerator, kp0_b, out=out)
+    a[np.isnan(a)] = 0
+    b[np.isnan(b)] = 0
+    return np.minimum(a, b, out=a)
+
+
+def masked_zscore(
+    values: np.ndarray,
+    rcas: np.ndarray,
+    cutoff: float,
+) -> np.ndarray:
+    """Standardizes each row of `values`, using the mean and the standard
+    deviation (`ddof=1`) of the elements where `rcas` is under the `cutoff`.
+    If the `cutoff` is zero, all the non-NaN elements are used."""
+    if ENABLED:
+        return _compiled().masked_zscore(values, rcas, float(cutoff), cutoff == 0)
+
+    if cutoff == 0:
+        masked = values
+    else:
+        masked = np.where(np.less(rcas, cutoff), values, np.nan)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(masked, axis=1, keepdims=True)
+        std = np.nanstd(masked, axis=1, ddof=1, keepdims=True)
+        return (values - mean) / std
+
+
+def masked_mean(
+    rcas: np.ndarray,
+    values: np.ndarray,
+    cutoff: float,
+) -> np.ndarray:
+    """Calculates, for each row of `rcas`, the mean of the `values` of the
+    columns where the RCA is over the `cutoff`. NaN `values` are ignored."""
+    if ENABLED:
+        return _compiled().masked_mean(rcas, values.astype(float), float(cutoff))
+
+    known = ~np.isnan(values)
+    mcp = np.greater_equal(rcas[:, known], cutoff).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return mcp.dot(values[known]) / mcp.sum(axis=1)
+
+
+def dot(
+    a: np.ndarray,
+    b: np.ndarray,
+    *,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculates the matrix product `a @ b`, like `np.dot`, but `out` can
+    also be a Fortran-ordered array: its transpose is C-ordered, so BLAS writes
+    `b.T @ a.T` into it directly, without a temporary copy. Other layouts,
+    like a block of rows of a Fortran-ordered array, use a temporary."""
+    if out is None or out.flags.c_contiguous:
+        return np.dot(a, b, out=out)
+    if out.flags.f_contiguous:
+        np.dot(b.T, a.T, out=out.T)
+        return out
+    out[...] = np.dot(a, b)
+    return out
+
+
+def _compiled():
+    """Returns the compiled kernels for the current thread. The module is
+    imported on first use, so numba is only imported when it's needed."""
+    from . import _numba
+
+    if threading.current_thread() is threading.main_thread():
+        return _numba.parallel
+    return _numba.serial
@@ -0,0 +1,107 @@
+"""Compiled kernels used by `economic_complexity.numpy._kernels`.
+
+This module requires numba, and is only imported when the kernels are enabled.
+Each kernel is compiled in a `parallel` and a `serial` variant: the parallel
+launches of some threading layers (like TBB) hang the interpreter on exit
+when they are made from a thread other than the main one, so the serial
+variant is used from other threads, where the caller already runs in parallel.
+
+The on-disk cache of numba is keyed by the qualified name of the function and
+its signature, not by the `parallel` flag, so each variant compiles its own
+renamed copy of the kernels; otherwise, both would load the same build.
+"""
+
+from types import FunctionType, SimpleNamespace
+
+import numba
+import numpy as np
+
+
+def _proximity_ratio(cooccurrence, kp0, sqrt, out):
+    n = cooccurrence.shape[0]
+    for i in numba.prange(n):
+        for j in range(n):
+            if i == j:
+                out[i, j] = 0.0
+            elif sqrt:
+                out[i, j] = cooccurrence[i, j] / np.sqrt(kp0[i] * kp0[j])
+            else:
+                out[i, j] = cooccurrence[i, j] / max(kp0[i], kp0[j])
+    return out
+
+
+def _cross_minimum(numerator, kp0_a, kp0_b, out):
+    rows, cols = numerator.shape
+    for i in numba.prange(rows):
+        for j in range(cols):
+            a = numerator[i, j] / kp0_b[j]
+            b = numerator[i, j] / kp0_a[i]
+            if np.isnan(a):
+                a = 0.0
+            if np.isnan(b):
+                b = 0.0
+            out[i, j] = min(a, b)
+    return out
+
+
+def _masked_zscore(values, rcas, cutoff, use_all):
+    rows, cols = values.shape
+    out = np.empty((rows, cols))
+    for i in numba.prange(rows):
+        total = 0.0
+        count = 0
+        for j in range(cols):
+            value = values[i, j]
+            if (use_all or rcas[i, j] < cutoff) and not np.isnan(value):
+                total += value
+                count += 1
+        mean = total / count if count > 0 else np.nan
+
+        squares = 0.0
+        for j in range(cols):
+            value = values[i, j]
+            if (use_all or rcas[i, j] < cutoff) and not np.isnan(value):
+                squares += (value - mean) ** 2
+        std = np.sqrt(squares / (count - 1)) if count > 1 else np.nan
+
+        for j in range(cols):
+            out[i, j] = (values[i, j] - mean) / std
+    return out
+
+
+def _masked_mean(rcas, values, cutoff):
+    rows, cols = rcas.shape
+    out = np.empty(rows)
+    for i in numba.prange(rows):
+        total = 0.0
+        count = 0
+        for j in range(cols):
+            if rcas[i, j] >= cutoff and not np.isnan(values[j]):
+                total += values[j]
+                count += 1
+        out[i] = total / count
+    return out
+
+
+def _compile(parallel: bool) -> SimpleNamespace:
+    jit = numba.njit(parallel=parallel, cache=True, error_model="numpy")
+    suffix = "_parallel" if parallel else "_serial"
+    return SimpleNamespace(
+        proximity_ratio=jit(_renamed(_proximity_ratio, suffix)),
+        cross_minimum=jit(_renamed(_cross_minimum, suffix)),
+        masked_zscore=jit(_renamed(_masked_zscore, suffix)),
+        masked_mean=jit(_renamed(_masked_mean, suffix)),
+    )
+
+
+def _renamed(func: FunctionType, suffix: str) -> FunctionType:
+    """Copies a function with a suffix in its name, so it gets its own entries
+    in the cache of numba."""
+    name = func.__name__ + suffix
+    copy = FunctionType(func.__code__, func.__globals__, name, func.__defaults__)
+    copy.__qualname__ = func.__qualname__ + suffix
+    return copy
+
+
+parallel = _compile(parallel=True)
+serial = _compile(parallel=False)
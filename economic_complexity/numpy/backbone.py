@@ -0,0 +1,112 @@
+"""Product Space backbone module
+
+The Product Space network of Hidalgo et al. (2007) is visualized using its
+backbone: the maximum spanning tree of the proximity matrix, which keeps the
+network connected using the strongest links, plus the links with a proximity
+over a threshold.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def calculate_backbone(
+    proximities: np.ndarray,
+    *,
+    threshold: Optional[float] = None,
+    max_links: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Extracts the backbone of a Product Space network as an edge list.
+
+    The maximum spanning tree is calculated with Prim's algorithm over the
+    dense matrix, in `O(n^2)` time and `O(n)` additional memory. Missing
+    values are considered as the absence of a link; if the network is not
+    connected, the result is the maximum spanning forest.
+
+    ### Args:
+    * proximities (np.ndarray) -- A symmetric square matrix with the
+        proximity between the activities.
+
+    ### Keyword Args:
+    * threshold (float, optional) -- Also include the links with a proximity
+        greater or equal than this value. By default, only the spanning tree
+        is returned.
+    * max_links (int, optional) -- The maximum amount of links added over the
+        spanning tree because of the `threshold`, keeping the strongest ones.
+
+    ### Returns:
+    ((np.ndarray, np.ndarray)) -- An array of shape `(links, 2)` with the
+        positions of the activities joined by each link, with the lower
+        position first, and an array with the proximity of each link. The
+        links of the spanning tree come first, followed by the additional
+        links sorted by descending proximity.
+    """
+    weights = np.asarray(proximities, dtype=float)
+    if weights.ndim != 2 or weights.shape[0] != weights.shape[1]:
+        raise ValueError("The proximity matrix must be square")
+
+    tree_edges, tree_weights = _maximum_spanning_tree(weights)
+
+    if threshold is None or len(weights) < 2:
+        return tree_edges, tree_weights
+
+    # candidates are taken from the upper triangle, excluding the tree links
+    with np.errstate(invalid="ignore"):
+        sources, targets = np.nonzero(np.triu(weights >= threshold, k=1))
+    n = len(weights)
+    in_tree = np.isin(
+        sources * n + targets, tree_edges[:, 0] * n + tree_edges[:, 1]
+    )
+    sources, targets = sources[~in_tree], targets[~in_tree]
+    extra_weights = weights[sources, targets]
+
+    order = np.argsort(-extra_weights, kind="stable")
+    if max_links is not None:
+        order = order[:max_links]
+
+    edges = np.concatenate(
+        [tree_edges, np.column_stack([sources[order], targets[order]])]
+    )
+    return edges, np.concatenate([tree_weights, extra_weights[order]])
+
+
+def _maximum_spanning_tree(weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculates the maximum spanning forest of a dense weight matrix using
+    Prim's algorithm. NaN weights are not considered as links."""
+    n = len(weights)
+    edges = np.empty((max(n - 1, 0), 2), dtype=np.intp)
+    edge_weights = np.empty(max(n - 1, 0), dtype=float)
+    if n < 2:
+        return edges, edge_weights
+
+    # the nodes not yet in the tree, the weight of their strongest link to
+    # the tree, and the node in the tree at the other end of that link
+    remaining = np.arange(1, n)
+    best = np.where(np.isnan(weights[0, 1:]), -np.inf, weights[0, 1:])
+    parent = np.zeros(n - 1, dtype=np.intp)
+
+    count = 0
+    for size in range(n - 1, 0, -1):
+        k = int(np.argmax(best[:size]))
+        node = remaining[k]
+
+        # a node without links to the tree starts a new tree of the forest
+        if best[k] > -np.inf:
+            edges[count] = sorted((parent[k], node))
+            edge_weights[count] = best[k]
+            count += 1
+
+        # remove the node from the remaining, moving the last one to its place
+        last = size - 1
+        remaining[k], best[k], parent[k] = remaining[last], best[last], parent[last]
+
+        if last == 0:
+            break
+
+        row = weights[node, remaining[:last]]
+        stronger = row > best[:last]
+        best[:last][stronger] = row[stronger]
+        parent[:last][stronger] = node
+
+    return edges[:count], edge_weights[:count]
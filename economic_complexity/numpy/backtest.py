@@ -0,0 +1,304 @@
+"""Relatedness backtesting module
+
+The Principle of Relatedness states that locations tend to enter the
+activities related to the ones they already have, and to exit the unrelated
+ones. This module measures how well the Relatedness of a period predicts the
+comparative advantages gained (entries) and lost (exits) after a horizon of
+`k` periods:
+
+- the entry AUC is the probability that a pair of the location and an activity
+  entered has a higher relatedness than a pair that didn't, among the pairs
+  without comparative advantages in the first period;
+- the exit AUC is the probability that a pair that exited has a lower
+  relatedness than a pair that stayed, among the pairs with comparative
+  advantages in the first period;
+- the precision at `k` is the fraction of the `k` most related activities of a
+  location that it entered.
+
+The AUC is calculated from the ranks of the values (the Mann-Whitney U
+statistic), with the average rank for ties, so it doesn't need a loop over
+thresholds. The statistics by location are calculated for a block of
+locations at a time, and the periods are evaluated in parallel.
+"""
+
+from concurrent.futures import Executor
+from itertools import repeat
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .product_space import calculate_relatedness
+from .rca import _CHUNK_ELEMENTS
+from .threads import executor_or_pool
+
+
+class BacktestPeriod(NamedTuple):
+    """The predictive power of the relatedness of a period."""
+
+    # pooled over all the pairs of locations and activities
+    entry_auc: float
+    exit_auc: float
+    entries: int
+    exits: int
+    # for each location; NaN where undefined
+    auc_by_location: np.ndarray
+    precision_at_k: np.ndarray
+
+
+def transitions(
+    rcas_start: np.ndarray,
+    rcas_end: np.ndarray,
+    *,
+    cutoff: float = 1,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Compares the comparative advantages of two periods.
+
+    Pairs with a missing RCA value in either period are excluded from all the
+    masks.
+
+    ### Returns:
+    ((np.ndarray, np.ndarray, np.ndarray, np.ndarray)) -- Boolean masks with
+        the pairs that can enter (without advantages at the start), the pairs
+        that entered, the pairs that can exit (with advantages at the start),
+        and the pairs that exited.
+    """
+    known = ~(np.isnan(rcas_start) | np.isnan(rcas_end))
+    with np.errstate(invalid="ignore"):
+        start = np.greater_equal(rcas_start, cutoff)
+        end = np.greater_equal(rcas_end, cutoff)
+
+    absent = known & ~start
+    present = known & start
+    return absent, absent & end, present, present & ~end
+
+
+def rank_auc(
+    scores: np.ndarray,
+    positives: np.ndarray,
+    valid: np.ndarray,
+) -> np.ndarray:
+    """Calculates the AUC of the `scores` of each row, as a predictor of the
+    `positives`, only considering the `valid` elements.
+
+    ### Args:
+    * scores (np.ndarray) -- A matrix of predictions.
+    * positives (np.ndarray) -- A boolean matrix with the observed outcomes.
+    * valid (np.ndarray) -- A boolean matrix with the elements to consider.
+
+    ### Returns:
+    (np.ndarray) -- The AUC of each row, NaN for the rows without positive or
+        negative elements.
+    """
+    ranks = _average_ranks(np.where(valid, scores, np.nan))
+    positives = positives & valid
+
+    n_valid = valid.sum(axis=1)
+    n_pos = positives.sum(axis=1)
+    n_neg = n_valid - n_pos
+    rank_sum = np.where(positives, ranks, 0).sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        auc = (rank_sum - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+    auc[(n_pos == 0) | (n_neg == 0)] = np.nan
+    return auc
+
+
+def precision_at_k(
+    scores: np.ndarray,
+    positives: np.ndarray,
+    valid: np.ndarray,
+    k: int,
+) -> np.ndarray:
+    """Calculates the fraction of the `k` valid elements with the highest
+    score of each row that are positive. Rows with less than `k` valid
+    elements use all of them, and rows without valid elements are NaN."""
+    n_cols = scores.shape[1]
+    masked = np.where(valid & ~np.isnan(scores), scores, -np.inf)
+    if k < n_cols:
+        top = np.argpartition(-masked, k - 1, axis=1)[:, :k]
+    else:
+        top = np.broadcast_to(np.arange(n_cols), masked.shape)
+    hits = np.take_along_axis(positives & valid, top, axis=1).sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return hits / np.minimum(valid.sum(axis=1), k)
+
+
+def backtest_period(
+    rcas_start: np.ndarray,
+    rcas_end: np.ndarray,
+    relatedness: Optional[np.ndarray] = None,
+    *,
+    cutoff: float = 1,
+    k: int = 10,
+    chunksize: Optional[int] = None,
+) -> BacktestPeriod:
+    """Evaluates the relatedness of a period as a predictor of the entries and
+    exits at the end of the horizon.
+
+    ### Args:
+    * rcas_start (np.ndarray) -- The RCA matrix of the period.
+    * rcas_end (np.ndarray) -- The RCA matrix at the end of the horizon, with
+        the same locations and activities.
+    * relatedness (np.ndarray, optional) -- The relatedness of the period. By
+        default, calculated from `rcas_start`.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrices. Default value: `1`.
+    * k (int, optional) -- The amount of activities for the precision of each
+        location. Default value: `10`.
+    * chunksize (int, optional) -- The amount of locations of each block.
+
+    ### Returns:
+    (BacktestPeriod) -- The statistics of the period.
+    """
+    if relatedness is None:
+        relatedness = calculate_relatedness(rcas_start, cutoff=cutoff)
+
+    n_rows, n_cols = rcas_start.shape
+    if chunksize is None:
+        chunksize = max(_CHUNK_ELEMENTS // max(n_cols, 1), 1)
+
+    auc_by_location = np.empty(n_rows)
+    precision = np.empty(n_rows)
+    # the scores of the pairs that can enter or exit, for the pooled AUC
+    entry_scores, entry_labels, exit_scores, exit_labels = [], [], [], []
+
+    for start in range(0, n_rows, chunksize):
+        end = start + chunksize
+        scores = relatedness[start:end]
+        absent, entries, present, exits = transitions(
+            rcas_start[start:end], rcas_end[start:end], cutoff=cutoff
+        )
+        known = ~np.isnan(scores)
+        absent &= known
+        present &= known
+
+        auc_by_location[start:end] = rank_auc(scores, entries, absent)
+        precision[start:end] = precision_at_k(scores, entries, absent, k)
+
+        entry_scores.append(scores[absent])
+        entry_labels.append(entries[absent])
+        exit_scores.append(scores[present])
+        exit_labels.append(exits[present])
+
+    entry_labels_all = np.concatenate(entry_labels)
+    exit_labels_all = np.concatenate(exit_labels)
+    # the exits are predicted by a low relatedness
+    entry_auc = _pooled_auc(np.concatenate(entry_scores), entry_labels_all)
+    exit_auc = _pooled_auc(-np.concatenate(exit_scores), exit_labels_all)
+
+    return BacktestPeriod(
+        entry_auc=entry_auc,
+        exit_auc=exit_auc,
+        entries=int(entry_labels_all.sum()),
+        exits=int(exit_labels_all.sum()),
+        auc_by_location=auc_by_location,
+        precision_at_k=precision,
+    )
+
+
+def calculate_backtest(
+    rcas: np.ndarray,
+    relatedness: Optional[np.ndarray] = None,
+    *,
+    horizon: int = 1,
+    cutoff: float = 1,
+    k: int = 10,
+    chunksize: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> List[BacktestPeriod]:
+    """Evaluates the relatedness of each period of a panel as a predictor of
+    the entries and exits after `horizon` periods.
+
+    ### Args:
+    * rcas (np.ndarray) -- A 3-dimensional array, with the periods as the
+        first axis, and the RCA matrix of each period.
+    * relatedness (np.ndarray, optional) -- The relatedness of each period,
+        with the same shape as `rcas`. By default, calculated from the RCA
+        matrix of each period.
+
+    ### Keyword Args:
+    * horizon (int, optional) -- The amount of periods between the prediction
+        and the outcome. Default value: `1`.
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrices. Default value: `1`.
+    * k (int, optional) -- The amount of activities for the precision of each
+        location. Default value: `10`.
+    * chunksize (int, optional) -- The amount of locations of each block.
+    * max_workers (int, optional) -- The size of the thread pool. By default,
+        one worker per core; the spare cores go to the BLAS threads of each
+        worker. Ignored when `executor` is provided.
+    * executor (concurrent.futures.Executor, optional) -- The executor used to
+        evaluate the periods. By default, a local thread pool.
+
+    ### Returns:
+    (List[BacktestPeriod]) -- The statistics of each period that has an
+        outcome, from the first period to the one `horizon` periods before
+        the last.
+    """
+    rcas = np.asarray(rcas)
+    if rcas.ndim != 3:
+        raise ValueError("The periods must be a 3-dimensional array")
+    if not 1 <= horizon < len(rcas):
+        raise ValueError("The horizon must be between 1 and the amount of periods")
+    if relatedness is not None and np.shape(relatedness) != rcas.shape:
+        raise ValueError("The relatedness must have the same shape as the RCAs")
+
+    n_periods = len(rcas) - horizon
+    starts = [rcas[i] for i in range(n_periods)]
+    ends = [rcas[i + horizon] for i in range(n_periods)]
+    scores = [None if relatedness is None else relatedness[i] for i in range(n_periods)]
+
+    with executor_or_pool(executor, max_workers, n_periods) as pool:
+        return list(
+            pool.map(
+                _backtest_period,
+                starts,
+                ends,
+                scores,
+                repeat(cutoff),
+                repeat(k),
+                repeat(chunksize),
+            )
+        )
+
+
+def _backtest_period(
+    rcas_start: np.ndarray,
+    rcas_end: np.ndarray,
+    relatedness: Optional[np.ndarray],
+    cutoff: float,
+    k: int,
+    chunksize: Optional[int],
+) -> BacktestPeriod:
+    return backtest_period(
+        rcas_start, rcas_end, relatedness, cutoff=cutoff, k=k, chunksize=chunksize
+    )
+
+
+def _pooled_auc(scores: np.ndarray, positives: np.ndarray) -> float:
+    """Calculates the AUC over all the pairs of a period."""
+    valid = np.ones((1, len(scores)), dtype=bool)
+    return float(rank_auc(scores[np.newaxis], positives[np.newaxis], valid)[0])
+
+
+def _average_ranks(values: np.ndarray) -> np.ndarray:
+    """Ranks the values of each row from 1, with the average rank for ties.
+    NaN values are ranked last."""
+    n_rows, n_cols = values.shape
+    order = np.argsort(values, axis=1, kind="stable")
+    ordered = np.take_along_axis(values, order, axis=1)
+
+    # the tied values are consecutive; each group gets the mean of its ranks
+    first = np.ones(values.shape, dtype=bool)
+    first[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    groups = np.cumsum(first.ravel()) - 1
+    positions = np.tile(np.arange(1, n_cols + 1, dtype=float), n_rows)
+    mean_rank = np.bincount(groups, weights=positions) / np.bincount(groups)
+
+    ranks = np.empty(values.shape)
+    np.put_along_axis(ranks, order, mean_rank[groups].reshape(values.shape), axis=1)
+    return ranks
@@ -0,0 +1,232 @@
+"""Complexity Indices module
+
+Hidalgo & Hausmann (2009), calculate the Economic Complexity Indices from the
+reflections method, which is defined based on a red bipartite that contains a
+symmetric set of variables whose nodes correspond to countries and products.
+"""
+
+from typing import Callable, NamedTuple, Optional, Tuple, Union
+
+import warnings
+
+import numpy as np
+
+from .planner import Engine, mcp_density, plan
+from .rca import binarize
+
+
+class ReflectionState(NamedTuple):
+    """The state of the reflections method after the last iteration."""
+
+    # the location-side and the activity-side vectors, before standardizing
+    kc: np.ndarray
+    kp: np.ndarray
+    # the amount of iterations run, and if they met the tolerance
+    iterations: int
+    converged: bool
+
+
+def calculate_complexity(
+    rcas: np.ndarray,
+    *,
+    cutoff: float = 1,
+    iterations: int = 20,
+    out: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    engine: Engine = "auto",
+    initial: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    tol: Optional[float] = None,
+    return_state: bool = False,
+) -> Union[
+    Tuple[np.ndarray, np.ndarray],
+    Tuple[np.ndarray, np.ndarray, ReflectionState],
+]:
+    """Calculates Economic Complexity Index (ECI) and Product Complexity
+    Index (PCI) from a RCA matrix.
+
+    The ECI and PCI change little between consecutive periods, so the
+    reflections can start from the vectors of the previous period (the
+    `initial` argument), and stop as soon as they converge (the `tol`
+    argument). The final vectors are returned with `return_state`, to be used
+    as the initial vectors of the next period.
+
+    ### Args:
+    * rcas (np.ndarray) -- RCA matrix, with locations as rows and activities
+        as columns.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA matrix.
+        Default value: `1`.
+    * iterations (int, optional) -- Limit of recursive calculations for kp and kc.
+        Default value: `20`.
+    * out ((np.ndarray, np.ndarray), optional) -- A pair of preallocated
+        float arrays to store the ECI and PCI values.
+    * engine (str, optional) -- The execution strategy: `"dense"`,
+        `"sparse"`, `"blocked"`, or `"auto"` to let the planner choose the
+        fastest one that fits in the memory budget. Default value: `"auto"`.
+    * initial ((np.ndarray, np.ndarray), optional) -- The vectors to start
+        the reflections from, for the locations and the activities, like the
+        ECI and PCI (or the state) of the previous period. Missing values are
+        replaced by the mean of the vector. By default, the diversity and
+        ubiquity of the Mcp matrix.
+    * tol (float, optional) -- Stop the iterations when the largest change of
+        the standardized vectors between two steps is under this value. By
+        default, all the `iterations` are run.
+    * return_state (bool, optional) -- Also return the `ReflectionState`
+        after the last iteration. Default value: `False`.
+
+    ### Returns:
+    ((np.ndarray, np.ndarray)) -- A tuple of ECI and PCI values, and the
+        final state if `return_state` is `True`.
+    """
+    if engine != "dense":
+        chosen = plan(
+            "complexity",
+            rcas.shape,
+            density=lambda: mcp_density(rcas, cutoff),
+            engine=engine,
+        )
+        engine = chosen.engine
+
+    if engine == "dense":
+        mcp = binarize(rcas, cutoff)
+        operators = (mcp.dot, mcp.T.dot, mcp.sum(axis=1), mcp.sum(axis=0))
+    else:
+        from . import engines
+
+        operators = getattr(engines, f"{engine}_operators")(
+            rcas, cutoff=cutoff, chunksize=chosen.chunksize
+        )
+
+    state = reflect(*operators, iterations=iterations, initial=initial, tol=tol)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        geo_complexity = standardize(state.kc, out=None if out is None else out[0])
+        prod_complexity = standardize(state.kp, out=None if out is None else out[1])
+
+    if return_state:
+        return geo_complexity, prod_complexity, state
+    return geo_complexity, prod_complexity
+
+
+def reflect(
+    dot: Callable[[np.ndarray], np.ndarray],
+    dot_transposed: Callable[[np.ndarray], np.ndarray],
+    kc0: np.ndarray,
+    kp0: np.ndarray,
+    *,
+    iterations: int = 20,
+    initial: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    tol: Optional[float] = None,
+) -> ReflectionState:
+    """Runs the reflections method over the products of a Mcp matrix.
+
+    ### Args:
+    * dot (Callable) -- Calculates `M @ x` for an activity-side vector.
+    * dot_transposed (Callable) -- Calculates `M.T @ x` for a location-side
+        vector.
+    * kc0 (np.ndarray) -- The diversity of each location.
+    * kp0 (np.ndarray) -- The ubiquity of each activity.
+
+    ### Keyword Args:
+    * iterations (int, optional) -- Limit of recursive calculations for kp
+        and kc. Default value: `20`.
+    * initial ((np.ndarray, np.ndarray), optional) -- The initial vectors, by
+        default `kc0` and `kp0`.
+    * tol (float, optional) -- The tolerance to stop the iterations early.
+
+    ### Returns:
+    (ReflectionState) -- The vectors after the last iteration.
+    """
+    # the vectors converge to a constant, so when iterating until convergence
+    # the constant component is removed and the scale is reset on each step;
+    # the standardized vectors are the same
+    stable = initial is not None or tol is not None
+
+    if initial is None:
+        kc, kp = kc0, kp0
+    else:
+        kc, kp = (_filled(vector) for vector in initial)
+
+    converged = False
+    previous: Optional[np.ndarray] = None
+    steps = min(iterations, 1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if stable:
+            kc, kp = _deflated(kc, kc0), _deflated(kp, kp0)
+
+        for i in range(1, iterations):
+            steps = i + 1
+            kc_temp = kc
+            kp_temp = kp
+            kp = dot_transposed(kc_temp) / kp0
+            if i < (iterations - 1):
+                kc = dot(kp_temp) / kc0
+
+            if stable:
+                kc, kp = _deflated(kc, kc0), _deflated(kp, kp0)
+
+            # each vector alternates between the sequence started from the
+            # initial `kc` and the one started from the initial `kp`; like after
+            # an even amount of iterations, the result follows the first one,
+            # so the convergence is checked on the steps where `kc` does
+            if tol is not None and i % 2 == 0 and i < (iterations - 1):
+                current = standardize(kc)
+                if previous is not None and _change(current, previous) < tol:
+                    kp = _deflated(dot_transposed(kc) / kp0, kp0)
+                    converged = True
+                    break
+                previous = current
+
+    return ReflectionState(kc, kp, steps, converged)
+
+
+def _filled(vector: np.ndarray) -> np.ndarray:
+    """Returns a float copy of a vector, with the missing values replaced by
+    the mean of the vector."""
+    vector = np.array(vector, dtype=float)
+    missing = np.isnan(vector)
+    if missing.any() and not missing.all():
+        vector[missing] = vector[~missing].mean()
+    return vector
+
+
+def _deflated(vector: np.ndarray, degrees: np.ndarray) -> np.ndarray:
+    """Removes the constant component of a vector of the reflections, using
+    the degrees as weights (the stationary distribution of the reflections),
+    and scales it so its largest absolute value is one."""
+    known = ~np.isnan(vector)
+    total = degrees[known].sum()
+    if total > 0:
+        vector = vector - np.dot(degrees[known], vector[known]) / total
+    scale = np.abs(vector[known]).max(initial=0)
+    if scale > 0:
+        vector = vector / scale
+    return vector
+
+
+def _change(current: np.ndarray, previous: np.ndarray) -> float:
+    """Returns the largest absolute change between two vectors, ignoring the
+    missing values."""
+    change = np.abs(current - previous)
+    if np.isnan(change).all():
+        return np.inf
+    return float(np.nanmax(change))
+
+
+def standardize(
+    values: np.ndarray,
+    *,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Standardizes a vector, ignoring missing values: `x-µ/σ`.
+
+    The standard deviation uses one delta degree of freedom, to match the
+    behavior of `pandas.Series.std`.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(values)
+        std = np.nanstd(values, ddof=1)
+        result = np.subtract(values, mean, out=out)
+        return np.divide(result, std, out=result)
@@ -0,0 +1,97 @@
+"""Cross-space module
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from ._kernels import cross_minimum, dot
+from .planner import Engine, plan
+from .rca import binarize
+
+
+def calculate_cross_proximity(
+    rcas_a: np.ndarray,
+    rcas_b: np.ndarray,
+    *,
+    cutoff: float = 1,
+    out: Optional[np.ndarray] = None,
+    engine: Engine = "auto",
+) -> np.ndarray:
+    """Calculates the Cross-proximity index between two matrices of RCA.
+
+    Both matrices must have the same locations, in the same order, as rows.
+
+    ### Args:
+    * rcas_a (np.ndarray) -- The RCA matrix for the main characteristic to evaluate.
+    * rcas_b (np.ndarray) -- The RCA matrix for a secondary characteristic to evaluate.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA matrix.
+        Internally, RCA values under it will be set to zero, one otherwise.
+        Default value: `1`.
+    * out (np.ndarray, optional) -- A preallocated float array to store the
+        result, with the same shape as the returned matrix.
+    * engine (str, optional) -- The execution strategy: `"dense"`,
+        `"blocked"`, or `"auto"` to let the planner choose. Default value:
+        `"auto"`.
+
+    ### Returns:
+    (np.ndarray) -- A matrix with the proximity between the columns of `rcas_a`
+        (as rows) and the columns of `rcas_b` (as columns).
+    """
+    if engine != "dense":
+        chosen = plan(
+            "cross_proximity", rcas_a.shape, columns_b=rcas_b.shape[1], engine=engine
+        )
+        if chosen.engine == "blocked":
+            from .engines import blocked_cross_proximity
+
+            return blocked_cross_proximity(
+                rcas_a, rcas_b, cutoff=cutoff, chunksize=chosen.chunksize, out=out
+            )
+
+    mcp_a = binarize(rcas_a, cutoff)
+    mcp_b = binarize(rcas_b, cutoff)
+
+    numerator = dot(mcp_a.T, mcp_b, out=out)
+
+    kp0_a = mcp_a.sum(axis=0)
+    kp0_b = mcp_b.sum(axis=0)
+
+    # Keeps the minimum of the two possible cross proximity values of each
+    # cell, replacing the NaN values
+    return cross_minimum(numerator, kp0_a, kp0_b, out=numerator)
+
+
+def calculate_cross_relatedness(
+    rcas: np.ndarray,
+    x_proximity: np.ndarray,
+    *,
+    cutoff: float = 1,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculates the Cross-relatedness.
+
+    ### Args:
+    * rcas (np.ndarray) -- A RCA matrix for the main characteristic to evaluate.
+    * x_proximity (np.ndarray) -- The cross-proximity matrix, with rows in the
+        same order as the columns of `rcas`.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA matrix.
+        Default value: `1`.
+    * out (np.ndarray, optional) -- A preallocated float array to store the
+        result, with the same shape as the returned matrix.
+
+    ### Returns:
+    (np.ndarray) -- A matrix with the cross-relatedness for each location and
+        each column of `x_proximity`.
+    """
+    mcp = binarize(rcas, cutoff)
+
+    numerator = dot(mcp, x_proximity, out=out)
+    denominator = x_proximity.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.divide(numerator, denominator, out=numerator)
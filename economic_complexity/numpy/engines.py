@@ -0,0 +1,200 @@
+"""Alternative execution strategies
+
+Implementations of the calculations with the "sparse" and "blocked"
+strategies described in the `planner` module. They return the same values as
+the dense implementations, up to floating point rounding, and are selected
+through the `engine` argument of each function. For the complexity indices,
+these strategies provide the products of the Mcp matrix used by the
+reflections method.
+"""
+
+from typing import Callable, Literal, Optional, Tuple
+
+import numpy as np
+
+from ._kernels import cross_minimum, dot
+from .product_space import proximity_from_cooccurrence
+from .rca import binarize
+
+# The products `M @ x` and `M.T @ x` of a Mcp matrix, and its degree vectors
+Operators = Tuple[
+    Callable[[np.ndarray], np.ndarray],
+    Callable[[np.ndarray], np.ndarray],
+    np.ndarray,
+    np.ndarray,
+]
+
+
+def sparse_operators(
+    rcas: np.ndarray,
+    *,
+    cutoff: float = 1,
+    chunksize: int,
+) -> Operators:
+    """Returns the products of the Mcp matrix used by the reflections method,
+    calculated from the list of cells with comparative advantages: `M @ x` is
+    a sum by row of the gathered values, and `M.T @ x` a sum by column."""
+    n_rows, n_cols = rcas.shape
+    rows, cols = _nonzero(rcas, cutoff, chunksize)
+
+    def dot(values: np.ndarray) -> np.ndarray:
+        return np.bincount(rows, weights=values[cols], minlength=n_rows)
+
+    def dot_transposed(values: np.ndarray) -> np.ndarray:
+        return np.bincount(cols, weights=values[rows], minlength=n_cols)
+
+    kc0 = np.bincount(rows, minlength=n_rows).astype(float)
+    kp0 = np.bincount(cols, minlength=n_cols).astype(float)
+    return dot, dot_transposed, kc0, kp0
+
+
+def blocked_operators(
+    rcas: np.ndarray,
+    *,
+    cutoff: float = 1,
+    chunksize: int,
+) -> Operators:
+    """Returns the products of the Mcp matrix used by the reflections method,
+    binarizing a block of locations at a time on each product."""
+    n_rows, n_cols = rcas.shape
+    starts = range(0, n_rows, chunksize)
+
+    def dot(values: np.ndarray) -> np.ndarray:
+        result = np.empty(n_rows)
+        for start in starts:
+            mcp = binarize(rcas[start : start + chunksize], cutoff)
+            np.dot(mcp, values, out=result[start : start + chunksize])
+        return result
+
+    def dot_transposed(values: np.ndarray) -> np.ndarray:
+        result = np.zeros(n_cols)
+        for start in starts:
+            mcp = binarize(rcas[start : start + chunksize], cutoff)
+            result += mcp.T.dot(values[start : start + chunksize])
+        return result
+
+    kc0 = dot(np.ones(n_cols))
+    kp0 = dot_transposed(np.ones(n_rows))
+    return dot, dot_transposed, kc0, kp0
+
+
+def blocked_proximity(
+    rcas: np.ndarray,
+    *,
+    cutoff: float = 1,
+    procedure: Literal["max", "sqrt"] = "max",
+    chunksize: int,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculates the Proximity accumulating the co-occurrence matrix from
+    blocks of locations."""
+    n_cols = rcas.shape[1]
+    cooccurrence = np.zeros((n_cols, n_cols)) if out is None else out
+    cooccurrence.fill(0)
+    kp0 = np.zeros(n_cols)
+
+    for start in range(0, len(rcas), chunksize):
+        mcp = binarize(rcas[start : start + chunksize], cutoff)
+        cooccurrence += mcp.T.dot(mcp)
+        kp0 += mcp.sum(axis=0)
+
+    return proximity_from_cooccurrence(
+        cooccurrence, kp0, procedure=procedure, out=cooccurrence
+    )
+
+
+def blocked_relatedness(
+    rcas: np.ndarray,
+    proximities: np.ndarray,
+    *,
+    cutoff: float = 1,
+    chunksize: int,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculates the Relatedness a block of locations at a time."""
+    if out is None:
+        out = np.empty((len(rcas), proximities.shape[1]))
+    denominator = proximities.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, len(rcas), chunksize):
+            end = start + chunksize
+            mcp = binarize(rcas[start:end], cutoff)
+            block = dot(mcp, proximities, out=out[start:end])
+            np.divide(block, denominator, out=block)
+
+    return out
+
+
+def blocked_similarity(
+    rcas: np.ndarray,
+    *,
+    epsilon: float = 0.1,
+    chunksize: int,
+) -> np.ndarray:
+    """Calculates the Export Similarity Index a block of locations at a time,
+    from the standardized logarithms of the RCA values."""
+    n_rows = len(rcas)
+    values = np.empty(rcas.shape)
+    result = np.empty((n_rows, n_rows))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # the rows are centered and scaled to unit norm once, so each block of
+        # the correlation matrix is a single product
+        for start in range(0, n_rows, chunksize):
+            block = values[start : start + chunksize]
+            np.log(rcas[start : start + chunksize] + epsilon, out=block)
+            block -= block.mean(axis=1, keepdims=True)
+            block /= np.sqrt(np.einsum("ij,ij->i", block, block))[:, np.newaxis]
+
+        for start in range(0, n_rows, chunksize):
+            end = start + chunksize
+            np.dot(values[start:end], values.T, out=result[start:end])
+
+    # like `np.corrcoef`, the rounding errors are clipped
+    return np.clip(result, -1, 1, out=result)
+
+
+def blocked_cross_proximity(
+    rcas_a: np.ndarray,
+    rcas_b: np.ndarray,
+    *,
+    cutoff: float = 1,
+    chunksize: int,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculates the Cross-proximity accumulating the co-occurrence matrix
+    from blocks of locations."""
+    shape = (rcas_a.shape[1], rcas_b.shape[1])
+    numerator = np.zeros(shape) if out is None else out
+    numerator.fill(0)
+    kp0_a = np.zeros(shape[0])
+    kp0_b = np.zeros(shape[1])
+
+    for start in range(0, len(rcas_a), chunksize):
+        mcp_a = binarize(rcas_a[start : start + chunksize], cutoff)
+        mcp_b = binarize(rcas_b[start : start + chunksize], cutoff)
+        numerator += mcp_a.T.dot(mcp_b)
+        kp0_a += mcp_a.sum(axis=0)
+        kp0_b += mcp_b.sum(axis=0)
+
+    return cross_minimum(numerator, kp0_a, kp0_b, out=numerator)
+
+
+def _nonzero(
+    rcas: np.ndarray,
+    cutoff: float,
+    chunksize: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the row and the column of the cells over the `cutoff`, reading
+    a block of rows at a time."""
+    rows, cols = [], []
+    with np.errstate(invalid="ignore"):
+        for start in range(0, len(rcas), chunksize):
+            block = rcas[start : start + chunksize]
+            block_rows, block_cols = np.nonzero(block >= cutoff)
+            rows.append(block_rows + start)
+            cols.append(block_cols)
+    if not rows:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(rows), np.concatenate(cols)
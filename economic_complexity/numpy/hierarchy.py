@@ -0,0 +1,141 @@
+"""Hierarchical roll-ups module
+
+Classifications are usually hierarchical: HS6 products are grouped in HS4
+headings and HS2 chapters, and municipalities in provinces and regions. The
+functions in this module aggregate a matrix at the base level of both
+hierarchies to any other level using integer-coded parent mappings, so the
+indicators for all the levels can be calculated from a single pivot of the
+base data.
+"""
+
+from typing import Dict, Hashable, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .complexity import calculate_complexity
+from .rca import calculate_rca
+
+Levels = Mapping[Hashable, Optional[np.ndarray]]
+
+
+class RollupLevel(NamedTuple):
+    """The indicators calculated for a combination of levels."""
+
+    # The aggregated values, with the groups as rows and columns
+    tbl: np.ndarray
+    rca: np.ndarray
+    eci: np.ndarray
+    pci: np.ndarray
+
+
+def aggregate(
+    tbl: np.ndarray,
+    *,
+    rows: Optional[np.ndarray] = None,
+    columns: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Adds up the rows and/or the columns of a matrix by group.
+
+    This is equivalent to multiplying by the (sparse) membership matrices of
+    the groups, but is calculated with a single sort and `np.add.reduceat`.
+
+    ### Args:
+    * tbl (np.ndarray) -- The matrix to aggregate. Missing values (NaN) are
+        considered zero.
+
+    ### Keyword Args:
+    * rows (np.ndarray, optional) -- The code of the group of each row, from
+        `0` to `groups - 1`. By default, the rows are not aggregated.
+    * columns (np.ndarray, optional) -- The code of the group of each column.
+        By default, the columns are not aggregated.
+
+    ### Returns:
+    (np.ndarray) -- The aggregated matrix, with a row (or column) for each
+        group, in the order of the codes. Groups without members are zero.
+    """
+    result = np.asarray(tbl, dtype=float)
+    if np.isnan(result).any():
+        result = np.where(np.isnan(result), 0.0, result)
+
+    if rows is not None:
+        result = _group_sum(result, rows, axis=0)
+    if columns is not None:
+        result = _group_sum(result, columns, axis=1)
+    return result
+
+
+def calculate_rollup(
+    tbl: np.ndarray,
+    *,
+    locations: Optional[Levels] = None,
+    activities: Optional[Levels] = None,
+    cutoff: float = 1,
+    iterations: int = 20,
+) -> Dict[Tuple[Hashable, Hashable], RollupLevel]:
+    """Calculates the RCA, ECI and PCI for every combination of location and
+    activity levels, from a matrix at the base level of both hierarchies.
+
+    The columns are aggregated once per activity level, and the rows of each
+    of those once per location level.
+
+    ### Args:
+    * tbl (np.ndarray) -- A matrix with the measurement of the data as values,
+        with the base-level locations as rows and activities as columns.
+
+    ### Keyword Args:
+    * locations (Mapping[Hashable, np.ndarray | None], optional) -- The
+        location levels to calculate, as a mapping from the name of the level
+        to the code of the group of each row at that level. Use `None` as the
+        codes for the base level. Default value: `{"base": None}`.
+    * activities (Mapping[Hashable, np.ndarray | None], optional) -- The
+        activity levels to calculate, the same as `locations`, for the
+        columns. Default value: `{"base": None}`.
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrices. Default value: `1`.
+    * iterations (int, optional) -- Limit of recursive calculations for kp
+        and kc. Default value: `20`.
+
+    ### Returns:
+    (Dict[(Hashable, Hashable), RollupLevel]) -- The indicators for each
+        combination of levels, keyed by `(location level, activity level)`.
+    """
+    locations = {"base": None} if locations is None else locations
+    activities = {"base": None} if activities is None else activities
+
+    base = aggregate(tbl)
+    results = {}
+    for activity_level, columns in activities.items():
+        by_activity = base if columns is None else _group_sum(base, columns, axis=1)
+
+        for location_level, rows in locations.items():
+            values = by_activity if rows is None else _group_sum(by_activity, rows)
+
+            rcas = calculate_rca(values)
+            eci, pci = calculate_complexity(rcas, cutoff=cutoff, iterations=iterations)
+            results[(location_level, activity_level)] = RollupLevel(
+                values, rcas, eci, pci
+            )
+
+    return results
+
+
+def _group_sum(values: np.ndarray, codes: np.ndarray, axis: int = 0) -> np.ndarray:
+    """Adds up the elements of `values` along `axis` by their group code."""
+    codes = np.asarray(codes)
+    if codes.shape != (values.shape[axis],):
+        raise ValueError("There must be a group code for each element of the axis")
+    if len(codes) == 0:
+        return np.zeros(values.shape[:axis] + (0,) + values.shape[axis + 1 :])
+
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    sums = np.add.reduceat(np.take(values, order, axis=axis), starts, axis=axis)
+
+    shape = list(values.shape)
+    shape[axis] = int(sorted_codes[-1]) + 1
+    result = np.zeros(shape)
+    index = [slice(None)] * values.ndim
+    index[axis] = sorted_codes[starts]
+    result[tuple(index)] = sums
+    return result
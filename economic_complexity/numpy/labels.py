@@ -0,0 +1,128 @@
+"""Integer-coded labels module
+
+The functions in `economic_complexity.numpy` are positional: the rows and
+columns of every matrix are identified by their position. The helpers in this
+module translate labels into integer codes once, so the operands of a
+calculation can be aligned with plain array indexing instead of relying on
+label alignment on each call.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def encode(labels: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """Encodes a sequence of labels as integer codes.
+
+    ### Args:
+    * labels (Sequence) -- The labels to encode, for example the location
+        column of a tidy dataset.
+
+    ### Returns:
+    ((np.ndarray, np.ndarray)) -- The sorted unique labels, and the code of
+        each element of `labels`, that is its position in the unique labels.
+    """
+    uniques, codes = np.unique(np.asarray(labels), return_inverse=True)
+    return uniques, codes.reshape(-1)
+
+
+def indexer(labels: Sequence, target: Sequence) -> np.ndarray:
+    """Calculates the position of each element of `target` in `labels`.
+
+    The result can be used with `take` to reorder an array whose rows follow
+    `labels` so they follow `target` instead.
+
+    ### Args:
+    * labels (Sequence) -- The labels of the source array, must be unique.
+    * target (Sequence) -- The labels in the desired order.
+
+    ### Returns:
+    (np.ndarray) -- The positions, with `-1` for the labels not found.
+    """
+    positions = {label: i for i, label in enumerate(np.asarray(labels).tolist())}
+    return np.fromiter(
+        (positions.get(label, -1) for label in np.asarray(target).tolist()),
+        dtype=np.intp,
+        count=len(target),
+    )
+
+
+def take(
+    values: np.ndarray,
+    positions: np.ndarray,
+    *,
+    axis: int = 0,
+    fill_value: float = np.nan,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Selects elements of an array along an axis, as returned by `indexer`.
+    Negative positions are filled with `fill_value`.
+
+    ### Args:
+    * values (np.ndarray) -- The source array.
+    * positions (np.ndarray) -- The positions to select.
+
+    ### Keyword Args:
+    * axis (int, optional) -- The axis to select on. Default value: `0`.
+    * fill_value (float, optional) -- The value for the missing positions.
+        Default value: `NaN`.
+    * out (np.ndarray, optional) -- A preallocated array to store the result.
+
+    ### Returns:
+    (np.ndarray) -- The reordered array.
+    """
+    missing = positions < 0
+    if not missing.any():
+        return np.take(values, positions, axis=axis, out=out)
+
+    result = np.take(values, np.where(missing, 0, positions), axis=axis, out=out)
+    if result.dtype.kind != "f":
+        result = result.astype(float)
+
+    selector = [slice(None)] * result.ndim
+    selector[axis] = missing
+    result[tuple(selector)] = fill_value
+    return result
+
+
+def pivot(
+    values: np.ndarray,
+    locations: np.ndarray,
+    activities: np.ndarray,
+    *,
+    shape: Optional[Tuple[int, int]] = None,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Builds a dense matrix from a tidy dataset with integer-coded labels.
+    Missing combinations are set to zero, and repeated combinations are added.
+
+    ### Args:
+    * values (np.ndarray) -- The measure of each record. NaN values are
+        considered zero.
+    * locations (np.ndarray) -- The location code of each record.
+    * activities (np.ndarray) -- The activity code of each record.
+
+    ### Keyword Args:
+    * shape ((int, int), optional) -- The shape of the matrix. By default,
+        the maximum codes plus one.
+    * out (np.ndarray, optional) -- A preallocated float array to store the
+        result.
+
+    ### Returns:
+    (np.ndarray) -- A matrix with locations as rows and activities as columns.
+    """
+    if shape is None:
+        shape = (int(locations.max()) + 1, int(activities.max()) + 1)
+
+    values = np.asarray(values, dtype=float)
+    matrix = np.bincount(
+        np.asarray(locations, dtype=np.intp) * shape[1] + activities,
+        weights=np.where(np.isnan(values), 0.0, values),
+        minlength=shape[0] * shape[1],
+    ).reshape(shape)
+
+    if out is None:
+        return matrix
+    np.copyto(out, matrix)
+    return out
@@ -0,0 +1,276 @@
+"""Null model module
+
+Tests which links of the Proximity are stronger than expected by chance, by
+comparing the co-occurrence of each pair of activities against the one of
+random binary Mcp matrices with the same diversity of each location and the
+same ubiquity of each activity.
+
+The random matrices are sampled with the global curveball algorithm (Carstens
+et al., 2018): each step pairs the locations at random, and each pair trades a
+random subset of the activities that only one of them has. All the pairs of a
+step are traded at once, over the rows of a boolean matrix.
+
+As the ubiquities are preserved, the denominator of the Proximity is the same
+for every sample, so the statistics of the Proximity follow from the ones of
+the co-occurrence `M.T @ M`, and the samples never go through `proximity`.
+The co-occurrence of a batch of samples is calculated with a single stacked
+matrix product, and only running sums are kept: the samples are not stored.
+The samples are drawn from independent chains, each one with a seed spawned
+from the `seed` parameter, so the result doesn't depend on the amount of
+workers.
+"""
+
+from concurrent.futures import Executor
+from functools import reduce
+from itertools import repeat
+from typing import Literal, NamedTuple, Optional, Union
+
+import numpy as np
+
+from ._kernels import dot
+from .product_space import proximity_from_cooccurrence
+from .rca import _CHUNK_ELEMENTS, binarize
+from .threads import executor_or_pool
+
+Seed = Union[None, int, np.random.SeedSequence]
+
+
+class NullPartials(NamedTuple):
+    """Running sums over a set of random samples. The sums of the union of two
+    sets are the sum of each field."""
+
+    samples: int
+    # the sum of the co-occurrence of each pair, and of its square
+    total: np.ndarray
+    squares: np.ndarray
+    # the amount of samples with a co-occurrence greater or equal than the
+    # observed one
+    exceedances: np.ndarray
+
+
+class NullProximity(NamedTuple):
+    """The significance of the Proximity of each pair of activities."""
+
+    proximity: np.ndarray
+    # the mean and the standard deviation of the proximity in the null model
+    expected: np.ndarray
+    std: np.ndarray
+    zscores: np.ndarray
+    # one-sided, the probability of a proximity at least as high by chance
+    pvalues: np.ndarray
+    samples: int
+
+
+def curveball(
+    mcp: np.ndarray,
+    rng: np.random.Generator,
+    *,
+    steps: int = 1,
+) -> np.ndarray:
+    """Randomizes a binary matrix preserving the sum of each row and column,
+    with steps of the global curveball algorithm.
+
+    ### Args:
+    * mcp (np.ndarray) -- A binary matrix, with locations as rows.
+    * rng (np.random.Generator) -- The source of random numbers.
+
+    ### Keyword Args:
+    * steps (int, optional) -- The amount of steps. In each step, every row
+        trades with another one. Default value: `1`.
+
+    ### Returns:
+    (np.ndarray) -- A new boolean matrix.
+    """
+    result = np.array(mcp, dtype=bool)
+    n_rows = len(result)
+    half = n_rows // 2
+
+    for _ in range(steps):
+        order = rng.permutation(n_rows)
+        a, b = order[:half], order[half : 2 * half]
+        x, y = result[a], result[b]
+
+        # the activities that only one of the locations has are shuffled, and
+        # the first location keeps as many of them as it had
+        exclusive = x ^ y
+        kept = (x & exclusive).sum(axis=1)
+        keys = np.where(exclusive, rng.random(exclusive.shape), 2.0)
+        ranked = np.argsort(keys, axis=1)
+        first = np.arange(exclusive.shape[1]) < kept[:, np.newaxis]
+        to_x = np.zeros_like(exclusive)
+        np.put_along_axis(to_x, ranked, first, axis=1)
+
+        common = x & y
+        result[a] = common | to_x
+        result[b] = common | (exclusive & ~to_x)
+
+    return result
+
+
+def null_partials(
+    mcp: np.ndarray,
+    seed: Seed = None,
+    *,
+    samples: int = 100,
+    burn_in: int = 50,
+    thin: int = 5,
+) -> NullPartials:
+    """Draws random samples from a chain of curveball steps, and sums their
+    co-occurrence.
+
+    ### Args:
+    * mcp (np.ndarray) -- The observed binary matrix.
+    * seed (int | np.random.SeedSequence, optional) -- The seed of the chain.
+
+    ### Keyword Args:
+    * samples (int, optional) -- The amount of samples. Default value: `100`.
+    * burn_in (int, optional) -- The amount of steps before the first sample.
+        Default value: `50`.
+    * thin (int, optional) -- The amount of steps between two samples.
+        Default value: `5`.
+
+    ### Returns:
+    (NullPartials) -- The running sums of the samples.
+    """
+    rng = np.random.default_rng(seed)
+    current = np.array(mcp, dtype=bool)
+    n_rows, n_cols = current.shape
+    observed = current.T.astype(np.float32).dot(current)
+
+    total = np.zeros((n_cols, n_cols), dtype=np.int64)
+    squares = np.zeros((n_cols, n_cols), dtype=np.int64)
+    exceedances = np.zeros((n_cols, n_cols), dtype=np.int64)
+
+    # the samples of a batch are multiplied at once; float32 products are
+    # exact for integer values under 2**24
+    batchsize = max(_CHUNK_ELEMENTS // max(n_rows * n_cols + n_cols**2, 1), 1)
+    dtype = np.float32 if n_rows < 2**24 else np.float64
+    current = curveball(current, rng, steps=burn_in)
+
+    for start in range(0, samples, batchsize):
+        stack = np.empty((min(batchsize, samples - start), n_rows, n_cols), dtype)
+        for i in range(len(stack)):
+            if start + i > 0:
+                current = curveball(current, rng, steps=thin)
+            stack[i] = current
+
+        cooccurrence = np.matmul(stack.transpose(0, 2, 1), stack)
+        counts = cooccurrence.astype(np.int64)
+        total += counts.sum(axis=0)
+        squares += (counts * counts).sum(axis=0)
+        exceedances += (cooccurrence >= observed).sum(axis=0)
+
+    return NullPartials(samples, total, squares, exceedances)
+
+
+def merge_null_partials(a: NullPartials, b: NullPartials) -> NullPartials:
+    """Merges the running sums of two disjoint sets of samples."""
+    return NullPartials(*(x + y for x, y in zip(a, b)))
+
+
+def calculate_proximity_significance(
+    rcas: np.ndarray,
+    *,
+    cutoff: float = 1,
+    procedure: Literal["max", "sqrt"] = "max",
+    samples: int = 1000,
+    batchsize: int = 100,
+    burn_in: int = 50,
+    thin: int = 5,
+    seed: Seed = None,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> NullProximity:
+    """Compares the Proximity of each pair of activities against a null model
+    that preserves the diversity of the locations and the ubiquity of the
+    activities.
+
+    ### Args:
+    * rcas (np.ndarray) -- A RCA matrix, with locations as rows and activities
+        as columns.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrix. Default value: `1`.
+    * procedure (str, optional) -- Determines how to calcule the denominator.
+        Available options are "sqrt" and "max". Default value: `"max"`.
+    * samples (int, optional) -- The amount of random matrices.
+        Default value: `1000`.
+    * batchsize (int, optional) -- The amount of samples drawn from each
+        chain; each chain is a task for the executor. Default value: `100`.
+    * burn_in (int, optional) -- The amount of curveball steps before the
+        first sample of each chain. Default value: `50`.
+    * thin (int, optional) -- The amount of curveball steps between two
+        samples of a chain. Default value: `5`.
+    * seed (int | np.random.SeedSequence, optional) -- The seed for the
+        chains. The same seed gives the same result.
+    * max_workers (int, optional) -- The size of the process pool. By default,
+        one worker per core; the spare cores go to the BLAS threads of each
+        worker. Ignored when `executor` is provided.
+    * executor (concurrent.futures.Executor, optional) -- The executor used to
+        run the chains. By default, a local process pool.
+
+    ### Returns:
+    (NullProximity) -- The observed Proximity, its expected value and standard
+        deviation under the null model, and the z-score and p-value of each
+        pair of activities. The diagonals of the z-scores and p-values are
+        NaN.
+    """
+    if samples < 2:
+        raise ValueError("At least two samples are required")
+
+    mcp = binarize(rcas, cutoff).astype(bool)
+    n_cols = mcp.shape[1]
+    kp0 = mcp.sum(axis=0).astype(float)
+
+    sizes = [min(batchsize, samples - start) for start in range(0, samples, batchsize)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    # the matrix is sent to the workers with one bit per element
+    packed = np.packbits(mcp, axis=1)
+
+    with executor_or_pool(executor, max_workers, len(sizes), processes=True) as pool:
+        partials = pool.map(
+            _null_partials,
+            repeat(packed),
+            repeat(n_cols),
+            seeds,
+            sizes,
+            repeat(burn_in),
+            repeat(thin),
+        )
+        result = reduce(merge_null_partials, partials)
+
+    n = result.samples
+    observed = dot(mcp.T.astype(float), mcp.astype(float))
+    expected = result.total / n
+    # the numerator is exact in integers
+    variance = (n * result.squares - result.total**2) / (n * (n - 1))
+    std = np.sqrt(np.maximum(variance, 0))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zscores = np.where(std > 0, (observed - expected) / std, np.nan)
+    pvalues = (result.exceedances + 1) / (n + 1)
+    np.fill_diagonal(zscores, np.nan)
+    np.fill_diagonal(pvalues, np.nan)
+
+    # the denominators of the proximity are the same for all the samples
+    return NullProximity(
+        proximity=proximity_from_cooccurrence(observed, kp0, procedure=procedure),
+        expected=proximity_from_cooccurrence(expected, kp0, procedure=procedure),
+        std=proximity_from_cooccurrence(std, kp0, procedure=procedure),
+        zscores=zscores,
+        pvalues=pvalues,
+        samples=n,
+    )
+
+
+def _null_partials(
+    packed: np.ndarray,
+    n_cols: int,
+    seed: np.random.SeedSequence,
+    samples: int,
+    burn_in: int,
+    thin: int,
+) -> NullPartials:
+    mcp = np.unpackbits(packed, axis=1, count=n_cols).astype(bool)
+    return null_partials(mcp, seed, samples=samples, burn_in=burn_in, thin=thin)
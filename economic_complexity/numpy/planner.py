@@ -0,0 +1,273 @@
+"""Execution planner module
+
+Most calculations can run with different strategies, that trade speed for
+memory:
+
+- `"dense"`: the default implementation, which holds the full binary Mcp
+  matrix and its products in memory. The fastest, when it fits.
+- `"sparse"`: works on the list of cells with comparative advantages, so its
+  memory depends on the density of the Mcp matrix instead of its shape. Only
+  available for the complexity indices.
+- `"blocked"`: processes a block of locations at a time, so the memory
+  depends on the amount of activities, and the size of the result.
+
+The planner estimates the peak memory used by each strategy from the shape
+(and the density) of the matrices, and chooses the fastest one that fits in
+the memory budget. The budget is half of the physical memory by default, and
+can be set with `set_memory_budget`, or with the environment variable
+`ECONOMIC_COMPLEXITY_MEMORY_BUDGET` (like `"24GB"`).
+
+The decisions are logged at the `DEBUG` level by the logger of this module,
+and `plan` returns the decision and the estimates without running anything:
+
+```
+plan("proximity", rcas.shape)
+# Plan(operation='proximity', engine='dense', peak_bytes=..., ...)
+```
+"""
+
+import logging
+import os
+import re
+from typing import Callable, Dict, Literal, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from .rca import _CHUNK_ELEMENTS
+
+logger = logging.getLogger(__name__)
+
+Engine = Literal["auto", "dense", "sparse", "blocked"]
+Operation = Literal[
+    "complexity", "proximity", "relatedness", "similarity", "cross_proximity"
+]
+
+# the strategies in order of preference, from the fastest
+ENGINES: Tuple[str, ...] = ("dense", "sparse", "blocked")
+
+_ITEMSIZE = np.dtype(float).itemsize
+_INDEXSIZE = np.dtype(np.intp).itemsize
+_UNITS = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+
+_memory_budget: Optional[int] = None
+
+
+class Plan(NamedTuple):
+    """The strategy chosen to run a calculation."""
+
+    operation: str
+    engine: str
+    # the estimated peak memory of the chosen engine, in bytes
+    peak_bytes: int
+    budget: int
+    # the estimated peak memory of each available engine
+    estimates: Dict[str, int]
+    # the amount of rows of each block, for the "blocked" and "sparse" engines
+    chunksize: int
+
+    @property
+    def fits(self) -> bool:
+        return self.peak_bytes <= self.budget
+
+
+def memory_budget() -> int:
+    """Returns the memory budget used to plan the calculations, in bytes."""
+    if _memory_budget is not None:
+        return _memory_budget
+
+    value = os.environ.get("ECONOMIC_COMPLEXITY_MEMORY_BUDGET")
+    if value:
+        return parse_bytes(value)
+
+    try:
+        total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, OSError, ValueError):
+        total = 8 * 2**30
+    return total // 2
+
+
+def set_memory_budget(budget: Union[int, str, None]):
+    """Sets the memory budget used to plan the calculations.
+
+    ### Args:
+    * budget (int | str | None) -- The amount of bytes, or a string with a
+        unit like `"24GB"`. Use `None` to restore the default.
+    """
+    global _memory_budget
+    _memory_budget = None if budget is None else parse_bytes(budget)
+
+
+def parse_bytes(value: Union[int, str]) -> int:
+    """Converts an amount of memory like `"512MB"` or `"24G"` to bytes."""
+    if isinstance(value, int):
+        return value
+
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)i?B?\s*", value.upper())
+    if match is None:
+        raise ValueError("Invalid amount of memory: %r" % value)
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+def plan(
+    operation: Operation,
+    shape: Tuple[int, int],
+    *,
+    columns_b: Optional[int] = None,
+    density: Union[float, Callable[[], float], None] = None,
+    budget: Optional[int] = None,
+    engine: Engine = "auto",
+) -> Plan:
+    """Chooses the strategy to run a calculation.
+
+    ### Args:
+    * operation (str) -- The calculation: `"complexity"`, `"proximity"`,
+        `"relatedness"`, `"similarity"` or `"cross_proximity"`.
+    * shape ((int, int)) -- The shape of the RCA matrix.
+
+    ### Keyword Args:
+    * columns_b (int, optional) -- The amount of columns of the second RCA
+        matrix, for the cross-proximity.
+    * density (float | Callable, optional) -- The fraction of cells of the
+        Mcp matrix with comparative advantages, or a function that calculates
+        it, which is only called if the sparse strategy is considered. Without
+        it, the sparse strategy is not considered.
+    * budget (int, optional) -- The memory budget in bytes. By default, the
+        value of `memory_budget()`.
+    * engine (str, optional) -- The strategy to use: `"auto"` chooses the
+        fastest one that fits in the budget, or the one with the lowest
+        estimate if none fits. Default value: `"auto"`.
+
+    ### Returns:
+    (Plan) -- The chosen strategy, with the estimates of all the strategies.
+    """
+    budget = memory_budget() if budget is None else budget
+    n_rows, n_cols = shape
+
+    # the blocks use up to a quarter of the budget
+    row_bytes = max(n_cols, 1) * (_ITEMSIZE + 1)
+    chunksize = min(_CHUNK_ELEMENTS // max(n_cols, 1), budget // (4 * row_bytes))
+    chunksize = max(min(chunksize, n_rows), 1)
+
+    estimates = {
+        "dense": _dense_bytes(operation, n_rows, n_cols, columns_b),
+        "blocked": _blocked_bytes(operation, n_rows, n_cols, columns_b, chunksize),
+    }
+
+    # the density is only calculated when the dense strategy doesn't fit
+    considered = engine == "sparse" or (
+        engine == "auto" and estimates["dense"] > budget
+    )
+    if operation == "complexity" and density is not None and considered:
+        value = density() if callable(density) else density
+        estimates["sparse"] = _sparse_bytes(n_rows, n_cols, value, chunksize)
+
+    if engine == "auto":
+        candidates = [name for name in ENGINES if name in estimates]
+        fitting = [name for name in candidates if estimates[name] <= budget]
+        if fitting:
+            engine = fitting[0]
+        else:
+            engine = min(candidates, key=estimates.__getitem__)
+    elif engine not in estimates:
+        raise ValueError(
+            "Engine '%s' is not available for the %s calculation" % (engine, operation)
+        )
+
+    result = Plan(
+        operation=operation,
+        engine=engine,
+        peak_bytes=estimates[engine],
+        budget=budget,
+        estimates=estimates,
+        chunksize=chunksize,
+    )
+    if result.fits:
+        logger.debug("Running %s with the %s engine: %r", operation, engine, result)
+    else:
+        logger.warning(
+            "The %s calculation is estimated to use %d bytes with the %s engine, "
+            "over the memory budget of %d bytes",
+            operation,
+            result.peak_bytes,
+            engine,
+            budget,
+        )
+    return result
+
+
+def mcp_density(rcas: np.ndarray, cutoff: float = 1) -> float:
+    """Calculates the fraction of cells of a RCA matrix over the `cutoff`,
+    reading a block of rows at a time."""
+    if rcas.size == 0:
+        return 0.0
+    chunksize = max(_CHUNK_ELEMENTS // max(rcas.shape[1], 1), 1)
+    with np.errstate(invalid="ignore"):
+        count = sum(
+            int(np.count_nonzero(rcas[start : start + chunksize] >= cutoff))
+            for start in range(0, len(rcas), chunksize)
+        )
+    return count / rcas.size
+
+
+def _dense_bytes(
+    operation: str,
+    n_rows: int,
+    n_cols: int,
+    columns_b: Optional[int],
+) -> int:
+    # the binary Mcp matrix, and the boolean mask used to build it
+    mcp = n_rows * n_cols * (_ITEMSIZE + 1)
+    vectors = 6 * (n_rows + n_cols) * _ITEMSIZE
+
+    if operation == "complexity":
+        return mcp + vectors
+    if operation == "proximity":
+        return mcp + n_cols**2 * _ITEMSIZE + vectors
+    if operation == "relatedness":
+        # the proximity, and the result
+        return mcp + (n_cols**2 + n_rows * n_cols) * _ITEMSIZE + vectors
+    if operation == "similarity":
+        # the logarithms, their centered copy, and the result
+        return (2 * n_rows * n_cols + n_rows**2) * _ITEMSIZE + vectors
+    if operation == "cross_proximity":
+        n_b = n_cols if columns_b is None else columns_b
+        # the second Mcp matrix, the result and a temporary of the same size
+        mcp_b = n_rows * n_b * (_ITEMSIZE + 1)
+        return mcp + mcp_b + 2 * n_cols * n_b * _ITEMSIZE + vectors
+    raise ValueError("Unknown operation '%s'" % operation)
+
+
+def _blocked_bytes(
+    operation: str,
+    n_rows: int,
+    n_cols: int,
+    columns_b: Optional[int],
+    chunksize: int,
+) -> int:
+    block = chunksize * n_cols * (_ITEMSIZE + 1)
+    vectors = 6 * (n_rows + n_cols) * _ITEMSIZE
+
+    if operation == "complexity":
+        # the Mcp matrix of a block is calculated again on each product
+        return block + vectors
+    if operation == "proximity":
+        # the accumulated co-occurrence and the one of the block
+        return 2 * n_cols**2 * _ITEMSIZE + block + vectors
+    if operation == "relatedness":
+        return (n_cols**2 + n_rows * n_cols) * _ITEMSIZE + block + vectors
+    if operation == "similarity":
+        # the standardized logarithms, and the result
+        return (n_rows * n_cols + n_rows**2) * _ITEMSIZE + block + vectors
+    if operation == "cross_proximity":
+        n_b = n_cols if columns_b is None else columns_b
+        block_b = chunksize * n_b * (_ITEMSIZE + 1)
+        return 3 * n_cols * n_b * _ITEMSIZE + block + block_b + vectors
+    raise ValueError("Unknown operation '%s'" % operation)
+
+
+def _sparse_bytes(n_rows: int, n_cols: int, density: float, chunksize: int) -> int:
+    # the row and column of each cell with advantages, the weights gathered
+    # for each of them on each step, and the mask of a block
+    cells = int(density * n_rows * n_cols)
+    vectors = 6 * (n_rows + n_cols) * _ITEMSIZE
+    return cells * (2 * _INDEXSIZE + _ITEMSIZE) + chunksize * n_cols + vectors
@@ -0,0 +1,360 @@
+"""Product Space module"""
+
+from typing import Literal, Optional
+
+import numpy as np
+
+from ._kernels import dot, masked_zscore, proximity_ratio
+from .planner import Engine, plan
+from .rca import binarize
+
+
+def calculate_proximity(
+    rcas: np.ndarray,
+    *,
+    cutoff: float = 1,
+    procedure: Literal["max", "sqrt"] = "max",
+    out: Optional[np.ndarray] = None,
+    engine: Engine = "auto",
+) -> np.ndarray:
+    """Calculates the Proximity index for a matrix of RCAs.
+
+    Hidalgo et al. (2007), introduces the Proximity index which measures the
+    minimum probability that a country has comparative advantages in the export
+    of a product `i`, given that it has comparative advantages in a product `j`.
+
+    ### Args:
+    * rcas (np.ndarray) -- A RCA matrix, with locations as rows and activities
+        as columns.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value.
+        Internally, RCA values under it will be set to zero, one otherwise.
+        Default value: `1`.
+    * procedure (str, optional) -- Determines how to calcule the denominator.
+        Available options are "sqrt" and "max". Default value: `"max"`.
+    * out (np.ndarray, optional) -- A preallocated float array to store the
+        result, with the same shape as the returned matrix.
+    * engine (str, optional) -- The execution strategy: `"dense"`,
+        `"blocked"`, or `"auto"` to let the planner choose. Default value:
+        `"auto"`.
+
+    ### Returns:
+    (np.ndarray) -- A square matrix with the proximity between the activities.
+    """
+    if engine != "dense":
+        chosen = plan("proximity", rcas.shape, engine=engine)
+        if chosen.engine == "blocked":
+            from .engines import blocked_proximity
+
+            return blocked_proximity(
+                rcas,
+                cutoff=cutoff,
+                procedure=procedure,
+                chunksize=chosen.chunksize,
+                out=out,
+            )
+
+    mcp = binarize(rcas, cutoff)
+
+    # Matrix multiplication on M_mi matrix and transposed version,
+    # the shape of this result will be length of products by the length
+    # of products (symetric)
+    numerator_intersection = dot(mcp.T, mcp, out=out)
+
+    # kp0 is a vector of the number of locations with RCA in the given product
+    kp0 = mcp.sum(axis=0)
+
+    return proximity_from_cooccurrence(
+        numerator_intersection, kp0, procedure=procedure, out=numerator_intersection
+    )
+
+
+def proximity_from_cooccurrence(
+    cooccurrence: np.ndarray,
+    kp0: np.ndarray,
+    *,
+    procedure: Literal["max", "sqrt"] = "max",
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculates the Proximity index from the co-occurrence matrix `M.T @ M`
+    and the ubiquity vector `kp0` of a binary Mcp matrix.
+
+    ### Args:
+    * cooccurrence (np.ndarray) -- The amount of locations with comparative
+        advantages in each pair of activities.
+    * kp0 (np.ndarray) -- The amount of locations with comparative advantages
+        in each activity.
+
+    ### Keyword Args:
+    * procedure (str, optional) -- Determines how to calcule the denominator.
+        Available options are "sqrt" and "max". Default value: `"max"`.
+    * out (np.ndarray, optional) -- A preallocated float array to store the
+        result. Can be `cooccurrence` itself.
+
+    ### Returns:
+    (np.ndarray) -- A square matrix with the proximity between the activities.
+    """
+    # the denominator is the geometric mean ("sqrt") or the maximum of the
+    # ubiquities of each pair of activities
+    return proximity_ratio(cooccurrence, kp0, sqrt=procedure == "sqrt", out=out)
+
+
+def calculate_relatedness(
+    rcas: np.ndarray,
+    *,
+    cutoff: float = 1,
+    proximities: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None,
+    engine: Engine = "auto",
+) -> np.ndarray:
+    """Calculates the Relatedness, given a matrix of RCAs for the economic
+    activities of a location, and a matrix of Proximities.
+
+    ### Args:
+    * rcas (np.ndarray) -- Matrix of RCAs, with locations as rows and
+        activities as columns.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value.
+        Internally, RCA values under it will be set to zero, one otherwise.
+        Default value: `1`.
+    * proximities (np.ndarray, optional) -- Matrix with the proximity between
+        the activities, in the same order as the columns of `rcas`.
+        If not provided, will be calculated using the "max" procedure, and
+        the same cutoff value for this call.
+    * out (np.ndarray, optional) -- A preallocated float array to store the
+        result, with the same shape as the returned matrix.
+    * engine (str, optional) -- The execution strategy: `"dense"`,
+        `"blocked"`, or `"auto"` to let the planner choose. Default value:
+        `"auto"`.
+
+    ### Returns:
+    (np.ndarray) -- A matrix with the probability that a location generates
+        comparative advantages in a economic activity.
+    """
+    if proximities is None:
+        proximities = calculate_proximity(rcas, cutoff=cutoff, engine=engine)
+
+    if engine != "dense":
+        chosen = plan("relatedness", rcas.shape, engine=engine)
+        if chosen.engine == "blocked":
+            from .engines import blocked_relatedness
+
+            return blocked_relatedness(
+                rcas, proximities, cutoff=cutoff, chunksize=chosen.chunksize, out=out
+            )
+
+    mcp = binarize(rcas, cutoff)
+
+    # The numerator is the matrix multiplication of M_im with the proximities;
+    # the denominator is the sum of all proximities per activity
+    density_numerator = dot(mcp, proximities, out=out)
+    density_denominator = proximities.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.divide(
+            density_numerator, density_denominator, out=density_numerator
+        )
+
+
+def calculate_distance(
+    rcas: np.ndarray,
+    *,
+    cutoff: float = 1,
+    proximities: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculates the Distance, the complement of the Relatedness.
+
+    ### Args:
+    * rcas (np.ndarray) -- Matrix of RCAs, with locations as rows and
+        activities as columns.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value.
+        Default value: `1`.
+    * proximities (np.ndarray, optional) -- Matrix with the proximity between
+        the activities. If not provided, will be calculated using the "max"
+        procedure, and the same cutoff value for this call.
+    * out (np.ndarray, optional) -- A preallocated float array to store the
+        result, with the same shape as the returned matrix.
+
+    ### Returns:
+    (np.ndarray) -- A matrix with the distance between locations and activities.
+    """
+    relatedness = calculate_relatedness(
+        rcas, cutoff=cutoff, proximities=proximities, out=out
+    )
+    return np.subtract(1, relatedness, out=relatedness)
+
+
+def calculate_opportunity_gain(
+    rcas: np.ndarray,
+    *,
+    pci: np.ndarray,
+    cutoff: float = 1,
+    proximities: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculates the opportunity gain caused by the contribution of a certain
+    characteristic, relative to how this affects other characteristics.
+
+    ### Args:
+    * rcas (np.ndarray) -- Matrix of RCAs, with locations as rows and
+        activities as columns.
+
+    ### Keyword Args:
+    * pci (np.ndarray) -- Product Complexity Index, in the same order as the
+        columns of `rcas`.
+    * cutoff (float, optional) -- Set the cutoff threshold value.
+        Default value: `1`.
+    * proximities (np.ndarray, optional) -- Square matrix with the proximity
+        between the activities, in the same order as the columns of `rcas`.
+        If not provided, will be calculated using the "max" procedure, and the
+        same cutoff value for this call.
+    * out (np.ndarray, optional) -- A preallocated float array to store the
+        result, with the same shape as the returned matrix.
+
+    ### Returns:
+    (np.ndarray) -- A matrix with the opportunity gain for each location and
+        activity.
+    """
+    if proximities is None:
+        proximities = calculate_proximity(rcas, cutoff=cutoff)
+
+    mcp = binarize(rcas, cutoff)
+    prox_sums = proximities.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # turn proximities in to ratios out of total
+        prox_ratio = proximities / prox_sums
+
+        # the inverse of the Mcp matrix flips all of its values
+        inverse_mcp = 1 - mcp
+
+        # the middle part of the equation
+        middle = inverse_mcp * pci
+
+        # the distance of the inverse Mcp is the right-half of the equation
+        dcp = 1 - inverse_mcp.dot(proximities) / prox_sums
+        right = dcp * pci
+
+    opp_gain = dot(middle, prox_ratio, out=out)
+    return np.subtract(opp_gain, right, out=opp_gain)
+
+
+def calculate_similarity(
+    rcas: np.ndarray,
+    *,
+    epsilon: float = 0.1,
+    engine: Engine = "auto",
+) -> np.ndarray:
+    """Calculates the Export Similarity Index for a matrix of RCAs.
+
+    Bahar et al. (2014) introduces this measure of similarity in the export
+    structure of a pair of countries c and c'. It's defined as the Pearson
+    correlation between the logarithm of the RCA vectors of the two countries.
+
+    ### Args:
+    * rcas (np.ndarray) -- A RCA matrix, with locations as rows and
+        activities as columns.
+
+    ### Keyword Args:
+    * epsilon (float, optional) -- A low value to prevent the calculation of
+        logarithm to output `-Inf`. Default value: `0.1`.
+    * engine (str, optional) -- The execution strategy: `"dense"`,
+        `"blocked"`, or `"auto"` to let the planner choose. Default value:
+        `"auto"`.
+
+    ### Returns:
+    (np.ndarray) -- A square matrix with the Export Similarity Index between
+        the locations.
+    """
+    if engine != "dense":
+        chosen = plan("similarity", rcas.shape, engine=engine)
+        if chosen.engine == "blocked":
+            from .engines import blocked_similarity
+
+            return blocked_similarity(
+                rcas, epsilon=epsilon, chunksize=chosen.chunksize
+            )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.corrcoef(np.log(rcas + epsilon))
+
+
+def calculate_pmi(
+    tbl: np.ndarray,
+    rcas: np.ndarray,
+    measure: np.ndarray,
+    *,
+    cutoff: float = 1,
+) -> np.ndarray:
+    """Calculates the Product 'measure' Index, like the Product Gini Index
+    (PGI) or the Product Emission Intensity Index (PEII).
+
+    All the matrices must be aligned: the same locations in the same order as
+    rows, and `tbl` and `rcas` with the same activities as columns.
+
+    ### Args:
+    * tbl (np.ndarray) -- A matrix with the measurement of the data as values.
+    * rcas (np.ndarray) -- The RCA calculation obtained from the `tbl` data.
+    * measure (np.ndarray) -- A matrix with a column for each measure, and a
+        row for each location.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA matrix.
+        Default value: `1`.
+
+    ### Returns:
+    (np.ndarray) -- A matrix with a row for each activity, and a column for
+        each measure.
+    """
+    tbl = np.where(np.isnan(tbl), 0.0, tbl)
+    measure = np.where(np.isnan(measure), 0.0, measure)
+    mcp = binarize(rcas, cutoff)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # get Scp matrix
+        scp = tbl / tbl.sum(axis=1, keepdims=True)
+
+        # get Np array
+        weights = mcp * scp
+        normp = np.nansum(weights, axis=0)
+        num = weights.T.dot(measure)
+
+        return num / normp.reshape((len(normp), 1))
+
+
+def calculate_relative_relatedness(
+    rcas: np.ndarray,
+    *,
+    cutoff: float = 1,
+    proximities: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculates the Relative Relatedness, given a matrix of RCAs for the
+    economic activities of a location, and a matrix of Proximities.
+
+    The relatedness is standardized per location, using the mean and standard
+    deviation of the activities where the location doesn't have comparative
+    advantages.
+
+    ### Args:
+    * rcas (np.ndarray) -- Matrix of RCAs, with locations as rows and
+        activities as columns.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value.
+        Default value: `1`.
+    * proximities (np.ndarray, optional) -- Matrix with the proximity between
+        the activities. If not provided, will be calculated using the "max"
+        procedure, and the same cutoff value for this call.
+
+    ### Returns:
+    (np.ndarray) -- A matrix with the relative relatedness.
+    """
+    wcp = calculate_relatedness(rcas, cutoff=cutoff, proximities=proximities)
+
+    # standardize using the activities without comparative advantages
+    return masked_zscore(wcp, rcas, cutoff)
@@ -0,0 +1,129 @@
+"""Revealed Comparative Advantage (RCA) module
+
+The Revealed Comparative Advantage is an index introduced by Balassa (1965),
+which is used to evaluate the main products to be exported by a country,
+and their comparative advantages in relation to the level of world exports
+(Hidalgo et al., 2007).
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+# The default size of the chunks, in number of elements
+_CHUNK_ELEMENTS = 2**22
+
+
+def calculate_rca(
+    tbl: np.ndarray,
+    *,
+    binary: bool = False,
+    cutoff: float = 1,
+    dtype: Optional[np.dtype] = None,
+    chunksize: Optional[int] = None,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculates the Revealed Comparative Advantage (RCA) for a 2-dimensional
+    array, with locations as rows and activities as columns.
+
+    The sums by row, by column and the total are calculated in a single pass
+    over the data, and the normalization is written directly into the output,
+    processing `chunksize` rows at a time. The only temporary arrays are the
+    size of a chunk, so with `out=tbl` the peak memory is about the size of
+    the input.
+
+    ### Args:
+    * tbl (np.ndarray) -- A matrix with the measurement of the data as values.
+        Missing values (NaN) are considered zero.
+
+    ### Keyword Args:
+    * binary (bool, optional) -- Return the binarized values instead: 1 if
+        RCA >= cutoff, 0 if not. Default value: `False`.
+    * cutoff (float, optional) -- The threshold value for the binarization.
+        Default value: `1`.
+    * dtype (np.dtype, optional) -- The data type of the result, like
+        `np.float32`. Ignored if `out` is provided. Default value: `float64`.
+    * chunksize (int, optional) -- The amount of rows to process at a time.
+        By default, as many rows as fit in about 32MB of float64 values.
+    * out (np.ndarray, optional) -- A preallocated array to store the
+        result. Can be `tbl` itself, to calculate the RCA in place.
+
+    ### Returns:
+    (np.ndarray) -- RCA matrix with real values.
+    """
+    tbl = np.asarray(tbl)
+    if out is None:
+        out = np.empty(tbl.shape, dtype=dtype or float)
+    elif out.shape != tbl.shape:
+        raise ValueError("The `out` array must have the same shape as `tbl`")
+
+    n_rows, n_cols = tbl.shape
+    chunksize = chunksize or max(_CHUNK_ELEMENTS // max(n_cols, 1), 1)
+
+    # `out` is written after each chunk is read, so it can be `tbl` itself
+    row_sums, col_sums = _sums(tbl, chunksize)
+    total_sum = col_sums.sum()
+    workspace = not binary and out.dtype == np.float64
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rca_denominator = col_sums / total_sum
+
+        for start in range(0, n_rows, chunksize):
+            end = start + chunksize
+
+            # a float64 output is used as the workspace for its own chunk
+            if workspace:
+                rcas = out[start:end]
+                np.copyto(rcas, tbl[start:end], casting="unsafe")
+                np.copyto(rcas, 0.0, where=np.isnan(rcas))
+            else:
+                rcas = _filled(tbl[start:end])
+
+            np.divide(rcas, row_sums[start:end], out=rcas)
+            np.divide(rcas, rca_denominator, out=rcas)
+
+            if binary:
+                np.greater_equal(rcas, cutoff, out=out[start:end], casting="unsafe")
+            elif not workspace:
+                np.copyto(out[start:end], rcas, casting="same_kind")
+
+    return out
+
+
+def _sums(tbl: np.ndarray, chunksize: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculates the sums by row and by column of a matrix, ignoring the
+    missing values, reading `chunksize` rows at a time."""
+    row_sums = np.empty((tbl.shape[0], 1))
+    col_sums = np.zeros(tbl.shape[1])
+
+    for start in range(0, tbl.shape[0], chunksize):
+        chunk = tbl[start : start + chunksize]
+        if chunk.dtype != np.float64 or np.isnan(chunk).any():
+            chunk = _filled(chunk)
+        row_sums[start : start + chunksize, 0] = chunk.sum(axis=1)
+        col_sums += chunk.sum(axis=0)
+
+    return row_sums, col_sums
+
+
+def _filled(chunk: np.ndarray) -> np.ndarray:
+    """Returns a float64 copy of a chunk, with missing values as zero."""
+    chunk = np.array(chunk, dtype=float)
+    np.copyto(chunk, 0.0, where=np.isnan(chunk))
+    return chunk
+
+
+def binarize(rcas: np.ndarray, cutoff: float = 1) -> np.ndarray:
+    """Converts a RCA matrix into a binary matrix, usually labeled Mcp.
+
+    ### Args:
+    * rcas (np.ndarray) -- A RCA matrix.
+    * cutoff (float, optional) -- The threshold value. RCA values under it
+        will be set to zero, one otherwise. Missing values are set to zero.
+        Default value: `1`.
+
+    ### Returns:
+    (np.ndarray) -- A matrix of zeros and ones, as floating point values.
+    """
+    return np.greater_equal(rcas, cutoff).astype(float)
@@ -0,0 +1,119 @@
+"""Rolling windows module
+
+The exports of a single year are noisy, so the RCA is often calculated over
+the sum of several consecutive periods, like 3-year rolling windows. The
+functions in this module keep a running sum of the window, adding the new
+period and subtracting the expired one as it slides, so the windows of all
+the periods are calculated in time linear in the number of periods. The cells
+whose window only has zeros are set to exactly zero, so a location that
+leaves the data doesn't keep a rounding residue.
+"""
+
+from typing import Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from .complexity import calculate_complexity
+from .rca import calculate_rca
+
+
+class RollingRca(NamedTuple):
+    """The indicators calculated for each position of the window."""
+
+    # arrays with the windows as the first axis
+    rca: np.ndarray
+    eci: Optional[np.ndarray]
+    pci: Optional[np.ndarray]
+
+
+def window_sums(tbls: np.ndarray, window: int) -> Iterator[np.ndarray]:
+    """Iterates over the sums of `window` consecutive periods.
+
+    The same array is updated and yielded on each step, so it must be copied
+    if it's going to be kept after the next step.
+
+    ### Args:
+    * tbls (np.ndarray) -- A 3-dimensional array, with the periods as the
+        first axis, and a matrix of locations by activities for each period.
+        Missing values (NaN) are considered zero.
+    * window (int) -- The amount of periods in each window.
+
+    ### Returns:
+    (Iterator[np.ndarray]) -- The sum of each window, from the window that
+        ends in the period `window - 1` to the one that ends in the last.
+    """
+    tbls = np.asarray(tbls)
+    if tbls.ndim != 3:
+        raise ValueError("The periods must be a 3-dimensional array")
+    if not 1 <= window <= len(tbls):
+        raise ValueError("The window must be between 1 and the amount of periods")
+
+    running = np.zeros(tbls.shape[1:])
+    # the amount of non-zero values in the window of each cell; the running
+    # sum of a cell without them is reset, so no rounding residue is left
+    counts = np.zeros(tbls.shape[1:], dtype=np.intp)
+    for i, tbl in enumerate(tbls):
+        values = np.nan_to_num(tbl)
+        running += values
+        counts += values != 0
+        if i >= window:
+            expired = np.nan_to_num(tbls[i - window])
+            running -= expired
+            counts -= expired != 0
+            running[counts == 0] = 0
+        if i >= window - 1:
+            yield running
+
+
+def calculate_rolling_rca(
+    tbls: np.ndarray,
+    *,
+    window: int = 3,
+    binary: bool = False,
+    cutoff: float = 1,
+    complexity: bool = False,
+    iterations: int = 20,
+) -> RollingRca:
+    """Calculates the RCA, and optionally the ECI and PCI, over the sum of
+    each window of consecutive periods.
+
+    ### Args:
+    * tbls (np.ndarray) -- A 3-dimensional array, with the periods as the
+        first axis, and a matrix of locations by activities for each period.
+
+    ### Keyword Args:
+    * window (int, optional) -- The amount of periods in each window.
+        Default value: `3`.
+    * binary (bool, optional) -- Return the binarized RCA values: 1 if
+        RCA >= cutoff, 0 if not. Default value: `False`.
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrices. Default value: `1`.
+    * complexity (bool, optional) -- Also calculate the ECI and PCI of each
+        window. Default value: `False`.
+    * iterations (int, optional) -- Limit of recursive calculations for kp
+        and kc. Default value: `20`.
+
+    ### Returns:
+    (RollingRca) -- The RCA matrices, of shape `(windows, locations,
+        activities)`, where `windows = periods - window + 1` and the window
+        `i` ends in the period `i + window - 1`. The ECI and PCI, of shape
+        `(windows, locations)` and `(windows, activities)`, or `None`.
+    """
+    tbls = np.asarray(tbls)
+    n_windows = len(tbls) - window + 1
+    rcas = np.empty((max(n_windows, 0),) + tbls.shape[1:])
+    eci = np.empty(rcas.shape[:2]) if complexity else None
+    pci = np.empty((len(rcas), rcas.shape[2])) if complexity else None
+
+    for i, values in enumerate(window_sums(tbls, window)):
+        calculate_rca(values, binary=binary, cutoff=cutoff, out=rcas[i])
+        if complexity:
+            # the binary RCA is already 0/1, so it must not be cut again
+            calculate_complexity(
+                rcas[i],
+                cutoff=1 if binary else cutoff,
+                iterations=iterations,
+                out=(eci[i], pci[i]),
+            )
+
+    return RollingRca(rcas, eci, pci)
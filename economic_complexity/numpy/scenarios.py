@@ -0,0 +1,265 @@
+"""Counterfactual scenarios module
+
+Evaluates how the Complexity indices and the Opportunity Gain change when some
+locations gain or lose comparative advantages in some activities, without
+recalculating everything for each scenario:
+
+- the degrees of the Mcp matrix, and its co-occurrence matrix `M.T @ M`, are
+  updated with the rows changed by the scenario;
+- the reflections use the Mcp matrix of the baseline plus a sparse correction,
+  and start from the converged vectors of the baseline;
+- the Opportunity Gain is only calculated for the locations of interest.
+
+```
+baseline = prepare_baseline(rcas)
+results = evaluate_scenarios(baseline, [
+    [(region, product_x, True), (region, product_y, True)],
+    [(region, product_z, True)],
+])
+```
+
+The scenarios share the arrays of the baseline, so they are evaluated with a
+pool of threads; numpy releases the GIL during the matrix products.
+"""
+
+from concurrent.futures import Executor
+from itertools import repeat
+from typing import Iterable, List, Literal, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .complexity import ReflectionState, reflect, standardize
+from .product_space import calculate_opportunity_gain, proximity_from_cooccurrence
+from .rca import binarize
+from .threads import executor_or_pool
+
+# The row of the location, the column of the activity, and whether the
+# location has comparative advantages in the activity in the scenario
+Edit = Tuple[int, int, bool]
+
+
+class Baseline(NamedTuple):
+    """The calculations over the original RCA matrix, shared by all the
+    scenarios."""
+
+    mcp: np.ndarray
+    kc0: np.ndarray
+    kp0: np.ndarray
+    cooccurrence: np.ndarray
+    proximities: np.ndarray
+    state: ReflectionState
+    eci: np.ndarray
+    pci: np.ndarray
+    procedure: Literal["max", "sqrt"]
+    iterations: int
+    tol: float
+
+
+class ScenarioResult(NamedTuple):
+    """The indicators after applying the edits of a scenario."""
+
+    eci: np.ndarray
+    pci: np.ndarray
+    proximities: np.ndarray
+    # the rows of the locations of the opportunity gain matrix
+    locations: np.ndarray
+    opportunity_gain: np.ndarray
+    iterations: int
+    converged: bool
+
+
+def prepare_baseline(
+    rcas: np.ndarray,
+    *,
+    cutoff: float = 1,
+    procedure: Literal["max", "sqrt"] = "max",
+    iterations: int = 200,
+    tol: float = 1e-8,
+) -> Baseline:
+    """Calculates the baseline of the scenarios: the Mcp matrix, its degrees
+    and co-occurrence, the Proximity, and the converged Complexity indices.
+
+    ### Args:
+    * rcas (np.ndarray) -- RCA matrix, with locations as rows and activities
+        as columns.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrix. Default value: `1`.
+    * procedure (str, optional) -- Determines how to calcule the denominator
+        of the Proximity. Available options are "sqrt" and "max".
+        Default value: `"max"`.
+    * iterations (int, optional) -- Limit of recursive calculations for kp
+        and kc, for the baseline and each scenario. Default value: `200`.
+    * tol (float, optional) -- Stop the iterations when the largest change of
+        the standardized vectors between two steps is under this value.
+        Default value: `1e-8`.
+
+    ### Returns:
+    (Baseline) -- The calculations over the original matrix.
+    """
+    mcp = binarize(rcas, cutoff)
+    kc0 = mcp.sum(axis=1)
+    kp0 = mcp.sum(axis=0)
+
+    cooccurrence = mcp.T.dot(mcp)
+    proximities = proximity_from_cooccurrence(cooccurrence, kp0, procedure=procedure)
+
+    state = reflect(mcp.dot, mcp.T.dot, kc0, kp0, iterations=iterations, tol=tol)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eci = standardize(state.kc)
+        pci = standardize(state.kp)
+
+    return Baseline(
+        mcp=mcp,
+        kc0=kc0,
+        kp0=kp0,
+        cooccurrence=cooccurrence,
+        proximities=proximities,
+        state=state,
+        eci=eci,
+        pci=pci,
+        procedure=procedure,
+        iterations=iterations,
+        tol=tol,
+    )
+
+
+def evaluate_scenario(
+    baseline: Baseline,
+    edits: Iterable[Edit],
+    *,
+    locations: Optional[Sequence[int]] = None,
+) -> ScenarioResult:
+    """Calculates the indicators after changing some cells of the Mcp matrix
+    of the baseline.
+
+    ### Args:
+    * baseline (Baseline) -- The calculations over the original matrix, as
+        returned by `prepare_baseline`.
+    * edits (Iterable[(int, int, bool)]) -- The cells to change, as the row
+        of the location, the column of the activity, and whether the location
+        has comparative advantages in the activity in the scenario. If a cell
+        is repeated, the last edit is used.
+
+    ### Keyword Args:
+    * locations (Sequence[int], optional) -- The rows of the locations to
+        calculate the Opportunity Gain for. By default, the edited locations.
+
+    ### Returns:
+    (ScenarioResult) -- The indicators in the scenario.
+    """
+    mcp = baseline.mcp
+    n_rows, n_cols = mcp.shape
+    rows, cols, values = _cells(edits)
+    edited = np.unique(rows)
+
+    # only the cells with a different value change the calculations
+    delta = values - mcp[rows, cols]
+    rows, cols, delta = rows[delta != 0], cols[delta != 0], delta[delta != 0]
+
+    kc0 = baseline.kc0 + np.bincount(rows, weights=delta, minlength=n_rows)
+    kp0 = baseline.kp0 + np.bincount(cols, weights=delta, minlength=n_cols)
+
+    # the co-occurrence only changes by the contribution of the edited rows
+    changed, positions = np.unique(rows, return_inverse=True)
+    before = mcp[changed]
+    after = before.copy()
+    after[positions, cols] += delta
+    cooccurrence = baseline.cooccurrence - before.T.dot(before) + after.T.dot(after)
+    proximities = proximity_from_cooccurrence(
+        cooccurrence, kp0, procedure=baseline.procedure, out=cooccurrence
+    )
+
+    def dot(values: np.ndarray) -> np.ndarray:
+        correction = np.bincount(rows, weights=delta * values[cols], minlength=n_rows)
+        return mcp.dot(values) + correction
+
+    def dot_transposed(values: np.ndarray) -> np.ndarray:
+        correction = np.bincount(cols, weights=delta * values[rows], minlength=n_cols)
+        return mcp.T.dot(values) + correction
+
+    state = reflect(
+        dot,
+        dot_transposed,
+        kc0,
+        kp0,
+        iterations=baseline.iterations,
+        initial=(baseline.state.kc, baseline.state.kp),
+        tol=baseline.tol,
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eci = standardize(state.kc)
+        pci = standardize(state.kp)
+
+    locations = edited if locations is None else np.asarray(locations, dtype=np.intp)
+    mcp_locations = mcp[locations]
+    for position, row in enumerate(changed):
+        mcp_locations[locations == row] = after[position]
+    opportunity_gain = calculate_opportunity_gain(
+        mcp_locations, pci=pci, proximities=proximities
+    )
+
+    return ScenarioResult(
+        eci=eci,
+        pci=pci,
+        proximities=proximities,
+        locations=locations,
+        opportunity_gain=opportunity_gain,
+        iterations=state.iterations,
+        converged=state.converged,
+    )
+
+
+def evaluate_scenarios(
+    baseline: Baseline,
+    scenarios: Iterable[Iterable[Edit]],
+    *,
+    locations: Optional[Sequence[int]] = None,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> List[ScenarioResult]:
+    """Evaluates a batch of scenarios over the same baseline, in parallel.
+
+    ### Args:
+    * baseline (Baseline) -- The calculations over the original matrix, as
+        returned by `prepare_baseline`.
+    * scenarios (Iterable[Iterable[(int, int, bool)]]) -- The edits of each
+        scenario, as described in `evaluate_scenario`.
+
+    ### Keyword Args:
+    * locations (Sequence[int], optional) -- The rows of the locations to
+        calculate the Opportunity Gain for. By default, the edited locations
+        of each scenario.
+    * max_workers (int, optional) -- The size of the thread pool. By default,
+        one worker per core; the spare cores go to the BLAS threads of each
+        worker. Ignored when `executor` is provided.
+    * executor (concurrent.futures.Executor, optional) -- The executor used to
+        distribute the scenarios. By default, a local thread pool.
+
+    ### Returns:
+    (List[ScenarioResult]) -- The indicators of each scenario, in order.
+    """
+    scenarios = [list(edits) for edits in scenarios]
+    with executor_or_pool(executor, max_workers, len(scenarios)) as pool:
+        return list(pool.map(_evaluate, repeat(baseline), scenarios, repeat(locations)))
+
+
+def _evaluate(
+    baseline: Baseline,
+    edits: Iterable[Edit],
+    locations: Optional[Sequence[int]],
+) -> ScenarioResult:
+    return evaluate_scenario(baseline, edits, locations=locations)
+
+
+def _cells(edits: Iterable[Edit]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the row, the column and the value of the edited cells, keeping
+    the last edit of each cell."""
+    cells = {(int(row), int(col)): float(value) for row, col, value in edits}
+    if not cells:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, np.empty(0)
+
+    rows, cols = (np.fromiter(axis, dtype=np.intp) for axis in zip(*cells))
+    return rows, cols, np.fromiter(cells.values(), dtype=float)
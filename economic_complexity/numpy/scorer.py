@@ -0,0 +1,162 @@
+"""Portfolio scoring module
+
+Scores new locations, like new subnational units or the portfolio of a firm,
+against a fixed Product Space, without adding them to the RCA matrix and
+calculating the Proximity again.
+
+The scorer keeps the Proximity and the PCI of the reference locations. All
+the indicators of a batch of new rows are linear in its binary Mcp matrix:
+
+- the Relatedness is `M @ (P / P.sum(axis=0))`;
+- the Opportunity Gain is `pci @ W - M @ (diag(pci) @ W) - pci * relatedness`,
+  where `W = P / P.sum(axis=0)`, since the distance of the activities without
+  comparative advantages is the Relatedness itself;
+- the subnational ECI is `(M @ pci) / (M @ 1)`, over the known PCI values.
+
+So the frozen matrices are stacked side by side, and each batch is scored
+with a single matrix product.
+"""
+
+from typing import Literal, NamedTuple, Optional
+
+import numpy as np
+
+from ._kernels import dot
+from .complexity import calculate_complexity
+from .product_space import calculate_proximity
+from .rca import binarize
+
+
+class PortfolioScores(NamedTuple):
+    """The indicators of a batch of new locations."""
+
+    relatedness: np.ndarray
+    distance: np.ndarray
+    opportunity_gain: np.ndarray
+    # the average PCI of the activities with comparative advantages
+    eci: np.ndarray
+
+
+class PortfolioScorer:
+    """Scores batches of new locations against a fixed Proximity matrix and
+    PCI vector.
+
+    Use the `PortfolioScorer.from_rca` constructor to build it from the RCA
+    matrix of the reference locations.
+    """
+
+    def __init__(
+        self,
+        proximities: np.ndarray,
+        pci: np.ndarray,
+        *,
+        cutoff: float = 1,
+    ):
+        proximities = np.asarray(proximities, dtype=float)
+        pci = np.asarray(pci, dtype=float)
+        n = len(pci)
+        if proximities.shape != (n, n):
+            raise ValueError(
+                "The proximity matrix must be square, with an activity for "
+                "each PCI value"
+            )
+
+        self.proximities = proximities
+        self.pci = pci
+        self.cutoff = cutoff
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = proximities / proximities.sum(axis=0)
+
+        # the activities without a known PCI are ignored by the ECI
+        known = ~np.isnan(pci)
+        self._base = pci.dot(weights)
+        self._operator = np.concatenate(
+            [
+                weights,
+                pci[:, np.newaxis] * weights,
+                np.where(known, pci, 0.0)[:, np.newaxis],
+                known[:, np.newaxis].astype(float),
+            ],
+            axis=1,
+        )
+
+    def __repr__(self):
+        return "%s(activities=%d)" % (type(self).__name__, len(self.pci))
+
+    @property
+    def n_activities(self) -> int:
+        """The amount of activities of the Product Space."""
+        return len(self.pci)
+
+    @classmethod
+    def from_rca(
+        cls,
+        rcas: np.ndarray,
+        *,
+        cutoff: float = 1,
+        procedure: Literal["max", "sqrt"] = "max",
+        pci: Optional[np.ndarray] = None,
+        iterations: int = 20,
+    ) -> "PortfolioScorer":
+        """Builds the scorer from the RCA matrix of the reference locations.
+
+        ### Args:
+        * rcas (np.ndarray) -- A RCA matrix, with locations as rows and
+            activities as columns.
+
+        ### Keyword Args:
+        * cutoff (float, optional) -- Set the cutoff threshold value for the
+            RCA matrices, of the reference and of the new locations.
+            Default value: `1`.
+        * procedure (str, optional) -- Determines how to calcule the
+            denominator of the Proximity. Available options are "sqrt" and
+            "max". Default value: `"max"`.
+        * pci (np.ndarray, optional) -- The PCI of the activities. By default,
+            calculated from `rcas`.
+        * iterations (int, optional) -- Limit of recursive calculations for kp
+            and kc, when the PCI is calculated. Default value: `20`.
+
+        ### Returns:
+        (PortfolioScorer) -- The scorer.
+        """
+        proximities = calculate_proximity(rcas, cutoff=cutoff, procedure=procedure)
+        if pci is None:
+            _, pci = calculate_complexity(rcas, cutoff=cutoff, iterations=iterations)
+        return cls(proximities, pci, cutoff=cutoff)
+
+    def score(self, rcas: np.ndarray) -> PortfolioScores:
+        """Calculates the indicators of a batch of new locations.
+
+        ### Args:
+        * rcas (np.ndarray) -- A RCA matrix of the new locations, with the
+            activities of the scorer as columns, in the same order. A binary
+            matrix can be used with the default cutoff.
+
+        ### Returns:
+        (PortfolioScores) -- The Relatedness, Distance and Opportunity Gain of
+            each new location and activity, and the subnational ECI of each
+            new location.
+        """
+        mcp = binarize(np.atleast_2d(rcas), self.cutoff)
+        if mcp.shape[1] != self.n_activities:
+            raise ValueError(
+                "Expected %d activities, got %d" % (self.n_activities, mcp.shape[1])
+            )
+
+        n = self.n_activities
+        product = dot(mcp, self._operator)
+        relatedness = product[:, :n]
+
+        opportunity_gain = self._base - product[:, n : 2 * n]
+        opportunity_gain -= relatedness * self.pci
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            eci = product[:, 2 * n] / product[:, 2 * n + 1]
+
+        return PortfolioScores(
+            relatedness=relatedness,
+            distance=1 - relatedness,
+            opportunity_gain=opportunity_gain,
+            eci=eci,
+        )
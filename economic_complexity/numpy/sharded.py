@@ -0,0 +1,250 @@
+"""Sharded execution module
+
+The co-occurrence matrix `M.T @ M`, the degree vectors, and the operator used
+by the reflections method decompose exactly over partitions of the locations.
+The functions in this module process blocks of locations independently (for
+example, one file per country in a subnational dataset), reduce their partial
+accumulators, and calculate the Proximity and the Complexity indices from them,
+without holding the full RCA matrix in a single process.
+
+Blocks can be passed as arrays, or as picklable callables that return the
+array when called, so each worker loads its own block:
+
+```
+blocks = [functools.partial(np.load, path) for path in sorted(paths)]
+eci, pci = sharded_complexity(blocks)
+```
+
+The work is distributed using an executor with the `concurrent.futures`
+interface. By default a local `ProcessPoolExecutor` is used, which starts its
+workers with the "spawn" method: forking a process after the thread pools of
+numba, polars or BLAS have been started can deadlock. The cores are split
+between the workers and their BLAS threads, see
+`economic_complexity.numpy.threads`.
+"""
+
+from concurrent.futures import Executor
+from functools import reduce
+from itertools import repeat
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from .complexity import standardize
+from .product_space import proximity_from_cooccurrence
+from .rca import binarize
+from .threads import executor_or_pool
+
+Block = Union[np.ndarray, Callable[[], np.ndarray]]
+
+
+class ShardPartials(NamedTuple):
+    """Partial accumulators for a block of locations. The accumulators of the
+    union of two blocks are the sum of each field."""
+
+    # The co-occurrence matrix `M.T @ M`
+    cooccurrence: np.ndarray
+    # The ubiquity of each activity
+    kp0: np.ndarray
+    # The product-side reflection operator `M.T @ diag(1 / kc0) @ M`
+    reflection: np.ndarray
+    # The first reflection step `M.T @ kc0`
+    seed: np.ndarray
+
+
+def block_partials(block: Block, *, cutoff: float = 1) -> ShardPartials:
+    """Calculates the partial accumulators for a block of locations.
+
+    ### Args:
+    * block (np.ndarray | Callable) -- A RCA matrix for a subset of the
+        locations (all blocks must have the same activities, in the same
+        order as columns), or a callable that returns it.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrix. Default value: `1`.
+
+    ### Returns:
+    (ShardPartials) -- The partial accumulators of the block.
+    """
+    mcp = binarize(_load(block), cutoff)
+    kc0 = mcp.sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weighted = mcp / kc0.reshape((len(kc0), 1))
+
+    return ShardPartials(
+        cooccurrence=mcp.T.dot(mcp),
+        kp0=mcp.sum(axis=0),
+        reflection=mcp.T.dot(weighted),
+        seed=mcp.T.dot(kc0),
+    )
+
+
+def merge_partials(a: ShardPartials, b: ShardPartials) -> ShardPartials:
+    """Merges the partial accumulators of two disjoint blocks of locations."""
+    return ShardPartials(*(x + y for x, y in zip(a, b)))
+
+
+def reduce_partials(
+    blocks: Iterable[Block],
+    *,
+    cutoff: float = 1,
+    executor: Optional[Executor] = None,
+) -> ShardPartials:
+    """Calculates the partial accumulators of each block in parallel, and
+    reduces them into the accumulators of the full matrix.
+
+    ### Args:
+    * blocks (Iterable[np.ndarray | Callable]) -- The RCA matrices for each
+        block of locations, or callables that return them.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrix. Default value: `1`.
+    * executor (concurrent.futures.Executor, optional) -- The executor used to
+        distribute the work. By default, a local process pool.
+
+    ### Returns:
+    (ShardPartials) -- The accumulators for all the locations.
+    """
+    with executor_or_pool(executor, processes=True) as pool:
+        partials = pool.map(_block_partials, blocks, repeat(cutoff))
+        return reduce(merge_partials, partials)
+
+
+def sharded_proximity(
+    blocks: Iterable[Block],
+    *,
+    cutoff: float = 1,
+    procedure: Literal["max", "sqrt"] = "max",
+    executor: Optional[Executor] = None,
+    partials: Optional[ShardPartials] = None,
+) -> np.ndarray:
+    """Calculates the Proximity index from blocks of locations.
+
+    ### Args:
+    * blocks (Iterable[np.ndarray | Callable]) -- The RCA matrices for each
+        block of locations, or callables that return them.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrix. Default value: `1`.
+    * procedure (str, optional) -- Determines how to calcule the denominator.
+        Available options are "sqrt" and "max". Default value: `"max"`.
+    * executor (concurrent.futures.Executor, optional) -- The executor used to
+        distribute the work. By default, a local process pool.
+    * partials (ShardPartials, optional) -- The reduced accumulators, if they
+        were already calculated with `reduce_partials`. In that case `blocks`
+        is not used.
+
+    ### Returns:
+    (np.ndarray) -- A square matrix with the proximity between the activities.
+    """
+    if partials is None:
+        partials = reduce_partials(blocks, cutoff=cutoff, executor=executor)
+
+    return proximity_from_cooccurrence(
+        partials.cooccurrence.copy(), partials.kp0, procedure=procedure
+    )
+
+
+def sharded_complexity(
+    blocks: Sequence[Block],
+    *,
+    cutoff: float = 1,
+    iterations: int = 20,
+    executor: Optional[Executor] = None,
+    partials: Optional[ShardPartials] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculates the Economic Complexity Index (ECI) and Product Complexity
+    Index (PCI) from blocks of locations.
+
+    The reflections alternate between `kp = M.T @ kc / kp0` and
+    `kc = M @ kp / kc0`; two consecutive steps combine into the product-side
+    operator `M.T @ diag(1 / kc0) @ M`, which is reduced from the blocks.
+    The iterations run over that small operator, and a last distributed step
+    recovers the location-side vector of each block. The result is the same
+    as `calculate_complexity` over the concatenated blocks.
+
+    ### Args:
+    * blocks (Sequence[np.ndarray | Callable]) -- The RCA matrices for each
+        block of locations, or callables that return them. Blocks are read
+        twice, so iterators are not allowed.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrix. Default value: `1`.
+    * iterations (int, optional) -- Limit of recursive calculations for kp
+        and kc. Default value: `20`.
+    * executor (concurrent.futures.Executor, optional) -- The executor used to
+        distribute the work. By default, a local process pool.
+    * partials (ShardPartials, optional) -- The reduced accumulators, if they
+        were already calculated with `reduce_partials`.
+
+    ### Returns:
+    ((np.ndarray, np.ndarray)) -- A tuple of ECI and PCI values. The ECI
+        values are in the order of the blocks.
+    """
+    with executor_or_pool(executor, processes=True) as pool:
+        if partials is None:
+            partials = reduce_partials(blocks, cutoff=cutoff, executor=pool)
+
+        kp_steps = list(_reflect(partials, iterations))
+
+        if iterations > 2:
+            # the location-side vector is the next step of the second-to-last kp
+            kc_blocks = pool.map(
+                _block_eci, blocks, repeat(kp_steps[-3]), repeat(cutoff)
+            )
+        else:
+            kc_blocks = pool.map(_block_diversity, blocks, repeat(cutoff))
+        kc = np.concatenate(list(kc_blocks))
+
+    return standardize(kc), standardize(kp_steps[-1])
+
+
+def _reflect(partials: ShardPartials, iterations: int) -> Iterator[np.ndarray]:
+    """Yields the sequence of product-side vectors of the reflections method,
+    `kp_0` to `kp_{iterations-1}`."""
+    kp0 = partials.kp0
+    previous: List[np.ndarray] = [kp0]
+    yield kp0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i in range(1, iterations):
+            if i == 1:
+                kp = partials.seed / kp0
+            else:
+                kp = partials.reflection.dot(previous[-2]) / kp0
+            previous = [previous[-1], kp]
+            yield kp
+
+
+def _block_partials(block: Block, cutoff: float) -> ShardPartials:
+    return block_partials(block, cutoff=cutoff)
+
+
+def _block_eci(block: Block, kp: np.ndarray, cutoff: float) -> np.ndarray:
+    mcp = binarize(_load(block), cutoff)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return mcp.dot(kp) / mcp.sum(axis=1)
+
+
+def _block_diversity(block: Block, cutoff: float) -> np.ndarray:
+    return binarize(_load(block), cutoff).sum(axis=1)
+
+
+def _load(block: Block) -> np.ndarray:
+    return block() if callable(block) else np.asarray(block)
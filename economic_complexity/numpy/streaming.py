@@ -0,0 +1,110 @@
+"""Streaming tidy output module
+
+Indicators like the relatedness or the distance are matrices with a value for
+each location and activity, and converting them to tidy format (a row for
+each cell) multiplies the memory used. As each row of these matrices only
+depends on the same row of the RCA matrix, the functions in this module
+calculate them a block of locations at a time, and yield each block already
+in tidy format, optionally keeping only the relevant cells.
+"""
+
+from typing import Callable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+from .rca import _CHUNK_ELEMENTS
+
+# Receives a block of rows of the RCA matrix, and writes the indicator for those
+# rows in the preallocated array passed as `out`
+Calculation = Callable[..., np.ndarray]
+
+
+class TidyChunk(NamedTuple):
+    """A block of cells of a matrix, in tidy format."""
+
+    # the positions of the row and the column of each cell
+    rows: np.ndarray
+    columns: np.ndarray
+    values: np.ndarray
+
+
+def iter_tidy(
+    calculate: Calculation,
+    rcas: np.ndarray,
+    *,
+    n_columns: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    threshold: Optional[float] = None,
+    top: Optional[int] = None,
+) -> Iterator[TidyChunk]:
+    """Calculates an indicator a block of rows at a time, and yields each
+    block in tidy format.
+
+    Only a block of the wide matrix is held in memory at a time, and the
+    same buffer is reused for all the blocks.
+
+    ### Args:
+    * calculate (Callable) -- A function that receives a block of rows of
+        `rcas`, and writes the indicator for those rows in the preallocated
+        float array passed as `out`. For example, `calculate_relatedness`
+        with the precalculated `proximities`.
+    * rcas (np.ndarray) -- Matrix of RCAs, with locations as rows and
+        activities as columns.
+
+    ### Keyword Args:
+    * n_columns (int, optional) -- The amount of columns of the result. By
+        default, the same as `rcas`.
+    * chunksize (int, optional) -- The amount of rows to calculate at a time.
+        By default, as many rows as fit in about 32MB.
+    * threshold (float, optional) -- Only keep the cells with a value greater
+        or equal than this. Missing values are dropped too.
+    * top (int, optional) -- Only keep the `top` cells with the highest
+        values of each row, sorted by descending value. Missing values are
+        dropped too.
+
+    ### Returns:
+    (Iterator[TidyChunk]) -- The positions of the row and the column, and
+        the value of the cells of each block, in row-major order.
+    """
+    n_rows = rcas.shape[0]
+    n_columns = rcas.shape[1] if n_columns is None else n_columns
+    chunksize = chunksize or max(_CHUNK_ELEMENTS // max(n_columns, 1), 1)
+    buffer = np.empty((min(chunksize, n_rows), n_columns))
+
+    for start in range(0, n_rows, chunksize):
+        end = min(start + chunksize, n_rows)
+        values = calculate(rcas[start:end], out=buffer[: end - start])
+        yield _tidy(values, start, threshold=threshold, top=top)
+
+
+def _tidy(
+    values: np.ndarray,
+    offset: int,
+    *,
+    threshold: Optional[float],
+    top: Optional[int],
+) -> TidyChunk:
+    """Converts a block of a matrix to tidy format, keeping the cells that
+    pass the filters."""
+    n_rows, n_columns = values.shape
+
+    if top is not None and n_columns > 0:
+        top = min(top, n_columns)
+        ranked = np.where(np.isnan(values), -np.inf, values)
+        columns = np.argpartition(-ranked, max(top - 1, 0), axis=1)[:, :top]
+        selected = np.take_along_axis(ranked, columns, axis=1)
+        order = np.argsort(-selected, axis=1, kind="stable")
+        columns = np.take_along_axis(columns, order, axis=1).reshape(-1)
+        rows = np.repeat(np.arange(n_rows), top)
+        cells = values[rows, columns]
+    else:
+        rows = np.repeat(np.arange(n_rows), n_columns)
+        columns = np.tile(np.arange(n_columns), n_rows)
+        cells = values.reshape(-1).copy()
+
+    if threshold is not None or top is not None:
+        with np.errstate(invalid="ignore"):
+            keep = cells >= (-np.inf if threshold is None else threshold)
+        rows, columns, cells = rows[keep], columns[keep], cells[keep]
+
+    return TidyChunk(rows + offset, columns, cells)
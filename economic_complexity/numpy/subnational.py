@@ -0,0 +1,46 @@
+"""Subnational Method module
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from ._kernels import masked_mean
+from .complexity import standardize as _standardize
+
+
+def calculate_complexity_subnational(
+    rcas: np.ndarray,
+    pci_external: np.ndarray,
+    *,
+    cutoff: float = 1,
+    standardize: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculates the Economic Complexity Index for the subnational (AKA
+    external method), as the average external PCI of the activities where
+    each location has comparative advantages.
+
+    ### Args:
+    * rcas (np.ndarray) -- RCA matrix, with locations as rows and activities
+        as columns.
+    * pci_external (np.ndarray) -- PCI values from an external source, in the
+        same order as the columns of `rcas`. Activities without an external
+        PCI must be set as NaN, and are ignored.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA matrix.
+        Default value: `1`.
+    * standardize (bool, optional) -- Specifies if the ECI vector should be
+        standardized: `x-µ/σ`. Default value: `False`.
+
+    ### Returns:
+    ((np.ndarray, np.ndarray)) -- A tuple of ECI and PCI values using the
+        subnational method.
+    """
+    # Only consider the activities with a known external PCI
+    eci_external = masked_mean(rcas, pci_external, cutoff)
+
+    if standardize:
+        eci_external = _standardize(eci_external)
+
+    return eci_external, pci_external
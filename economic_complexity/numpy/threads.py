@@ -0,0 +1,185 @@
+"""Thread budget module
+
+The matrix products run on the thread pool of the BLAS library, which uses
+all the cores by default. When several calculations run at the same time, in
+a thread or a process pool, each product starts its own full set of threads
+and the machine gets oversubscribed: the throughput drops below the one of
+running the calculations one after another.
+
+`thread_budget` limits the threads of the BLAS and OpenMP libraries (and of
+the numba kernels) while its block runs:
+
+```
+with thread_budget(4):
+    eci, pci = complexity(rcas)
+```
+
+The parallel helpers of this package split the cores between their workers
+and the BLAS threads automatically, with `split_threads`: the thread pools
+set the budget of each worker around the whole pool, and the process pools
+set it in each worker process when it starts (also for the threads of polars,
+if the worker hasn't imported it yet). The cores available are the
+ones of the CPU affinity of the process, or the value of the environment
+variable `ECONOMIC_COMPLEXITY_THREADS`.
+
+The limits of BLAS and OpenMP are set with threadpoolctl, available with the
+`threads` extra (`pip install economic-complexity[threads]`). Without it,
+only the threads of the numba kernels are limited. The limits apply to the
+whole process, not only to the thread that sets them.
+"""
+
+import importlib.util
+import multiprocessing
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+HAS_THREADPOOLCTL = importlib.util.find_spec("threadpoolctl") is not None
+
+
+def available_cores() -> int:
+    """Returns the amount of cores that the calculations can use."""
+    value = os.environ.get("ECONOMIC_COMPLEXITY_THREADS")
+    if value:
+        return max(int(value), 1)
+    try:
+        return len(os.sched_getaffinity(0))  # type: ignore[attr-defined]
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def split_threads(
+    max_workers: Optional[int] = None,
+    tasks: Optional[int] = None,
+) -> Tuple[int, int]:
+    """Splits the available cores between a pool of workers and the BLAS
+    threads of each worker.
+
+    ### Args:
+    * max_workers (int, optional) -- The requested size of the pool. By
+        default, one worker per core.
+    * tasks (int, optional) -- The amount of tasks; the pool doesn't get more
+        workers than tasks, so the spare cores go to the BLAS threads.
+
+    ### Returns:
+    ((int, int)) -- The amount of workers, and the threads of each worker.
+    """
+    cores = available_cores()
+    workers = cores if max_workers is None else max_workers
+    if tasks is not None:
+        workers = min(workers, tasks)
+    workers = max(workers, 1)
+    return workers, max(cores // workers, 1)
+
+
+@contextmanager
+def thread_budget(threads: Optional[int]) -> Iterator[None]:
+    """Limits the threads of the BLAS and OpenMP libraries, and of the numba
+    kernels, while the block runs. The previous limits are restored on exit.
+
+    ### Args:
+    * threads (int | None) -- The maximum amount of threads. `None` doesn't
+        change the limits.
+    """
+    if threads is None:
+        yield
+        return
+
+    numba = sys.modules.get("numba")
+    previous = numba.get_num_threads() if numba is not None else None
+    if numba is not None:
+        numba.set_num_threads(min(threads, numba.config.NUMBA_NUM_THREADS))
+
+    try:
+        if HAS_THREADPOOLCTL:
+            from threadpoolctl import threadpool_limits
+
+            with threadpool_limits(limits=threads):
+                yield
+        else:
+            yield
+    finally:
+        if numba is not None:
+            numba.set_num_threads(previous)
+
+
+@contextmanager
+def thread_pool(
+    max_workers: Optional[int] = None,
+    tasks: Optional[int] = None,
+) -> Iterator[ThreadPoolExecutor]:
+    """Yields a thread pool that is shut down on exit, with the cores split
+    between its workers and the BLAS threads, as in `split_threads`."""
+    workers, threads = split_threads(max_workers, tasks)
+    with thread_budget(threads), ThreadPoolExecutor(max_workers=workers) as pool:
+        yield pool
+
+
+def process_pool(
+    max_workers: Optional[int] = None,
+    tasks: Optional[int] = None,
+) -> ProcessPoolExecutor:
+    """Returns a process pool with the cores split between its workers and the
+    BLAS threads, as in `split_threads`. The workers are started with the
+    "spawn" method: forking a process after the thread pools of numba, polars
+    or BLAS have been started can deadlock."""
+    workers, threads = split_threads(max_workers, tasks)
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=limit_worker,
+        initargs=(threads,),
+    )
+
+
+@contextmanager
+def executor_or_pool(
+    executor: Optional[Executor],
+    max_workers: Optional[int] = None,
+    tasks: Optional[int] = None,
+    *,
+    processes: bool = False,
+) -> Iterator[Executor]:
+    """Yields the provided executor, or a local pool that is shut down on
+    exit: a `thread_pool`, or a `process_pool` when `processes` is set.
+
+    ### Args:
+    * executor (concurrent.futures.Executor | None) -- The executor chosen
+        by the caller, yielded as is.
+    * max_workers (int, optional) -- The size of the local pool.
+    * tasks (int, optional) -- The amount of tasks, as in `split_threads`.
+
+    ### Keyword Args:
+    * processes (bool, optional) -- Use a process pool instead of a thread
+        pool. Default value: `False`.
+    """
+    if executor is not None:
+        yield executor
+    elif processes:
+        with process_pool(max_workers, tasks) as pool:
+            yield pool
+    else:
+        with thread_pool(max_workers, tasks) as pool:
+            yield pool
+
+
+def limit_worker(threads: Optional[int]):
+    """Limits the threads of the current process for the rest of its life.
+    Used as the initializer of the workers of a process pool."""
+    if threads is None:
+        return
+    if HAS_THREADPOOLCTL:
+        from threadpoolctl import threadpool_limits
+
+        threadpool_limits(limits=threads)
+
+    numba = sys.modules.get("numba")
+    if numba is not None:
+        numba.set_num_threads(min(threads, numba.config.NUMBA_NUM_THREADS))
+    else:
+        # read by numba when the kernels import it
+        os.environ["NUMBA_NUM_THREADS"] = str(threads)
+    if "polars" not in sys.modules:
+        os.environ["POLARS_MAX_THREADS"] = str(threads)
@@ -1,13 +1,44 @@
+from .backbone import calculate_backbone as backbone
+from .complexity import ComplexityState
 from .complexity import calculate_complexity as complexity
+from .cross_space import calculate_cross_proximity as cross_proximity
+from .cross_space import calculate_cross_relatedness as cross_relatedness
+from .jobs import Job, JobResult, run_jobs, run_jobs_async
+from .product_space import calculate_distance as distance
+from .product_space import calculate_opportunity_gain as opportunity_gain
+from .product_space import calculate_peii as peii
+from .product_space import calculate_pgi as pgi
 from .product_space import calculate_proximity as proximity
 from .product_space import calculate_relatedness as relatedness
+from .product_space import calculate_relative_relatedness as relative_relatedness
+from .product_space import calculate_similarity as similarity
 from .rca import calculate_rca as rca
-from .run import run
+from .rolling import calculate_rolling_rca as rolling_rca
+from .run import AVAILABLE_MODELS, run, run_models
+from .subnational import calculate_complexity_subnational as complexity_subnational
 
 __all__ = (
+    "AVAILABLE_MODELS",
+    "ComplexityState",
+    "Job",
+    "JobResult",
+    "backbone",
     "complexity",
+    "complexity_subnational",
+    "cross_proximity",
+    "cross_relatedness",
+    "distance",
+    "opportunity_gain",
+    "peii",
+    "pgi",
     "proximity",
     "rca",
     "relatedness",
+    "relative_relatedness",
+    "rolling_rca",
     "run",
+    "run_jobs",
+    "run_jobs_async",
+    "run_models",
+    "similarity",
 )
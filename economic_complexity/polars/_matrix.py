@@ -0,0 +1,165 @@
+"""Helpers to move data between polars frames and the numpy core.
+
+Each column of a polars frame is a contiguous Arrow buffer, so a matrix in
+Fortran order (column-major) maps to a frame without copies: each column of
+the matrix is wrapped as a Series, and a frame whose columns are slices of
+the same Fortran-ordered buffer is read back as a single matrix view. The
+matrices returned to polars are allocated in Fortran order for that reason.
+"""
+
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import polars as pl
+
+from ..numpy.labels import indexer, take
+from ..numpy.labels import pivot as pivot_codes
+
+
+def to_matrix(
+    rca: Union[pl.DataFrame, pl.LazyFrame],
+    *,
+    location: Optional[str],
+    activity: Optional[str] = None,
+    measure: Optional[str] = None,
+) -> Tuple[np.ndarray, pl.Series, pl.Series]:
+    """Extracts the RCA values of a frame as a 2-dimensional array, with
+    locations as rows and activities as columns.
+
+    The frame can be in tidy format, as returned by `calculate_rca` (when the
+    `activity` and `measure` names are provided and the `"{measure} RCA"`
+    column exists), or pivoted, with a `location` column and a column for
+    each activity.
+
+    Returns:
+        ((np.ndarray, pl.Series, pl.Series)) -- The matrix of values, and the
+            labels of its rows and columns.
+    """
+    df = rca.collect() if isinstance(rca, pl.LazyFrame) else rca
+
+    value_column = None if measure is None else f"{measure} RCA"
+    if location is not None and activity is not None and value_column in df.columns:
+        return pivot(df, location=location, activity=activity, value=value_column)
+
+    if location is None:
+        locations = pl.Series("index", range(df.height))
+        values = df
+    else:
+        locations = df.get_column(location)
+        values = df.drop(location)
+
+    activities = pl.Series(activity or "activity", values.columns)
+    # a read-only view when the columns already share a Fortran-ordered buffer,
+    # like the frames built by `from_matrix`; otherwise, a single copy
+    matrix = values.to_numpy(order="fortran").astype(float, copy=False)
+    return matrix, locations, activities
+
+
+def pivot(
+    df: pl.DataFrame,
+    *,
+    location: str,
+    activity: str,
+    value: str,
+) -> Tuple[np.ndarray, pl.Series, pl.Series]:
+    """Pivots a tidy frame into a dense matrix. Labels keep the order of their
+    first appearance, and missing combinations are set to zero. Duplicated
+    combinations raise a ValueError, as in the output of a grouped
+    `calculate_rca`."""
+    if df.select(location, activity).is_duplicated().any():
+        raise ValueError(
+            "The frame contains duplicated combinations of '%s' and '%s'. If it "
+            "was calculated with the `group` argument, select a single group "
+            "first." % (location, activity)
+        )
+
+    locations, row_codes = _encode(df.get_column(location))
+    activities, col_codes = _encode(df.get_column(activity))
+    shape = (len(locations), len(activities))
+
+    values = df.get_column(value).fill_null(0).to_numpy()
+    matrix = pivot_codes(values, row_codes, col_codes, shape=shape)
+
+    return matrix, locations, activities
+
+
+def from_matrix(
+    values: np.ndarray,
+    *,
+    columns: Union[pl.Series, List[str]],
+    index: pl.Series,
+) -> pl.DataFrame:
+    """Wraps a matrix into a pivoted frame, with a column for each label in
+    `columns`, and the `index` series as the last column. The columns of a
+    Fortran-ordered float matrix are wrapped without copies."""
+    values = np.asfortranarray(values, dtype=float)
+    df = pl.DataFrame(
+        [pl.Series(str(label), values[:, i]) for i, label in enumerate(columns)]
+    )
+    return df.with_columns(index)
+
+
+def empty_matrix(shape: Tuple[int, int]) -> np.ndarray:
+    """Allocates a matrix that can be wrapped by `from_matrix` without copies."""
+    return np.empty(shape, order="F")
+
+
+def _encode(series: pl.Series) -> Tuple[pl.Series, np.ndarray]:
+    """Returns the unique values of a series, and the position of each
+    element of the series in them."""
+    uniques = series.unique(maintain_order=True)
+    codes = series.replace_strict(
+        uniques,
+        pl.int_range(len(uniques), eager=True),
+        return_dtype=pl.Int64,
+    )
+    return uniques, codes.to_numpy()
+
+
+def to_tidy(
+    values: np.ndarray,
+    *,
+    index: pl.Series,
+    columns: pl.Series,
+    value: str,
+) -> pl.DataFrame:
+    """Unpivots a matrix into a tidy frame, with a row for each combination of
+    the `index` and `columns` labels, in row-major order. When both series
+    have the same name, the `columns` series gets the suffix `"_right"`."""
+    n_rows, n_cols = values.shape
+    if columns.name == index.name:
+        columns = columns.alias(f"{columns.name}_right")
+
+    return pl.DataFrame(
+        [
+            index.gather(np.repeat(np.arange(n_rows), n_cols)),
+            columns.gather(np.tile(np.arange(n_cols), n_rows)),
+            pl.Series(value, values.reshape(-1)),
+        ]
+    )
+
+
+def to_vector(
+    df: Union[pl.DataFrame, pl.LazyFrame],
+    *,
+    key: str,
+    labels: pl.Series,
+    value: Optional[str] = None,
+) -> np.ndarray:
+    """Extracts a column of values from a frame, in the order of `labels` as
+    found in the `key` column. Labels not found are set to NaN.
+
+    When `value` is not provided, the first column other than `key` is used.
+    """
+    df = df.collect() if isinstance(df, pl.LazyFrame) else df
+    if value is None:
+        value = next(column for column in df.columns if column != key)
+
+    positions = indexer(df.get_column(key).to_numpy(), labels.to_numpy())
+    values = df.get_column(value).cast(pl.Float64).fill_null(np.nan).to_numpy()
+    return take(values, positions)
+
+
+def value_name(measure: Optional[str], indicator: str) -> str:
+    """Returns the name of the column for the values of an indicator."""
+    return indicator if measure is None else f"{measure} {indicator}"
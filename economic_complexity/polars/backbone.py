@@ -0,0 +1,73 @@
+"""Product Space backbone module
+"""
+
+from typing import Literal, Optional, Union
+
+import numpy as np
+import polars as pl
+
+from ..numpy.backbone import calculate_backbone as _calculate_backbone
+from ..numpy.product_space import calculate_proximity as _calculate_proximity
+from ._matrix import to_matrix
+
+
+def calculate_backbone(
+    rca: Union[pl.LazyFrame, pl.DataFrame],
+    proximities: Optional[np.ndarray] = None,
+    *,
+    activity: str,
+    location: Optional[str] = None,
+    measure: Optional[str] = None,
+    cutoff: float = 1,
+    procedure: Literal["max", "sqrt"] = "max",
+    threshold: Optional[float] = None,
+    max_links: Optional[int] = None,
+) -> pl.DataFrame:
+    """Extracts the backbone of the Product Space network: the maximum
+    spanning tree of the proximity matrix, plus the links with a proximity
+    over a `threshold`.
+
+    Args:
+        rca (pl.DataFrame | pl.LazyFrame) -- The RCA values, either in tidy
+            format as returned by `calculate_rca`, or as a pivotted matrix.
+            Used to label the activities, and to calculate the proximity.
+        proximities (np.ndarray, optional) -- The proximity between the
+            activities, as returned by `calculate_proximity` for the same
+            `rca`. If not provided, will be calculated.
+        activity (str) -- The name of the activity column.
+        location (str, optional) -- The name of the location column.
+        measure (str, optional) -- The name of the measure, for tidy format
+            frames.
+        cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+            matrix. Default value: 1.
+        procedure (str, optional) -- Determines how to calcule the denominator
+            of the proximity. Available options are "sqrt" and "max".
+        threshold (float, optional) -- Also include the links with a proximity
+            greater or equal than this value. By default, only the spanning
+            tree is returned.
+        max_links (int, optional) -- The maximum amount of links added over
+            the spanning tree because of the `threshold`.
+
+    Returns:
+        (pl.DataFrame) -- An edge list, with the activities of each link in
+            the `activity` and `"{activity}_right"` columns, and its
+            `"Proximity"`.
+    """
+    rcas, _, activities = to_matrix(
+        rca, location=location, activity=activity, measure=measure
+    )
+    if proximities is None:
+        proximities = _calculate_proximity(rcas, cutoff=cutoff, procedure=procedure)
+
+    edges, weights = _calculate_backbone(
+        proximities, threshold=threshold, max_links=max_links
+    )
+
+    activities = activities.alias(activity)
+    return pl.DataFrame(
+        [
+            activities.gather(edges[:, 0]),
+            activities.gather(edges[:, 1]).alias(f"{activity}_right"),
+            pl.Series("Proximity", weights),
+        ]
+    )
@@ -5,55 +5,100 @@ reflections method, which is defined based on a red bipartite that contains a
 symmetric set of variables whose nodes correspond to countries and products.
 """
 
-from typing import Tuple
+from typing import NamedTuple, Optional, Tuple, Union
 
 import polars as pl
 
+from ..numpy.complexity import calculate_complexity as _calculate_complexity
+from ._matrix import to_matrix, to_vector
+
+
+class ComplexityState(NamedTuple):
+    """The state of the reflections method after the last iteration, which
+    can be used as the `initial` vectors of the next period. The vectors are
+    frames with the `location` and the `activity` columns, respectively."""
+
+    kc: pl.DataFrame
+    kp: pl.DataFrame
+    iterations: int
+    converged: bool
+
 
 def calculate_complexity(
-    rca: pl.DataFrame,
+    rca: Union[pl.DataFrame, pl.LazyFrame],
     *,
     activity: str,
     location: str,
     measure: str,
+    cutoff: float = 1,
     iterations: int = 20,
-) -> Tuple[pl.DataFrame, pl.DataFrame]:
+    initial: Optional[Tuple[pl.DataFrame, pl.DataFrame]] = None,
+    tol: Optional[float] = None,
+    return_state: bool = False,
+) -> Union[
+    Tuple[pl.DataFrame, pl.DataFrame],
+    Tuple[pl.DataFrame, pl.DataFrame, ComplexityState],
+]:
     """Calculates Economic Complexity Index (ECI) and Product Complexity
     Index (PCI) from a RCA matrix.
 
     Args:
-        rcas (pl.DataFrame) -- Pivotted RCA matrix, binary values.
-        index (str) -- index column name
+        rca (pl.DataFrame | pl.LazyFrame) -- The RCA values, either in tidy
+            format as returned by `calculate_rca`, or as a pivotted matrix
+            with a `location` column.
+        activity (str) -- The name of the column to use as economic activity.
+        location (str) -- The name of the column to use as associated location.
+        measure (str) -- The name of the column used as measure.
+        cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+            matrix. Default value: 1.
         iterations (int, optional) -- Limit of recursive calculations for
             kp and kc. Default value: 20.
+        initial ((pl.DataFrame, pl.DataFrame), optional) -- The vectors to
+            start the reflections from, like the ECI and PCI frames (or the
+            state) of the previous period: frames with the `location` and the
+            `activity` columns respectively, and a column with the values.
+            The missing labels get the mean value.
+        tol (float, optional) -- Stop the iterations when the largest change
+            of the values between two steps is under this value. In that
+            case, `iterations` is the upper limit.
+        return_state (bool, optional) -- Also return the `ComplexityState`
+            after the last iteration. Default value: False.
 
     Returns:
-        ((pl.DataFrame, pl.DataFrame)) -- A tuple of ECI and PCI values.
+        ((pl.DataFrame, pl.DataFrame)) -- A tuple of ECI and PCI values, and
+            the final state if `return_state` is True.
     """
-
-    kp = rca.select(pl.all().exclude(location)).sum().transpose().to_series()
-    kc = rca.select(pl.all().exclude(location)).sum(axis=1)
-
-    kp0 = kp.clone()
-    kc0 = kc.clone()
-
-    for i in range(1, iterations):
-        kc_temp = kc.clone()
-        kp_temp = kp.clone()
-
-        kp = (rca.select(pl.all().exclude(location)) * kc_temp).sum().transpose().to_series() / kp0
-
-        if i < (iterations - 1):
-            kc = (rca.select(pl.all().exclude(location)).transpose() * kp_temp).sum().transpose().to_series() / kc0
-
-    geo_complexity = (kc - kc.mean()) / kc.std()
-    prod_complexity = (kp - kp.mean()) / kp.std()
-
-    # IDs column
-    geo_complexity = pl.DataFrame([pl.Series(f"{measure} ECI", geo_complexity),
-                                   pl.Series(location, rca[location])])
-
-    prod_complexity = pl.DataFrame([pl.Series(f"{measure} PCI", prod_complexity),
-                                    pl.Series(activity, rca.columns[1:])])
-
+    rcas, locations, activities = to_matrix(
+        rca, location=location, activity=activity, measure=measure
+    )
+
+    if initial is not None:
+        initial = (
+            to_vector(initial[0], key=location, labels=locations),
+            to_vector(initial[1], key=activity, labels=activities),
+        )
+
+    eci, pci, state = _calculate_complexity(
+        rcas,
+        cutoff=cutoff,
+        iterations=iterations,
+        initial=initial,
+        tol=tol,
+        return_state=True,
+    )
+
+    geo_complexity = pl.DataFrame(
+        [pl.Series(f"{measure} ECI", eci), locations.alias(location)]
+    )
+    prod_complexity = pl.DataFrame(
+        [pl.Series(f"{measure} PCI", pci), activities.alias(activity)]
+    )
+
+    if return_state:
+        return geo_complexity, prod_complexity, ComplexityState(
+            kc=pl.DataFrame([pl.Series("kc", state.kc), locations.alias(location)]),
+            kp=pl.DataFrame([pl.Series("kp", state.kp), activities.alias(activity)]),
+            iterations=state.iterations,
+            converged=state.converged,
+        )
     return geo_complexity, prod_complexity
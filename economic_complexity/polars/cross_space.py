@@ -0,0 +1,141 @@
+"""Cross-space module
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+import polars as pl
+
+from ..numpy.cross_space import (
+    calculate_cross_proximity as _calculate_cross_proximity,
+)
+from ..numpy.cross_space import (
+    calculate_cross_relatedness as _calculate_cross_relatedness,
+)
+from ..numpy.labels import indexer, take
+from ._matrix import pivot, to_matrix, to_tidy, value_name
+
+
+def calculate_cross_proximity(
+    rca_a: Union[pl.LazyFrame, pl.DataFrame],
+    rca_b: Union[pl.LazyFrame, pl.DataFrame],
+    *,
+    location: str,
+    activity_a: Optional[str] = None,
+    activity_b: Optional[str] = None,
+    measure_a: Optional[str] = None,
+    measure_b: Optional[str] = None,
+    cutoff: float = 1,
+) -> pl.DataFrame:
+    """Calculates the Cross-proximity index between two matrices of RCA.
+
+    Catalan et al. (2020) introduced the cross-proximity index in order
+    to measure the minimum probability that a country presents comparative
+    advantages in a patent in a given area, given it has comparative
+    advantages in an area of knowledge, or vice versa.
+
+    The locations of `rca_b` are matched to the locations of `rca_a`; the
+    locations missing in `rca_b` are considered without comparative
+    advantages.
+
+    Args:
+        rca_a (pl.DataFrame | pl.LazyFrame) -- The RCA values for the first
+            type of activity, either pivotted or in tidy format as returned by
+            `calculate_rca`.
+        rca_b (pl.DataFrame | pl.LazyFrame) -- The RCA values for the second
+            type of activity, with the same `location` column.
+        location (str) -- The name of the location column.
+        activity_a (str, optional) -- The name of the activity column of
+            `rca_a`, for tidy format frames.
+        activity_b (str, optional) -- The name of the activity column of
+            `rca_b`, for tidy format frames.
+        measure_a (str, optional) -- The name of the measure of `rca_a`, for
+            tidy format frames.
+        measure_b (str, optional) -- The name of the measure of `rca_b`, for
+            tidy format frames.
+        cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+            matrices. Default value: 1.
+
+    Returns:
+        (pl.DataFrame) -- A tidy frame with the cross-proximity between each
+            pair of activities, in the `"Cross Proximity"` column.
+    """
+    rcas_a, locations_a, activities_a = to_matrix(
+        rca_a, location=location, activity=activity_a, measure=measure_a
+    )
+    rcas_b, locations_b, activities_b = to_matrix(
+        rca_b, location=location, activity=activity_b, measure=measure_b
+    )
+
+    positions = indexer(locations_b.to_numpy(), locations_a.to_numpy())
+    rcas_b = take(rcas_b, positions, fill_value=0)
+
+    x_proximity = _calculate_cross_proximity(rcas_a, rcas_b, cutoff=cutoff)
+
+    return to_tidy(
+        x_proximity,
+        index=activities_a,
+        columns=activities_b,
+        value="Cross Proximity",
+    )
+
+
+def calculate_cross_relatedness(
+    rca: Union[pl.LazyFrame, pl.DataFrame],
+    x_proximity: pl.DataFrame,
+    *,
+    location: str,
+    activity: Optional[str] = None,
+    measure: Optional[str] = None,
+    cutoff: float = 1,
+) -> pl.DataFrame:
+    """Calculates the Cross-relatedness.
+
+    Catalan et al. (2020) incorporated the concept of cross-relatedness
+    in order to quantify the relationship between scientific fields in the
+    development of new technologies in a country. It corresponds to the
+    average cross proximity of a technology and the scientific knowledge
+    of a country.
+
+    Args:
+        rca (pl.DataFrame | pl.LazyFrame) -- The RCA values for the first type
+            of activity, as used for `rca_a` in `calculate_cross_proximity`.
+        x_proximity (pl.DataFrame) -- The tidy frame returned by
+            `calculate_cross_proximity`.
+        location (str) -- The name of the location column.
+        activity (str, optional) -- The name of the activity column, for tidy
+            format frames.
+        measure (str, optional) -- The name of the measure, for tidy format
+            frames.
+        cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+            matrix. Default value: 1.
+
+    Returns:
+        (pl.DataFrame) -- A tidy frame with the cross-relatedness between each
+            location and activity of the second type, in the
+            `"{measure} Cross Relatedness"` column.
+    """
+    rcas, locations, activities = to_matrix(
+        rca, location=location, activity=activity, measure=measure
+    )
+
+    row_key, col_key, value = x_proximity.columns[:3]
+    proximities, rows, columns = pivot(
+        x_proximity, location=row_key, activity=col_key, value=value
+    )
+
+    # cross-proximity rows must follow the order of the RCA columns
+    positions = indexer(rows.to_numpy(), activities.to_numpy())
+    if (positions < 0).any():
+        raise ValueError("The cross-proximity doesn't contain all the activities")
+
+    x_relatedness = _calculate_cross_relatedness(
+        rcas, np.take(proximities, positions, axis=0), cutoff=cutoff
+    )
+
+    return to_tidy(
+        x_relatedness,
+        index=locations.alias(location),
+        columns=columns,
+        value=value_name(measure, "Cross Relatedness"),
+    )
@@ -0,0 +1,313 @@
+"""Batch jobs module
+
+Runs many model calculations (for example, several cubes × levels × years) as
+a declarative list of jobs. Jobs sharing the same input data and RCA settings
+are grouped, so the data is loaded and the RCA is calculated once per group,
+and the groups are scheduled with asyncio over a bounded process pool.
+`run_jobs` returns all the results once every group finished; to handle each
+result as soon as its group finishes, pass an `on_result` callback:
+
+```
+jobs = [
+    Job("hs92_2020_eci", "eci", "hs92.parquet", filters={"Year": 2020}, **cols),
+    Job("hs92_2020_pci", "pci", "hs92.parquet", filters={"Year": 2020}, **cols),
+]
+results = run_jobs(
+    jobs,
+    max_workers=4,
+    output="artifacts/",
+    on_result=lambda result: print(result.job.name, result.timings),
+)
+```
+
+Inside a running event loop, use `await run_jobs_async(jobs, ...)` instead.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import polars as pl
+
+from ..artifacts import save_artifact
+from ..numpy.threads import process_pool
+from .rca import calculate_rca
+from .run import AvailableModel, run_models
+
+Source = Union[str, "os.PathLike[str]", pl.DataFrame, pl.LazyFrame, Callable[[], Any]]
+
+
+@dataclass
+class Job:
+    """Declares the calculation of a model over a dataset.
+
+    Attributes:
+        name (str) -- A unique name for the job, used as the name of the
+            artifact when the results are written to disk.
+        model (str) -- The model to calculate, as in `run`.
+        source (str | os.PathLike | pl.DataFrame | pl.LazyFrame | Callable) --
+            The input data: a path or glob to Parquet or CSV files (scanned
+            lazily), a frame, or a picklable callable that returns a frame.
+        activity (str) -- The name of the column to use as economic activity.
+        location (str) -- The name of the column to use as associated location.
+        measure (str) -- The name of the column to use as measure.
+        filters (Mapping[str, Any]) -- Equality filters applied to the source
+            before the calculation, like `{"Year": 2020}`. Lists and tuples
+            are used as sets of allowed values.
+        binary (bool) -- Binarize the RCA values.
+        cutoff (float) -- The threshold value for the binarization.
+        iterations (int) -- Limit of recursive calculations for complexity.
+        procedure (str) -- The procedure for the denominator of the proximity.
+    """
+
+    name: str
+    model: AvailableModel
+    source: Source
+    activity: str
+    location: str
+    measure: str
+    filters: Mapping[str, Any] = field(default_factory=dict)
+    binary: bool = False
+    cutoff: float = 1
+    iterations: int = 20
+    procedure: Literal["max", "sqrt"] = "max"
+
+    def input_key(self) -> Hashable:
+        """Returns a key that is the same for all the jobs that can share the
+        same input data and RCA calculation."""
+        source = self.source
+        if isinstance(source, (str, os.PathLike)):
+            source = os.fspath(source)
+        else:
+            source = id(source)
+        filters = tuple(
+            (key, tuple(value) if isinstance(value, (list, tuple)) else value)
+            for key, value in sorted(self.filters.items())
+        )
+        return (
+            source,
+            filters,
+            self.activity,
+            self.location,
+            self.measure,
+            self.binary,
+            self.cutoff,
+        )
+
+    def params(self) -> Dict[str, Any]:
+        """Returns the parameters of the job, to be stored as metadata."""
+        return {
+            "model": self.model,
+            "activity": self.activity,
+            "location": self.location,
+            "measure": self.measure,
+            "filters": {key: value for key, value in self.filters.items()},
+            "binary": self.binary,
+            "cutoff": self.cutoff,
+            "iterations": self.iterations,
+            "procedure": self.procedure,
+        }
+
+
+@dataclass
+class JobResult:
+    """The outcome of a job.
+
+    Attributes:
+        job (Job) -- The job declaration.
+        result (Any) -- The result of the model, or `None` if it failed.
+        error (BaseException | None) -- The exception raised, if it failed.
+        timings (Dict[str, float]) -- Seconds spent in each stage: "rca" and
+            the name of the model. The source is scanned lazily, so "rca"
+            includes its loading; it is shared by the group and reported in
+            every job of the group.
+        path (Path | None) -- Where the result was saved, if an output
+            directory was provided.
+    """
+
+    job: Job
+    result: Any = None
+    error: Optional[BaseException] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    path: Optional[Path] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def run_jobs_async(
+    jobs: Sequence[Job],
+    *,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    output: Union[str, "os.PathLike[str]", None] = None,
+    on_result: Optional[Callable[[JobResult], Any]] = None,
+) -> List[JobResult]:
+    """Runs a list of jobs concurrently.
+
+    Jobs are grouped by their input (source, filters, columns and RCA
+    settings); each group is a single task that loads the data and calculates
+    the RCA once, and then calculates all the models of its jobs, sharing the
+    intermediate results. Groups run in parallel in a process pool.
+
+    Args:
+        jobs (Sequence[Job]) -- The jobs to run. Names must be unique.
+        max_workers (int, optional) -- The size of the process pool. Ignored
+            if an `executor` is provided.
+        executor (concurrent.futures.Executor, optional) -- The executor to
+            run the groups. By default, a new process pool that starts its
+            workers with the "spawn" method, and limits the threads of each
+            worker to its share of the cores.
+        output (str | os.PathLike, optional) -- A directory to write the
+            result of each job as an artifact, named after the job.
+        on_result (Callable, optional) -- A function called with each
+            `JobResult` as soon as it's available.
+
+    Returns:
+        (List[JobResult]) -- The results, in the order they finished.
+    """
+    names = [job.name for job in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError("Job names must be unique")
+
+    groups: Dict[Hashable, List[Job]] = {}
+    for job in jobs:
+        groups.setdefault(job.input_key(), []).append(job)
+
+    loop = asyncio.get_running_loop()
+    output_dir = None if output is None else Path(output)
+    results: List[JobResult] = []
+
+    # polars is multithreaded, so the workers must not be forked; the cores
+    # are split between the workers and the threads of polars and BLAS
+    pool = executor or process_pool(max_workers, len(groups))
+    try:
+        tasks = [
+            loop.run_in_executor(pool, _run_group, group) for group in groups.values()
+        ]
+        for task in asyncio.as_completed(tasks):
+            for job_result in await task:
+                if output_dir is not None and job_result.ok:
+                    try:
+                        job_result.path = await loop.run_in_executor(
+                            None,
+                            _save_result,
+                            output_dir / job_result.job.name,
+                            job_result,
+                        )
+                    except Exception as exc:
+                        job_result.error = exc
+                if on_result is not None:
+                    on_result(job_result)
+                results.append(job_result)
+    finally:
+        if executor is None:
+            pool.shutdown()
+
+    return results
+
+
+def run_jobs(jobs: Sequence[Job], **kwargs: Any) -> List[JobResult]:
+    """Runs a list of jobs concurrently, blocking until all of them finish.
+
+    Accepts the same keyword arguments as `run_jobs_async`.
+
+    Returns:
+        (List[JobResult]) -- The results, in the order they finished.
+    """
+    return asyncio.run(run_jobs_async(jobs, **kwargs))
+
+
+def _run_group(jobs: List[Job]) -> List[JobResult]:
+    """Runs the jobs that share the same input, in a worker process."""
+    first = jobs[0]
+    shared_timings: Dict[str, float] = {}
+
+    try:
+        start = time.perf_counter()
+        data = _load_source(first.source, first.filters)
+        res_rca = calculate_rca(
+            data,
+            activity=first.activity,
+            location=first.location,
+            measure=first.measure,
+            binary=first.binary,
+            cutoff=first.cutoff,
+        ).collect()
+        shared_timings["rca"] = time.perf_counter() - start
+    except Exception as exc:
+        return [JobResult(job, error=exc, timings=dict(shared_timings)) for job in jobs]
+
+    results = []
+    # jobs with the same model settings can reuse their intermediate results
+    cache: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    for job in jobs:
+        settings = (job.iterations, job.procedure)
+        shared = cache.setdefault(settings, {})
+        timings = dict(shared_timings)
+        start = time.perf_counter()
+        try:
+            result = run_models(
+                res_rca,
+                [job.model],
+                activity=job.activity,
+                location=job.location,
+                measure=job.measure,
+                # the binary RCA is already 0/1, so it must not be cut again
+                cutoff=1 if job.binary else job.cutoff,
+                iterations=job.iterations,
+                procedure=job.procedure,
+                shared=shared,
+            )[job.model]
+        except Exception as exc:
+            timings[job.model] = time.perf_counter() - start
+            results.append(JobResult(job, error=exc, timings=timings))
+        else:
+            timings[job.model] = time.perf_counter() - start
+            results.append(JobResult(job, result=result, timings=timings))
+
+    return results
+
+
+def _load_source(source: Source, filters: Mapping[str, Any]) -> pl.LazyFrame:
+    """Returns a LazyFrame for the source of a job, with its filters applied."""
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if path.endswith(".csv"):
+            lf = pl.scan_csv(path)
+        else:
+            lf = pl.scan_parquet(path)
+    else:
+        lf = source() if callable(source) else source
+        lf = lf.lazy()
+
+    for key, value in filters.items():
+        if isinstance(value, (list, tuple)):
+            lf = lf.filter(pl.col(key).is_in(list(value)))
+        else:
+            lf = lf.filter(pl.col(key) == value)
+
+    return lf
+
+
+def _save_result(path: Path, job_result: JobResult) -> Path:
+    params = job_result.job.params()
+    params["timings"] = job_result.timings
+    return save_artifact(path, job_result.result, params=params)
@@ -1,69 +1,83 @@
 """Product Space module
 """
 
-from typing import Literal, Union
+from typing import Literal, Optional, Union
+
 import numpy as np
 import polars as pl
 
+from ..numpy.labels import indexer
+from ..numpy.product_space import calculate_distance as _calculate_distance
+from ..numpy.product_space import (
+    calculate_opportunity_gain as _calculate_opportunity_gain,
+)
+from ..numpy.product_space import calculate_pmi as _calculate_pmi
+from ..numpy.product_space import calculate_proximity as _calculate_proximity
+from ..numpy.product_space import calculate_relatedness as _calculate_relatedness
+from ..numpy.product_space import (
+    calculate_relative_relatedness as _calculate_relative_relatedness,
+)
+from ..numpy.product_space import calculate_similarity as _calculate_similarity
+from ._matrix import (
+    empty_matrix,
+    from_matrix,
+    pivot,
+    to_matrix,
+    to_tidy,
+    to_vector,
+    value_name,
+)
+
 
 def calculate_proximity(
     rca: Union[pl.LazyFrame, pl.DataFrame],
     *,
     procedure: Literal["max", "sqrt"] = "max",
-):
+    cutoff: float = 1,
+    location: Optional[str] = None,
+    activity: Optional[str] = None,
+    measure: Optional[str] = None,
+) -> np.ndarray:
     """Calculates the Proximity index for a matrix of RCAs.
 
     Hidalgo et al. (2007), introduces the Proximity index which measures the
     minimum probability that a country has comparative advantages in the export
     of a product `i`, given that it has comparative advantages in a product `j`.
 
-    This function only needs the pivot table obtained from the RCA function,
-    and returns a square matrix with the proximity between the elements.
+    This function only needs the RCA values, and returns a square matrix with
+    the proximity between the elements.
 
     Args:
-        rca (pl.DataFrame) -- A RCA matrix of pivotted values.
+        rca (pl.DataFrame) -- The RCA values, either in tidy format as
+            returned by `calculate_rca` (requires `location`, `activity` and
+            `measure`), or as a pivotted matrix.
         procedure (str, optional) -- Determines how to calcule the denominator.
             Available options are "sqrt" and "max", defaults to "max".
+        cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+            matrix. Default value: 1.
+        location (str, optional) -- The name of the location column, which
+            will be excluded from the calculation.
+        activity (str, optional) -- The name of the activity column, for tidy
+            format frames.
+        measure (str, optional) -- The name of the measure, for tidy format
+            frames.
 
     Returns:
         (np.ndarray) -- A square matrix with the proximity between the elements.
     """
-    rcas = (rca.collect() if isinstance(rca, pl.LazyFrame) else rca).to_numpy()
-
-    # Matrix multiplication on M_mi matrix and transposed version,
-    # number of products = number of rows and vice versa on transposed
-    # version, thus the shape of this result will be length of products
-    # by the length of products (symetric)
-    numerator_intersection = rcas.transpose().dot(rcas)
-
-    # kp0 is a vector of the number of munics with RCA in the given product
-    kp0 = rcas.sum(axis=0)
-    kp0_trans = kp0.reshape((len(kp0), 1))
-
-    # multiply these two vectors, take the squre root
-    # and then we have the denominator
-    if procedure == "sqrt":
-        # get square root for geometric mean
-        denominator_union = kp0_trans.dot(kp0)
-        denominator_union = np.power(denominator_union, .5)
-    else:
-        denominator_union = np.maximum(kp0, kp0_trans)
-
-    # to get the proximities it is now a simple division of the untion sqrt
-    # with the numerator intersections
-    phi = np.divide(numerator_intersection, denominator_union)
-
-    np.fill_diagonal(phi, 0)
-
-    return phi
+    rcas, _, _ = to_matrix(rca, location=location, activity=activity, measure=measure)
+    return _calculate_proximity(rcas, cutoff=cutoff, procedure=procedure)
 
 
 def calculate_relatedness(
-    rca: pl.DataFrame,
+    rca: Union[pl.LazyFrame, pl.DataFrame],
     proximities: np.ndarray,
     *,
     location: str,
-):
+    activity: Optional[str] = None,
+    measure: Optional[str] = None,
+    cutoff: float = 1,
+) -> pl.DataFrame:
     """Calculates the Relatedness, given a matrix of RCAs for the economic
     activities of a location, and a matrix of Proximities.
 
@@ -79,31 +93,333 @@ def calculate_relatedness(
     in the future.
 
     Args:
-        rcas (pl.DataFrame) -- Matrix of RCAs for a certain location.
+        rcas (pl.DataFrame) -- Matrix of RCAs for a certain location, either
+            pivotted or in tidy format as returned by `calculate_rca`.
         proximities (np.ndarray) -- Matrix with the proximity between the elements.
+        location (str) -- The name of the location column.
+        activity (str, optional) -- The name of the activity column, for tidy
+            format frames.
+        measure (str, optional) -- The name of the measure, for tidy format
+            frames.
+        cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+            matrix. Default value: 1.
 
     Returns:
-        (np.ndarray) -- A matrix with the probability that a location
+        (pl.DataFrame) -- A matrix with the probability that a location
             generates comparative advantages in a economic activity.
     """
-    # Save index
-    index_col = rca[location]
-    headers = rca.columns[1:]
-    rcas = rca.drop(location).to_numpy()
+    rcas, locations, activities = to_matrix(
+        rca, location=location, activity=activity, measure=measure
+    )
+
+    densities = _calculate_relatedness(
+        rcas,
+        cutoff=cutoff,
+        proximities=proximities,
+        out=empty_matrix((len(locations), proximities.shape[1])),
+    )
+
+    return from_matrix(densities, columns=activities, index=locations.alias(location))
+
+
+def calculate_distance(
+    rca: Union[pl.LazyFrame, pl.DataFrame],
+    proximities: Optional[np.ndarray] = None,
+    *,
+    location: str,
+    activity: Optional[str] = None,
+    measure: Optional[str] = None,
+    cutoff: float = 1,
+) -> pl.DataFrame:
+    """Calculates the Distance, the complement of the Relatedness.
+
+    Args:
+        rca (pl.DataFrame | pl.LazyFrame) -- Matrix of RCAs, either pivotted
+            or in tidy format as returned by `calculate_rca`.
+        proximities (np.ndarray, optional) -- Matrix with the proximity
+            between the activities. If not provided, will be calculated using
+            the "max" procedure, and the same cutoff value for this call.
+        location (str) -- The name of the location column.
+        activity (str, optional) -- The name of the activity column, for tidy
+            format frames.
+        measure (str, optional) -- The name of the measure, for tidy format
+            frames.
+        cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+            matrix. Default value: 1.
+
+    Returns:
+        (pl.DataFrame) -- A tidy frame with the distance between each location
+            and activity, in the `"{measure} Distance"` column.
+    """
+    rcas, locations, activities = to_matrix(
+        rca, location=location, activity=activity, measure=measure
+    )
+
+    dcp = _calculate_distance(rcas, cutoff=cutoff, proximities=proximities)
+
+    return to_tidy(
+        dcp,
+        index=locations.alias(location),
+        columns=activities,
+        value=value_name(measure, "Distance"),
+    )
+
+
+def calculate_opportunity_gain(
+    rca: Union[pl.LazyFrame, pl.DataFrame],
+    pci: pl.DataFrame,
+    proximities: Optional[np.ndarray] = None,
+    *,
+    location: str,
+    activity: str,
+    measure: Optional[str] = None,
+    cutoff: float = 1,
+) -> pl.DataFrame:
+    """Calculates the opportunity gain caused by the contribution of a certain
+    characteristic, relative to how this affects other characteristics.
+
+    Args:
+        rca (pl.DataFrame | pl.LazyFrame) -- Matrix of RCAs, either pivotted
+            or in tidy format as returned by `calculate_rca`.
+        pci (pl.DataFrame) -- The Product Complexity Index, as returned by
+            `calculate_complexity`: a frame with the `activity` column and a
+            column with the values.
+        proximities (np.ndarray, optional) -- Matrix with the proximity
+            between the activities. If not provided, will be calculated using
+            the "max" procedure, and the same cutoff value for this call.
+        location (str) -- The name of the location column.
+        activity (str) -- The name of the activity column.
+        measure (str, optional) -- The name of the measure, for tidy format
+            frames.
+        cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+            matrix. Default value: 1.
+
+    Returns:
+        (pl.DataFrame) -- A tidy frame with the opportunity gain for each
+            location and activity, in the `"{measure} Opportunity Gain"`
+            column.
+    """
+    rcas, locations, activities = to_matrix(
+        rca, location=location, activity=activity, measure=measure
+    )
+
+    opp_gain = _calculate_opportunity_gain(
+        rcas,
+        pci=to_vector(pci, key=activity, labels=activities),
+        cutoff=cutoff,
+        proximities=proximities,
+    )
+
+    return to_tidy(
+        opp_gain,
+        index=locations.alias(location),
+        columns=activities.alias(activity),
+        value=value_name(measure, "Opportunity Gain"),
+    )
+
+
+def calculate_relative_relatedness(
+    rca: Union[pl.LazyFrame, pl.DataFrame],
+    proximities: Optional[np.ndarray] = None,
+    *,
+    location: str,
+    activity: Optional[str] = None,
+    measure: Optional[str] = None,
+    cutoff: float = 1,
+) -> pl.DataFrame:
+    """Calculates the Relative Relatedness, the Relatedness standardized per
+    location over the activities where it doesn't have comparative advantages.
+
+    Args:
+        rca (pl.DataFrame | pl.LazyFrame) -- Matrix of RCAs, either pivotted
+            or in tidy format as returned by `calculate_rca`.
+        proximities (np.ndarray, optional) -- Matrix with the proximity
+            between the activities. If not provided, will be calculated using
+            the "max" procedure, and the same cutoff value for this call.
+        location (str) -- The name of the location column.
+        activity (str, optional) -- The name of the activity column, for tidy
+            format frames.
+        measure (str, optional) -- The name of the measure, for tidy format
+            frames.
+        cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+            matrix. Default value: 1.
+
+    Returns:
+        (pl.DataFrame) -- A tidy frame with the relative relatedness between
+            each location and activity, in the `"{measure} Relative
+            Relatedness"` column.
+    """
+    rcas, locations, activities = to_matrix(
+        rca, location=location, activity=activity, measure=measure
+    )
+
+    wcp = _calculate_relative_relatedness(
+        rcas, cutoff=cutoff, proximities=proximities
+    )
+
+    return to_tidy(
+        wcp,
+        index=locations.alias(location),
+        columns=activities,
+        value=value_name(measure, "Relative Relatedness"),
+    )
+
+
+def calculate_similarity(
+    rca: Union[pl.LazyFrame, pl.DataFrame],
+    *,
+    location: str,
+    activity: Optional[str] = None,
+    measure: Optional[str] = None,
+    epsilon: float = 0.1,
+) -> pl.DataFrame:
+    """Calculates the Export Similarity Index for a matrix of RCAs.
+
+    Bahar et al. (2014) introduces this measure of similarity in the export
+    structure of a pair of countries c and c'. It's defined as the Pearson
+    correlation between the logarithm of the RCA vectors of the two countries.
+
+    Args:
+        rca (pl.DataFrame | pl.LazyFrame) -- Matrix of RCAs, either pivotted
+            or in tidy format as returned by `calculate_rca`.
+        location (str) -- The name of the location column.
+        activity (str, optional) -- The name of the activity column, for tidy
+            format frames.
+        measure (str, optional) -- The name of the measure, for tidy format
+            frames.
+        epsilon (float, optional) -- A low value to prevent the calculation of
+            logarithm to output `-Inf`. Default value: 0.1.
+
+    Returns:
+        (pl.DataFrame) -- A tidy frame with the similarity between each pair
+            of locations, identified by the `location` and `"{location}_right"`
+            columns, in the `"{measure} Similarity"` column.
+    """
+    rcas, locations, _ = to_matrix(
+        rca, location=location, activity=activity, measure=measure
+    )
+
+    scc = _calculate_similarity(rcas, epsilon=epsilon)
+
+    locations = locations.alias(location)
+    return to_tidy(
+        scc,
+        index=locations,
+        columns=locations,
+        value=value_name(measure, "Similarity"),
+    )
+
+
+def calculate_pgi(
+    rca: Union[pl.LazyFrame, pl.DataFrame],
+    gini: pl.DataFrame,
+    *,
+    activity: str,
+    location: str,
+    measure: str,
+    cutoff: float = 1,
+    name: str = "pgi",
+) -> pl.DataFrame:
+    """Calculates the Product Gini Index (PGI).
+
+    Args:
+        rca (pl.DataFrame | pl.LazyFrame) -- The tidy RCA frame returned by
+            `calculate_rca`, which also contains the `measure` values.
+        gini (pl.DataFrame) -- A frame with the `location` column and a column
+            with the GINI index of each location. Locations not present in
+            this frame are ignored.
+        activity (str) -- The name of the column to use as economic activity.
+        location (str) -- The name of the column to use as associated location.
+        measure (str) -- The name of the column used as measure.
+        cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+            matrix. Default value: 1.
+        name (str, optional) -- The name of the column with the result.
+
+    Returns:
+        (pl.DataFrame) -- A frame with the `activity` column and the PGI.
+    """
+    return _pmi(
+        rca,
+        gini,
+        activity=activity,
+        location=location,
+        measure=measure,
+        cutoff=cutoff,
+        name=name,
+    )
+
 
-    # Get numerator by matrix multiplication of proximities with M_im
-    density_numerator = rcas.dot(proximities)
+def calculate_peii(
+    rca: Union[pl.LazyFrame, pl.DataFrame],
+    emissions: pl.DataFrame,
+    *,
+    activity: str,
+    location: str,
+    measure: str,
+    cutoff: float = 1,
+    name: str = "peii",
+) -> pl.DataFrame:
+    """Calculates the Product Emissions Intensity Index (PEII).
+
+    Args:
+        rca (pl.DataFrame | pl.LazyFrame) -- The tidy RCA frame returned by
+            `calculate_rca`, which also contains the `measure` values.
+        emissions (pl.DataFrame) -- A frame with the `location` column and a
+            column with the emissions intensity of each location. Locations
+            not present in this frame are ignored.
+        activity (str) -- The name of the column to use as economic activity.
+        location (str) -- The name of the column to use as associated location.
+        measure (str) -- The name of the column used as measure.
+        cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+            matrix. Default value: 1.
+        name (str, optional) -- The name of the column with the result.
+
+    Returns:
+        (pl.DataFrame) -- A frame with the `activity` column and the PEII.
+    """
+    return _pmi(
+        rca,
+        emissions,
+        activity=activity,
+        location=location,
+        measure=measure,
+        cutoff=cutoff,
+        name=name,
+    )
+
+
+def _pmi(
+    rca: Union[pl.LazyFrame, pl.DataFrame],
+    values: pl.DataFrame,
+    *,
+    activity: str,
+    location: str,
+    measure: str,
+    cutoff: float,
+    name: str,
+) -> pl.DataFrame:
+    """Calculates the Product 'measure' Index, for the values of the first
+    column of `values` other than `location`."""
+    df = rca.collect() if isinstance(rca, pl.LazyFrame) else rca
 
-    # Get denominator by multiplying proximities by all ones vector thus
-    # getting the sum of all proximities
-    rcas_ones = np.ones(rcas.shape)
-    # print rcas_ones.shape, proximities.shape
-    density_denominator = rcas_ones.dot(proximities)
+    tbl, locations, activities = pivot(
+        df, location=location, activity=activity, value=measure
+    )
+    rcas, _, _ = pivot(
+        df, location=location, activity=activity, value=f"{measure} RCA"
+    )
 
-    # We now have our densities matrix by dividing numerator by denomiator
-    densities = density_numerator / density_denominator
+    # only the locations with a known value are considered
+    positions = indexer(values.get_column(location).to_numpy(), locations.to_numpy())
+    known = positions >= 0
+    column = next(column for column in values.columns if column != location)
+    measures = values.get_column(column).cast(pl.Float64).fill_null(np.nan)
 
-    densities = pl.DataFrame(densities, schema=headers)
-    densities = densities.with_columns(pl.Series(name=location, values=index_col))
+    pmi = _calculate_pmi(
+        tbl[known],
+        rcas[known],
+        measures.to_numpy()[positions[known]].reshape(-1, 1),
+        cutoff=cutoff,
+    )
 
-    return densities
+    return pl.DataFrame([activities.alias(activity), pl.Series(name, pmi[:, 0])])
@@ -6,7 +6,7 @@ and their comparative advantages in relation to the level of world exports
 (Hidalgo et al., 2007).
 """
 
-from typing import Union
+from typing import List, Sequence, Union
 
 import polars as pl
 
@@ -19,13 +19,19 @@ def calculate_rca(
     measure: str,
     binary: bool = False,
     cutoff: float = 1,
+    group: Union[str, Sequence[str], None] = None,
+    sparse: bool = False,
 ) -> pl.LazyFrame:
     """Calculates the Revealed Comparative Advantage (RCA) for a tidy-data formatted DataFrame.
 
     It is important to note that even though the functions do not use a
     parameter in relation to time, the data used for the calculations must
     be relative to a time period; for example, considering World Exports for
-    the year 2020.
+    the year 2020. Several periods can be calculated at once using the
+    `group` argument.
+
+    The totals by location, by activity and overall are calculated with
+    window expressions, so the result is a single lazy plan without joins.
 
     Arguments:
         df (polars.DataFrame | polars.LazyFrame) --
@@ -47,6 +53,12 @@ def calculate_rca(
         cutoff (bool, optional) --
             Defines the value to establish the binarization criteria.
             Default is `1.0`
+        group (str | Sequence[str], optional) --
+            The name of the columns that identify independent datasets, like
+            the year. The RCA is calculated separately for each group.
+            Default is `None`
+        sparse (bool, optional) --
+            Only keep the rows where RCA >= cutoff. Default is `False`
 
     Returns:
         (polars.LazyFrame) --
@@ -61,27 +73,21 @@ def calculate_rca(
 
     lf = lf.fill_nan(0).fill_null(0)
 
-    # Calculate sum of measure per activity
-    total_activity = lf.group_by(activity).agg(
-        pl.sum(measure).alias("_sum_by_activity")
-    )
-
-    # Calculate sum of measure per location
-    total_location = lf.group_by(location).agg(
-        pl.sum(measure).alias("_sum_by_location")
-    )
+    group = _as_list(group)
+    value = pl.col(measure)
 
-    # Merge sums of measure per activity and per location
-    merged = lf.join(total_activity, on=activity).join(total_location, on=location)
+    # Sums of measure per location, per activity, and total, within each group
+    sum_by_location = value.sum().over([*group, location])
+    sum_by_activity = value.sum().over([*group, activity])
+    total = value.sum().over(group) if group else value.sum()
 
     # Build the expression for the column division that calculates the RCA
-    rca_expr = (pl.col(measure) / pl.col("_sum_by_location")) / (
-        pl.col("_sum_by_activity") / pl.sum(measure)
-    )
+    rca_expr = (value / sum_by_location) / (sum_by_activity / total)
     # Do the calculation
-    rca = merged.with_columns(rca_expr.alias(measure + " RCA")).drop(
-        ["_sum_by_activity", "_sum_by_location"]
-    )
+    rca = lf.with_columns(rca_expr.alias(measure + " RCA"))
+
+    if sparse:
+        rca = rca.filter(pl.col(measure + " RCA") >= cutoff)
 
     # Apply binarization of matrix
     if binary:
@@ -93,3 +99,11 @@ def calculate_rca(
         )
 
     return rca
+
+
+def _as_list(columns: Union[str, Sequence[str], None]) -> List[str]:
+    if columns is None:
+        return []
+    if isinstance(columns, str):
+        return [columns]
+    return list(columns)
@@ -0,0 +1,121 @@
+"""Rolling windows module
+
+Calculates the RCA, and optionally the ECI and PCI, over the sum of each
+window of consecutive periods, like 3-year rolling windows, to reduce the
+noise of the yearly data.
+"""
+
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import polars as pl
+
+from ..numpy.labels import indexer
+from ..numpy.labels import pivot as pivot_codes
+from ..numpy.rolling import calculate_rolling_rca as _calculate_rolling_rca
+from ._matrix import _encode, to_tidy
+
+
+def calculate_rolling_rca(
+    df: Union[pl.DataFrame, pl.LazyFrame],
+    *,
+    activity: str,
+    location: str,
+    measure: str,
+    period: str,
+    window: int = 3,
+    binary: bool = False,
+    cutoff: float = 1,
+    complexity: bool = False,
+    iterations: int = 20,
+) -> Tuple[pl.DataFrame, Optional[pl.DataFrame], Optional[pl.DataFrame]]:
+    """Calculates the RCA, and optionally the ECI and PCI, over the sum of
+    each window of consecutive periods.
+
+    The data is pivoted once into a matrix per period, and the sums are
+    updated incrementally as the window slides, so all the windows are
+    calculated in time linear in the number of periods.
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame) -- A tidy-data formatted DataFrame
+            with the measure of each location and activity, for each period.
+        activity (str) -- The name of the column to use as economic activity.
+        location (str) -- The name of the column to use as associated location.
+        measure (str) -- The name of the column to use as measure.
+        period (str) -- The name of the column with the period, like the year.
+            The windows follow the sorted unique values of this column.
+        window (int, optional) -- The amount of periods in each window.
+            Default value: 3.
+        binary (bool, optional) -- Binarize RCA values to 1 if RCA >= cutoff,
+            or 0 if not. Default value: False.
+        cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+            matrices. Default value: 1.
+        complexity (bool, optional) -- Also calculate the ECI and PCI of each
+            window. Default value: False.
+        iterations (int, optional) -- Limit of recursive calculations for
+            kp and kc. Default value: 20.
+
+    Returns:
+        ((pl.DataFrame, pl.DataFrame | None, pl.DataFrame | None)) -- The
+            RCA values in tidy format, with the `"{measure} RCA"` column, and
+            the ECI and PCI values, or `None` if `complexity` is False. Each
+            window is identified in the `period` column by its last period.
+    """
+    df = df.collect() if isinstance(df, pl.LazyFrame) else df
+
+    periods = df.get_column(period).unique().sort()
+    locations, row_codes = _encode(df.get_column(location))
+    activities, col_codes = _encode(df.get_column(activity))
+
+    # a single pivot, with a block of rows for each period
+    period_codes = indexer(periods.to_numpy(), df.get_column(period).to_numpy())
+    shape = (len(periods) * len(locations), len(activities))
+    values = pivot_codes(
+        df.get_column(measure).fill_null(0).to_numpy(),
+        period_codes * len(locations) + row_codes,
+        col_codes,
+        shape=shape,
+    ).reshape((len(periods), len(locations), len(activities)))
+
+    result = _calculate_rolling_rca(
+        values,
+        window=window,
+        binary=binary,
+        cutoff=cutoff,
+        complexity=complexity,
+        iterations=iterations,
+    )
+
+    ends = periods.slice(window - 1)
+    rca = pl.concat(
+        [
+            to_tidy(
+                rcas, index=locations, columns=activities, value=f"{measure} RCA"
+            ).select(pl.lit(end, dtype=periods.dtype).alias(period), pl.all())
+            for end, rcas in zip(ends, result.rca)
+        ]
+    )
+    if not complexity:
+        return rca, None, None
+
+    eci = _stacked(result.eci, ends, locations.alias(location), f"{measure} ECI")
+    pci = _stacked(result.pci, ends, activities.alias(activity), f"{measure} PCI")
+    return rca, eci, pci
+
+
+def _stacked(
+    values: np.ndarray,
+    periods: pl.Series,
+    labels: pl.Series,
+    name: str,
+) -> pl.DataFrame:
+    """Converts an array of vectors, one for each period, into a frame with
+    the period, the label and the value columns."""
+    n_periods, n_labels = values.shape
+    return pl.DataFrame(
+        [
+            periods.gather(np.repeat(np.arange(n_periods), n_labels)),
+            labels.gather(np.tile(np.arange(n_labels), n_periods)),
+            pl.Series(name, values.reshape(-1)),
+        ]
+    )
@@ -1,12 +1,57 @@
-from typing import Literal, Union
+from typing import Any, Dict, Iterable, Literal, Optional, Union
 
 import polars as pl
 
+from .backbone import calculate_backbone
 from .complexity import calculate_complexity
-from .product_space import calculate_proximity, calculate_relatedness
+from .cross_space import calculate_cross_proximity, calculate_cross_relatedness
+from .product_space import (
+    calculate_distance,
+    calculate_opportunity_gain,
+    calculate_peii,
+    calculate_pgi,
+    calculate_proximity,
+    calculate_relatedness,
+    calculate_relative_relatedness,
+    calculate_similarity,
+)
 from .rca import calculate_rca
+from .subnational import calculate_complexity_subnational
 
-AvailableModel = Literal["rca", "eci", "pci", "proximity", "relatedness"]
+AvailableModel = Literal[
+    "rca",
+    "eci",
+    "pci",
+    "proximity",
+    "relatedness",
+    "distance",
+    "opportunity_gain",
+    "relative_relatedness",
+    "similarity",
+    "pgi",
+    "peii",
+    "cross_proximity",
+    "cross_relatedness",
+    "eci_subnational",
+    "backbone",
+]
+AVAILABLE_MODELS = (
+    "rca",
+    "eci",
+    "pci",
+    "proximity",
+    "relatedness",
+    "distance",
+    "opportunity_gain",
+    "relative_relatedness",
+    "similarity",
+    "pgi",
+    "peii",
+    "cross_proximity",
+    "cross_relatedness",
+    "eci_subnational",
+    "backbone",
+)
 
 
 def run(
@@ -20,8 +65,59 @@ def run(
     cutoff: float = 1,
     iterations: int = 20,
     procedure: Literal["max", "sqrt"] = "max",
-) -> pl.DataFrame:
-    """ """
+    gini: Optional[pl.DataFrame] = None,
+    emissions: Optional[pl.DataFrame] = None,
+    pci_external: Optional[pl.DataFrame] = None,
+    cross: Union[pl.DataFrame, pl.LazyFrame, None] = None,
+    cross_activity: Optional[str] = None,
+    cross_measure: Optional[str] = None,
+) -> Any:
+    """Calculates a model from a tidy-data formatted DataFrame.
+
+    Some models need additional inputs: "pgi" needs `gini`, "peii" needs
+    `emissions`, "eci_subnational" needs `pci_external`, and the cross-space
+    models need the tidy data of the second space in `cross`.
+
+    Args:
+        model (str) -- The model to calculate; one of `AVAILABLE_MODELS`.
+        data (pl.DataFrame | pl.LazyFrame) -- The tidy-data formatted data.
+        activity (str) -- The name of the column to use as economic activity.
+        location (str) -- The name of the column to use as associated location.
+        measure (str) -- The name of the column to use as measure.
+        binary (bool, optional) -- Binarize the RCA values. Default is `False`.
+        cutoff (float, optional) -- The threshold value for the binarization
+            of the RCA values. Default is `1.0`.
+        iterations (int, optional) -- Limit of recursive calculations for the
+            complexity models. Default is `20`.
+        procedure (str, optional) -- The procedure to calculate the denominator
+            of the proximity. Available options are "sqrt" and "max".
+        gini (pl.DataFrame, optional) -- The GINI index of each location, for
+            the "pgi" model.
+        emissions (pl.DataFrame, optional) -- The emissions intensity of each
+            location, for the "peii" model.
+        pci_external (pl.DataFrame, optional) -- The external PCI of each
+            activity, for the "eci_subnational" model.
+        cross (pl.DataFrame | pl.LazyFrame, optional) -- The tidy-data
+            formatted data of the second space, for the cross-space models.
+        cross_activity (str, optional) -- The name of the activity column of
+            `cross`. Defaults to `activity`.
+        cross_measure (str, optional) -- The name of the measure column of
+            `cross`. Defaults to `measure`.
+
+    Returns:
+        (pl.DataFrame | np.ndarray) -- The result of the model.
+    """
+    cross_activity = cross_activity or activity
+    cross_measure = cross_measure or measure
+    if cross is not None:
+        cross = calculate_rca(
+            cross,
+            activity=cross_activity,
+            location=location,
+            measure=cross_measure,
+            binary=binary,
+            cutoff=cutoff,
+        ).collect()
 
     res_rca = calculate_rca(
         data,
@@ -33,27 +129,232 @@ def run(
     )
     res_rca = res_rca.collect()
 
-    if model == "rca":
-        return res_rca
+    results = run_models(
+        res_rca,
+        [model],
+        activity=activity,
+        location=location,
+        measure=measure,
+        # the binary RCA is already 0/1, so it must not be cut again
+        cutoff=1 if binary else cutoff,
+        iterations=iterations,
+        procedure=procedure,
+        gini=gini,
+        emissions=emissions,
+        pci_external=pci_external,
+        cross=cross,
+        cross_activity=cross_activity,
+        cross_measure=cross_measure,
+    )
+    return results[model]
+
 
-    elif model in ("eci", "pci"):
-        res_eci, res_pci = calculate_complexity(
-            res_rca,
+def run_models(
+    res_rca: pl.DataFrame,
+    models: Iterable[AvailableModel],
+    *,
+    activity: str,
+    location: str,
+    measure: str,
+    cutoff: float = 1,
+    iterations: int = 20,
+    procedure: Literal["max", "sqrt"] = "max",
+    shared: Optional[Dict[str, Any]] = None,
+    gini: Optional[pl.DataFrame] = None,
+    emissions: Optional[pl.DataFrame] = None,
+    pci_external: Optional[pl.DataFrame] = None,
+    cross: Optional[pl.DataFrame] = None,
+    cross_activity: Optional[str] = None,
+    cross_measure: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Calculates several models from the same RCA calculation, sharing the
+    intermediate results between them (like the proximity used by the
+    relatedness, or the complexity calculation for both ECI and PCI).
+
+    Args:
+        res_rca (pl.DataFrame) -- The result of `calculate_rca`.
+        models (Iterable[str]) -- The models to calculate.
+        shared (dict, optional) -- A cache of intermediate results, to reuse
+            them across calls with the same RCA and parameters.
+
+    The other keyword arguments are the same as in `run`, except for `cross`,
+    which must be the result of `calculate_rca` for the second space.
+
+    Returns:
+        (dict) -- The result of each model, keyed by name.
+    """
+    if shared is None:
+        shared = {}
+    shared.setdefault("rca", res_rca)
+    results: Dict[str, Any] = {}
+
+    for model in models:
+        if model not in AVAILABLE_MODELS:
+            raise ValueError("Model '%s' is unknown" % model)
+
+        results[model] = _get_model(
+            model,
+            shared,
             activity=activity,
             location=location,
             measure=measure,
+            cutoff=cutoff,
             iterations=iterations,
+            procedure=procedure,
+            gini=gini,
+            emissions=emissions,
+            pci_external=pci_external,
+            cross=cross,
+            cross_activity=cross_activity or activity,
+            cross_measure=cross_measure or measure,
+        )
+
+    return results
+
+
+def _get_model(model: str, shared: Dict[str, Any], **params: Any) -> Any:
+    """Returns the result of a model, calculating it and its dependencies
+    only if they are not in the `shared` cache."""
+    if model in shared:
+        return shared[model]
+
+    res_rca = shared["rca"]
+    activity = params["activity"]
+    location = params["location"]
+    measure = params["measure"]
+
+    if model in ("eci", "pci"):
+        shared["eci"], shared["pci"] = calculate_complexity(
+            res_rca,
+            activity=activity,
+            location=location,
+            measure=measure,
+            cutoff=params["cutoff"],
+            iterations=params["iterations"],
+        )
+
+    elif model == "proximity":
+        shared["proximity"] = calculate_proximity(
+            res_rca,
+            procedure=params["procedure"],
+            cutoff=params["cutoff"],
+            location=location,
+            activity=activity,
+            measure=measure,
+        )
+
+    elif model == "relatedness":
+        shared["relatedness"] = calculate_relatedness(
+            res_rca,
+            _get_model("proximity", shared, **params),
+            location=location,
+            activity=activity,
+            measure=measure,
+            cutoff=params["cutoff"],
+        )
+
+    elif model == "distance":
+        shared["distance"] = calculate_distance(
+            res_rca,
+            _get_model("proximity", shared, **params),
+            location=location,
+            activity=activity,
+            measure=measure,
+            cutoff=params["cutoff"],
+        )
+
+    elif model == "opportunity_gain":
+        shared["opportunity_gain"] = calculate_opportunity_gain(
+            res_rca,
+            _get_model("pci", shared, **params),
+            _get_model("proximity", shared, **params),
+            location=location,
+            activity=activity,
+            measure=measure,
+            cutoff=params["cutoff"],
+        )
+
+    elif model == "relative_relatedness":
+        shared["relative_relatedness"] = calculate_relative_relatedness(
+            res_rca,
+            _get_model("proximity", shared, **params),
+            location=location,
+            activity=activity,
+            measure=measure,
+            cutoff=params["cutoff"],
+        )
+
+    elif model == "similarity":
+        shared["similarity"] = calculate_similarity(
+            res_rca, location=location, activity=activity, measure=measure
+        )
+
+    elif model == "pgi":
+        shared["pgi"] = calculate_pgi(
+            res_rca,
+            _require(params, "gini", model),
+            activity=activity,
+            location=location,
+            measure=measure,
+            cutoff=params["cutoff"],
+        )
+
+    elif model == "peii":
+        shared["peii"] = calculate_peii(
+            res_rca,
+            _require(params, "emissions", model),
+            activity=activity,
+            location=location,
+            measure=measure,
+            cutoff=params["cutoff"],
+        )
+
+    elif model == "cross_proximity":
+        shared["cross_proximity"] = calculate_cross_proximity(
+            res_rca,
+            _require(params, "cross", model),
+            location=location,
+            activity_a=activity,
+            activity_b=params["cross_activity"],
+            measure_a=measure,
+            measure_b=params["cross_measure"],
+            cutoff=params["cutoff"],
+        )
+
+    elif model == "cross_relatedness":
+        shared["cross_relatedness"] = calculate_cross_relatedness(
+            res_rca,
+            _get_model("cross_proximity", shared, **params),
+            location=location,
+            activity=activity,
+            measure=measure,
+            cutoff=params["cutoff"],
         )
 
-        return res_eci if model == "eci" else res_pci
+    elif model == "eci_subnational":
+        shared["eci_subnational"], _ = calculate_complexity_subnational(
+            res_rca,
+            _require(params, "pci_external", model),
+            activity=activity,
+            location=location,
+            measure=measure,
+            cutoff=params["cutoff"],
+        )
 
-    elif model in ("proximity", "relatedness"):
-        res_prx = calculate_proximity(res_rca, procedure=procedure)
+    elif model == "backbone":
+        shared["backbone"] = calculate_backbone(
+            res_rca,
+            _get_model("proximity", shared, **params),
+            activity=activity,
+            location=location,
+            measure=measure,
+        )
 
-        if model == "proximity":
-            return res_prx
+    return shared[model]
 
-        res_rel = calculate_relatedness(res_rca, res_prx, location=location)
-        return res_rel
 
-    raise ValueError("Model '%s' is unknown" % model)
+def _require(params: Dict[str, Any], name: str, model: str) -> Any:
+    value = params.get(name)
+    if value is None:
+        raise ValueError("Model '%s' requires the `%s` argument" % (model, name))
+    return value
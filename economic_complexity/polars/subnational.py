@@ -0,0 +1,61 @@
+"""Subnational Method module
+"""
+
+from typing import Tuple, Union
+
+import polars as pl
+
+from ..numpy.subnational import (
+    calculate_complexity_subnational as _calculate_complexity_subnational,
+)
+from ._matrix import to_matrix, to_vector
+
+
+def calculate_complexity_subnational(
+    rca: Union[pl.DataFrame, pl.LazyFrame],
+    pci_external: pl.DataFrame,
+    *,
+    activity: str,
+    location: str,
+    measure: str,
+    cutoff: float = 1,
+    standardize: bool = False,
+) -> Tuple[pl.DataFrame, pl.DataFrame]:
+    """Calculates the Economic Complexity Index for the subnational (AKA
+    external method), as the average external PCI of the activities where
+    each location has comparative advantages.
+
+    Args:
+        rca (pl.DataFrame | pl.LazyFrame) -- The RCA values, either in tidy
+            format as returned by `calculate_rca`, or as a pivotted matrix
+            with a `location` column.
+        pci_external (pl.DataFrame) -- PCI values from an external source: a
+            frame with the `activity` column and a column with the values.
+            Activities without an external PCI are ignored.
+        activity (str) -- The name of the column to use as economic activity.
+        location (str) -- The name of the column to use as associated location.
+        measure (str) -- The name of the column used as measure.
+        cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+            matrix. Default value: 1.
+        standardize (bool, optional) -- Specifies if the ECI vector should be
+            standardized: `x-µ/σ`. Default value: False.
+
+    Returns:
+        ((pl.DataFrame, pl.DataFrame)) -- A tuple of ECI and PCI values using
+            the subnational method.
+    """
+    rcas, locations, activities = to_matrix(
+        rca, location=location, activity=activity, measure=measure
+    )
+
+    eci_external, _ = _calculate_complexity_subnational(
+        rcas,
+        to_vector(pci_external, key=activity, labels=activities),
+        cutoff=cutoff,
+        standardize=standardize,
+    )
+
+    geo_complexity = pl.DataFrame(
+        [pl.Series(f"{measure} ECI", eci_external), locations.alias(location)]
+    )
+    return geo_complexity, pci_external
@@ -2,15 +2,26 @@
 
 from typing import Literal, Optional
 
-import numpy as np
 import pandas as pd
 
+from ._pandas import aligned, reindexed, to_array
+from .numpy.planner import Engine
+from .numpy.product_space import (
+    calculate_opportunity_gain,
+    calculate_pmi,
+    calculate_proximity,
+    calculate_relatedness,
+    calculate_relative_relatedness,
+    calculate_similarity,
+)
+
 
 def proximity(
     df_rca: pd.DataFrame,
     *,
     cutoff: float = 1,
     procedure: Literal["max", "sqrt"] = "max",
+    engine: Engine = "auto",
 ) -> pd.DataFrame:
     """Calculates the Proximity index for a matrix of RCAs.
 
@@ -30,45 +41,17 @@ def proximity(
         Default value: `1`.
     * procedure (str, optional) -- Determines how to calcule the denominator.
         Available options are "sqrt" and "max". Default value: `"max"`.
+    * engine (str, optional) -- The execution strategy: `"dense"`, `"blocked"`,
+        or `"auto"` to choose the fastest one that fits in the memory budget.
+        See `economic_complexity.numpy.planner`. Default value: `"auto"`.
 
     ### Returns:
     (pd.DataFrame) -- A square matrix with the proximity between the elements.
     """
-    # Apply cutoff to RCA values
-    rcas = df_rca.ge(cutoff).astype(int)
-
-    # transpose the matrix so that it is now industries as rows
-    # and munics as columns
-    rcas_t = rcas.T.fillna(0)
-
-    # Matrix multiplication on M_mi matrix and transposed version,
-    # number of products = number of rows and vice versa on transposed
-    # version, thus the shape of this result will be length of products
-    # by the length of products (symetric)
-    numerator_intersection = rcas_t.dot(rcas_t.T)
-
-    # kp0 is a vector of the number of munics with RCA in the given product
-    kp0 = rcas.sum(axis=0)
-    kp0 = kp0.to_numpy().reshape((1, len(kp0)))
-
-    # transpose this to get the unions
-    kp0_trans = kp0.T
-
-    # multiply these two vectors, take the squre root
-    # and then we have the denominator
-    if procedure == "sqrt":
-        # get square root for geometric mean
-        denominator_union = kp0_trans.dot(kp0)
-        denominator_union = np.power(denominator_union, 0.5)
-    else:
-        denominator_union = np.maximum(kp0, kp0_trans)
-
-    # to get the proximities it is now a simple division of the untion sqrt
-    # with the numerator intersections
-    phi: pd.DataFrame = np.divide(numerator_intersection, denominator_union)  # type: ignore
-    np.fill_diagonal(phi.values, 0)
-
-    return phi
+    phi = calculate_proximity(
+        to_array(df_rca), cutoff=cutoff, procedure=procedure, engine=engine
+    )
+    return pd.DataFrame(phi, index=df_rca.columns, columns=df_rca.columns)
 
 
 def relatedness(
@@ -76,6 +59,7 @@ def relatedness(
     *,
     cutoff: float = 1,
     proximities: Optional[pd.DataFrame] = None,
+    engine: Engine = "auto",
 ) -> pd.DataFrame:
     """Calculates the Relatedness, given a matrix of RCAs for the economic
     activities of a location, and a matrix of Proximities.
@@ -101,31 +85,25 @@ def relatedness(
     * proximities (pd.DataFrame, optional) -- Matrix with the proximity between the elements.
         If not provided, will be calculated using the "max" procedure, and
         the same cutoff value for this call.
+    * engine (str, optional) -- The execution strategy: `"dense"`, `"blocked"`,
+        or `"auto"` to choose the fastest one that fits in the memory budget.
+        See `economic_complexity.numpy.planner`. Default value: `"auto"`.
 
     ### Returns:
     (pd.DataFrame) -- A matrix with the probability that a location generates
         comparative advantages in a economic activity.
     """
     if proximities is None:
-        proximities = proximity(df_rca, cutoff=cutoff)
+        proximities = proximity(df_rca, cutoff=cutoff, engine=engine)
 
-    rcas = df_rca.ge(cutoff).astype(int)
-
-    # Get numerator by matrix multiplication of proximities with M_im
-    density_numerator = rcas.dot(proximities)
-
-    # Get denominator by multiplying proximities by all ones vector thus
-    # getting the sum of all proximities
-    # rcas_ones = pd.DataFrame(np.ones_like(rcas))
-    rcas_ones = rcas * 0
-    rcas_ones = rcas_ones + 1
-    # print rcas_ones.shape, proximities.shape
-    density_denominator = rcas_ones.dot(proximities)
-
-    # We now have our densities matrix by dividing numerator by denomiator
-    densities = density_numerator / density_denominator
-
-    return densities
+    # proximities rows must follow the order of the RCA columns
+    densities = calculate_relatedness(
+        to_array(df_rca),
+        cutoff=cutoff,
+        proximities=aligned(proximities, df_rca.columns),
+        engine=engine,
+    )
+    return pd.DataFrame(densities, index=df_rca.index, columns=proximities.columns)
 
 
 def distance(
@@ -184,35 +162,21 @@ def opportunity_gain(
     if proximities is None:
         proximities = proximity(df_rca, cutoff=cutoff)
 
-    rcas = df_rca.ge(cutoff).astype(int)
-
-    # turn proximities in to ratios out of total
-    prox_ratio = proximities / proximities.sum()
-
-    # get the inverse of the RCAs matrix. Since they are in the form of 1's and
-    # 0's this will flip all of them i.e. 1 = 0 and 0 = 1
-    inverse_rcas = 1 - rcas
-
-    # here we now have the middle part of the equation
-    middle = inverse_rcas.multiply(pci)
-
-    # get the relatedness with the backwards bizzaro RCAs
-    dcp = relatedness(inverse_rcas, proximities=proximities)
-    # now get the inverse
-    dcp = 1 - dcp
-    # we now have the right-half of the equation
-    right = dcp.multiply(pci)
-
-    # matrix multiplication with proximities ratio
-    opp_gain = middle.dot(prox_ratio) - right
-
-    return opp_gain
+    # proximities must be a square matrix in the order of the RCA columns
+    opp_gain = calculate_opportunity_gain(
+        to_array(df_rca),
+        pci=reindexed(pci, df_rca.columns),
+        cutoff=cutoff,
+        proximities=aligned(proximities, df_rca.columns, df_rca.columns),
+    )
+    return pd.DataFrame(opp_gain, index=df_rca.index, columns=df_rca.columns)
 
 
 def similarity(
     df_rca: pd.DataFrame,
     *,
     epsilon: float = 0.1,
+    engine: Engine = "auto",
 ) -> pd.DataFrame:
     """
     Calculates the Export Similarity Index for a matrix of RCAs.
@@ -231,17 +195,15 @@ def similarity(
     ### Keyword Args:
     * epsilon (float, optional) -- A low value to prevent the calculation of logarithm to output `-Inf`.
         Default value: `0.1`.
+    * engine (str, optional) -- The execution strategy: `"dense"`, `"blocked"`,
+        or `"auto"` to choose the fastest one that fits in the memory budget.
+        See `economic_complexity.numpy.planner`. Default value: `"auto"`.
 
     ### Returns:
     (pd.DataFrame) -- A square matrix with the Export Similarity Index between the elements.
     """
-    # Take the log of rcas (adding \epsilon)
-    rcas: pd.DataFrame = np.log(df_rca + epsilon)  # type: ignore
-
-    # calculate the matrix through the pearson correlation
-    scc = pd.DataFrame(np.corrcoef(rcas), columns=rcas.index, index=rcas.index)
-
-    return scc
+    scc = calculate_similarity(to_array(df_rca), epsilon=epsilon, engine=engine)
+    return pd.DataFrame(scc, index=df_rca.index, columns=df_rca.index)
 
 
 def _pmi(
@@ -273,36 +235,25 @@ def _pmi(
     (pd.DataFrame) -- A square matrix with the Export Similarity Index between the elements.
 
     """
-    # drop product with no exports and fill missing values with zeros
-    tbl = tbl.dropna(how="all", axis=1).fillna(value=0)
-    measure = measure.fillna(value=0)
-
-    # get Mcp matrix
-    m = rcas.ge(cutoff).astype(int)
-
-    # Ensures that the matrices are aligned by removing geographies that don't exist in both matrices
-    tbl_geo = tbl.index
-    measure_geo = measure.index
-    intersection_geo = list(set(tbl_geo) & set(measure_geo))
-    tbl = tbl.filter(items=intersection_geo, axis=0)
-    measure = measure.filter(items=intersection_geo, axis=0)
-    m = m.filter(items=intersection_geo, axis=0)
-
-    tbl = tbl.sort_index(ascending=True)
-    measure = measure.sort_index(ascending=True)
-    m = m.sort_index(ascending=True)
-
-    # get Scp matrix
-    col_sums = tbl.sum(axis=1)
-    col_sums = col_sums.to_numpy().reshape((len(col_sums), 1))
-    scp = np.divide(tbl, col_sums)
-
-    # get Np array
-    normp = m.multiply(scp).sum(axis=0)
-    num = m.multiply(scp).T.dot(measure)
-
-    pmi = num.div(normp, axis=0)
-    return pmi
+    # drop product with no exports
+    tbl = tbl.dropna(how="all", axis=1)
+
+    # Ensures that the matrices are aligned by removing geographies that don't
+    # exist in both matrices, and products that don't exist in both matrices
+    # are considered without exports
+    geos = tbl.index.intersection(measure.index).sort_values()
+    products = rcas.columns.union(tbl.columns)
+    tbl = tbl.reindex(index=geos, columns=products)
+    rcas = rcas.reindex(index=geos, columns=products)
+    measure = measure.reindex(index=geos)
+
+    pmi = calculate_pmi(
+        to_array(tbl),
+        to_array(rcas),
+        to_array(measure),
+        cutoff=cutoff,
+    )
+    return pd.DataFrame(pmi, index=products, columns=measure.columns)
 
 
 def pgi(
@@ -398,19 +349,13 @@ def relative_relatedness(
     (pd.DataFrame) -- A matrix with the probability that a location generates
         comparative advantages in a economic activity.
     """
-
-    opp = rcas.copy()
-
-    if cutoff == 0:
-        opp = 1
-    else:
-        opp[opp >= cutoff] = pd.NA
-        opp[opp < cutoff] = 1
-
-    wcp = relatedness(rcas, cutoff=cutoff, proximities=proximities)
-
-    wcp_opp = opp * wcp
-    wcp_mean = wcp_opp.mean(axis=1)
-    wcp_std = wcp_opp.std(axis=1)
-
-    return wcp.transform(lambda x: (x - wcp_mean) / wcp_std)
+    if proximities is None:
+        proximities = proximity(rcas, cutoff=cutoff)
+
+    # proximities must be a square matrix in the order of the RCA columns
+    wcp = calculate_relative_relatedness(
+        to_array(rcas),
+        cutoff=cutoff,
+        proximities=aligned(proximities, rcas.columns, rcas.columns),
+    )
+    return pd.DataFrame(wcp, index=rcas.index, columns=rcas.columns)
@@ -0,0 +1,228 @@
+"""Query module
+
+Precomputed indexes to answer ranking questions over the outputs of the
+calculation functions, like "the top 20 related products for a location"
+(from `relatedness`), "the locations most similar to another" (from
+`similarity`), or "the products with the highest opportunity gain for a
+location" (from `opportunity_gain`), without slicing the full DataFrames.
+"""
+
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class RankingIndex:
+    """Stores the top-N columns of each row of a matrix, sorted by value.
+
+    The index keeps the row labels in a label-to-code mapping, and the
+    column codes and values of the top-N elements per row in compact NumPy
+    arrays, so lookups are plain array indexing operations.
+
+    Use the `RankingIndex.from_frame` constructor to build it from the output
+    of `relatedness`, `similarity`, `opportunity_gain` or any other matrix
+    with locations as index.
+    """
+
+    def __init__(
+        self,
+        rows: np.ndarray,
+        columns: np.ndarray,
+        indices: np.ndarray,
+        values: np.ndarray,
+    ):
+        if indices.shape != values.shape or indices.shape[0] != len(rows):
+            raise ValueError("Shapes of rows, indices and values do not match")
+
+        self.rows = rows
+        self.columns = columns
+        self.indices = indices
+        self.values = values
+        self._codes: Dict[Hashable, int] = {
+            label: code for code, label in enumerate(rows.tolist())
+        }
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __repr__(self):
+        return "%s(rows=%d, columns=%d, n=%d)" % (
+            type(self).__name__,
+            len(self.rows),
+            len(self.columns),
+            self.n,
+        )
+
+    @property
+    def n(self) -> int:
+        """The amount of elements stored for each row."""
+        return self.indices.shape[1]
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        *,
+        n: int = 50,
+        ascending: bool = False,
+        exclude_self: bool = False,
+        dtype: Any = np.float32,
+    ) -> "RankingIndex":
+        """Builds the index from a matrix with the labels of the rows as
+        index, and the labels of the ranked elements as columns.
+
+        ### Args:
+        * df (pd.DataFrame) -- The matrix to index, like the output of
+            `relatedness`, `similarity` or `opportunity_gain`.
+
+        ### Keyword Args:
+        * n (int, optional) -- The amount of elements to keep for each row.
+            Default value: `50`.
+        * ascending (bool, optional) -- Rank the smallest values first, for
+            matrices like `distance`. Default value: `False`.
+        * exclude_self (bool, optional) -- Skip the element with the same label
+            as the row, like the diagonal of `similarity`.
+            Default value: `False`.
+        * dtype (numpy.dtype, optional) -- The dtype used to store the values.
+            Default value: `numpy.float32`.
+
+        ### Returns:
+        (RankingIndex) -- The index.
+        """
+        rows = df.index.to_numpy()
+        columns = df.columns.to_numpy()
+        indices, values = top_n(
+            df.to_numpy(dtype=float),
+            n=n,
+            ascending=ascending,
+            exclude=df.columns.get_indexer(df.index) if exclude_self else None,
+        )
+        return cls(rows, columns, indices, values.astype(dtype, copy=False))
+
+    def codes(self, labels: Iterable[Hashable]) -> np.ndarray:
+        """Translates a list of row labels into their integer codes.
+
+        ### Args:
+        * labels (Iterable[Hashable]) -- The labels of the rows.
+
+        ### Returns:
+        (np.ndarray) -- The codes of the rows, in the same order.
+        """
+        try:
+            return np.fromiter(
+                (self._codes[label] for label in labels), dtype=np.intp
+            )
+        except KeyError as exc:
+            raise KeyError("Label %r is not in the index" % exc.args[0]) from None
+
+    def top(
+        self,
+        label: Hashable,
+        n: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the top elements for a single row.
+
+        ### Args:
+        * label (Hashable) -- The label of the row.
+        * n (int, optional) -- The amount of elements to return. Can't be
+            greater than the amount stored in the index.
+
+        ### Returns:
+        ((np.ndarray, np.ndarray)) -- A tuple with the labels and the values
+            of the top elements, in ranking order.
+        """
+        labels, values = self.top_batch([label], n)
+        return labels[0], values[0]
+
+    def top_batch(
+        self,
+        labels: Iterable[Hashable],
+        n: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the top elements for many rows at once.
+
+        ### Args:
+        * labels (Iterable[Hashable]) -- The labels of the rows.
+        * n (int, optional) -- The amount of elements to return per row. Can't
+            be greater than the amount stored in the index.
+
+        ### Returns:
+        ((np.ndarray, np.ndarray)) -- A tuple with two 2-dimensional arrays,
+            with the labels and the values of the top elements of each row.
+        """
+        return self.top_codes(self.codes(labels), n)
+
+    def top_codes(
+        self,
+        codes: np.ndarray,
+        n: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Same as `top_batch`, but using the integer codes of the rows.
+
+        ### Args:
+        * codes (np.ndarray) -- The integer codes of the rows.
+        * n (int, optional) -- The amount of elements to return per row.
+
+        ### Returns:
+        ((np.ndarray, np.ndarray)) -- The labels and the values of the top
+            elements of each row.
+        """
+        if n is None:
+            n = self.n
+        elif n > self.n:
+            raise ValueError("The index only stores %d elements per row" % self.n)
+
+        indices = self.indices[codes, :n]
+        return self.columns[indices], self.values[codes, :n]
+
+
+def top_n(
+    values: np.ndarray,
+    *,
+    n: int,
+    ascending: bool = False,
+    exclude: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculates the column positions and values of the top `n` elements of
+    each row of a matrix. NaN values are always ranked last.
+
+    ### Args:
+    * values (np.ndarray) -- A 2-dimensional array.
+
+    ### Keyword Args:
+    * n (int) -- The amount of elements to keep for each row.
+    * ascending (bool, optional) -- Rank the smallest values first.
+        Default value: `False`.
+    * exclude (np.ndarray, optional) -- The position of a column to exclude
+        for each row; negative positions are ignored.
+
+    ### Returns:
+    ((np.ndarray, np.ndarray)) -- The positions and the values of the top
+        elements, as arrays of shape `(rows, n)`.
+    """
+    n_rows, n_cols = values.shape
+
+    # sort keys: lower is better, NaN cells go last as infinite keys, and the
+    # excluded cells after them as NaN keys, which numpy sorts to the end
+    keys = values if ascending else -values
+    keys = np.where(np.isnan(keys), np.inf, keys)
+    if exclude is not None:
+        rows = np.flatnonzero(exclude >= 0)
+        keys[rows, exclude[rows]] = np.nan
+        n_cols -= 1
+    n = min(n, n_cols)
+
+    if n < keys.shape[1]:
+        candidates = np.argpartition(keys, n - 1, axis=1)[:, :n]
+    else:
+        candidates = np.broadcast_to(np.arange(keys.shape[1]), keys.shape)
+    selected = np.take_along_axis(keys, candidates, axis=1)
+    order = np.argsort(selected, axis=1, kind="stable")
+    indices = np.take_along_axis(candidates, order, axis=1)
+
+    index_dtype = np.min_scalar_type(max(values.shape[1] - 1, 0))
+    return (
+        indices.astype(index_dtype),
+        np.take_along_axis(values, indices, axis=1),
+    )
@@ -6,11 +6,23 @@ and their comparative advantages in relation to the level of world exports
 (Hidalgo et al., 2007).
 """
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
+from ._pandas import to_array
+from .numpy.rca import calculate_rca
+
 
-def rca(tbl: pd.DataFrame) -> pd.DataFrame:
+def rca(
+    tbl: pd.DataFrame,
+    *,
+    binary: bool = False,
+    cutoff: float = 1,
+    dtype: Optional[np.dtype] = None,
+    chunksize: Optional[int] = None,
+) -> pd.DataFrame:
     """Calculates the Revealed Comparative Advantage (RCA) for a pivoted matrix.
 
     It is important to note that even though the functions do not use a
@@ -18,25 +30,45 @@ def rca(tbl: pd.DataFrame) -> pd.DataFrame:
     be per period; for example working with World Exports for the year 2020.
     Also, the index always has to be a geographic level.
 
+    The values of `tbl` are read without copying when possible, and the
+    result is written into a single preallocated array, so the peak memory
+    is about one copy of the input (or less, with a smaller `dtype`).
+
     Arguments:
         tbl (pandas.DataFrame) -- A pivoted table using a geographic index,
             columns with the categories to be evaluated and the measurement of
             the data as values.
 
+    Keyword Arguments:
+        binary (bool, optional) -- Return the binarized values instead: 1 if
+            RCA >= cutoff, 0 if not. Default is `False`.
+        cutoff (float, optional) -- The threshold value for the binarization.
+            Default is `1.0`.
+        dtype (numpy.dtype, optional) -- The data type of the result, like
+            `numpy.float32`, or `bool` for binary results. Default is
+            `float64`.
+        chunksize (int, optional) -- The amount of rows to process at a time,
+            to limit the size of the temporary arrays. By default, as many
+            rows as fit in about 32MB.
+
     Returns:
         (pandas.DataFrame) -- RCA matrix with real values.
     """
-    # fill missing values with zeros
-    tbl = tbl.fillna(value=0)
-
-    col_sums = tbl.sum(axis=1) # 1:columns
-    col_sums = col_sums.to_numpy().reshape((len(col_sums), 1))
-
-    rca_numerator = np.divide(tbl, col_sums)
-    row_sums = tbl.sum(axis=0) # 0:index
+    values = to_array(tbl)
 
-    total_sum = tbl.sum().sum()
-    rca_denominator = row_sums / total_sum
-    rcas = rca_numerator / rca_denominator
+    # values that are not float64 were converted into a new array, which can
+    # be replaced by the result
+    out = None
+    converted = any(kind != np.float64 for kind in tbl.dtypes)
+    if converted and dtype is None and not binary:
+        out = values
 
-    return rcas
+    rcas = calculate_rca(
+        values,
+        binary=binary,
+        cutoff=cutoff,
+        dtype=dtype,
+        chunksize=chunksize,
+        out=out,
+    )
+    return pd.DataFrame(rcas, index=tbl.index, columns=tbl.columns, copy=False)
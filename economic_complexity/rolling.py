@@ -0,0 +1,116 @@
+"""Rolling windows module
+
+Calculates the RCA, and optionally the ECI and PCI, over the sum of each
+window of consecutive periods, like 3-year rolling windows, to reduce the
+noise of the yearly data.
+
+```
+tbls = {year: df.pivot(...) for year, df in exports.groupby("Year")}
+windows = rolling_rca(tbls, window=3, complexity=True)
+eci_2020 = windows[2020].eci  # the window 2018-2020
+```
+"""
+
+from typing import Dict, Hashable, Mapping, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from ._pandas import to_array
+from .numpy.labels import take
+from .numpy.rolling import calculate_rolling_rca
+
+
+class RollingWindow(NamedTuple):
+    """The indicators calculated for a position of the window."""
+
+    rca: pd.DataFrame
+    eci: Optional[pd.Series]
+    pci: Optional[pd.Series]
+
+
+def rolling_rca(
+    tbls: Mapping[Hashable, pd.DataFrame],
+    *,
+    window: int = 3,
+    binary: bool = False,
+    cutoff: float = 1,
+    complexity: bool = False,
+    iterations: int = 20,
+) -> Dict[Hashable, RollingWindow]:
+    """Calculates the RCA, and optionally the ECI and PCI, over the sum of
+    each window of consecutive periods.
+
+    The sums are updated incrementally as the window slides, so all the
+    windows are calculated in time linear in the number of periods.
+
+    ### Args:
+    * tbls (Mapping[Hashable, pd.DataFrame]) -- The pivoted table of each
+        period, in chronological order, using a geographic index, columns
+        with the categories to be evaluated and the measurement of the data
+        as values. The labels missing in a period are considered zero.
+
+    ### Keyword Args:
+    * window (int, optional) -- The amount of periods in each window.
+        Default value: `3`.
+    * binary (bool, optional) -- Return the binarized RCA values: 1 if
+        RCA >= cutoff, 0 if not. Default value: `False`.
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrices. Default value: `1`.
+    * complexity (bool, optional) -- Also calculate the ECI and PCI of each
+        window. Default value: `False`.
+    * iterations (int, optional) -- Limit of recursive calculations for kp
+        and kc. Default value: `20`.
+
+    ### Returns:
+    (Dict[Hashable, RollingWindow]) -- The indicators of each window, keyed
+        by the last period of the window. The ECI and PCI are `None` if
+        `complexity` is `False`.
+    """
+    frames = list(tbls.values())
+    if not frames:
+        raise ValueError("At least one period is required")
+
+    index = frames[0].index.append([tbl.index for tbl in frames[1:]]).unique()
+    columns = frames[0].columns.append([tbl.columns for tbl in frames[1:]]).unique()
+
+    values = np.empty((len(frames), len(index), len(columns)))
+    for tbl, out in zip(frames, values):
+        _aligned(tbl, index, columns, out=out)
+
+    result = calculate_rolling_rca(
+        values,
+        window=window,
+        binary=binary,
+        cutoff=cutoff,
+        complexity=complexity,
+        iterations=iterations,
+    )
+
+    periods = list(tbls)[window - 1 :]
+    return {
+        period: RollingWindow(
+            rca=pd.DataFrame(result.rca[i], index=index, columns=columns),
+            eci=None if result.eci is None else pd.Series(result.eci[i], index=index),
+            pci=None if result.pci is None else pd.Series(result.pci[i], index=columns),
+        )
+        for i, period in enumerate(periods)
+    }
+
+
+def _aligned(
+    tbl: pd.DataFrame,
+    index: pd.Index,
+    columns: pd.Index,
+    *,
+    out: np.ndarray,
+) -> np.ndarray:
+    """Writes the values of `tbl` into `out`, with the rows and columns in the
+    order of `index` and `columns`, using zero for the missing labels."""
+    values = to_array(tbl)
+    if not tbl.index.equals(index):
+        values = take(values, tbl.index.get_indexer(index), fill_value=0)
+    if not tbl.columns.equals(columns):
+        values = take(values, tbl.columns.get_indexer(columns), axis=1, fill_value=0)
+    np.copyto(out, values)
+    return out
@@ -0,0 +1,127 @@
+"""Counterfactual scenarios module
+
+Answers questions like "what happens to the ECI of a region, and to its
+opportunity gains, if it gains comparative advantages in these products?",
+for a batch of scenarios over the same RCA matrix:
+
+```
+results = what_if(df_rca, {
+    "xy": [("region", "product_x"), ("region", "product_y")],
+    "z": [("region", "product_z")],
+})
+results["xy"].eci_change["region"]
+```
+
+Each scenario updates the calculations of the baseline instead of running
+them again. See `economic_complexity.numpy.scenarios`.
+"""
+
+from typing import Dict, Hashable, Iterable, Literal, Mapping, NamedTuple, Optional
+
+import pandas as pd
+
+from ._pandas import to_array
+from .numpy.scenarios import Edit, evaluate_scenarios, prepare_baseline
+
+
+class WhatIf(NamedTuple):
+    """The indicators after applying the edits of a scenario."""
+
+    eci: pd.Series
+    pci: pd.Series
+    # the difference with the ECI of the baseline
+    eci_change: pd.Series
+    opportunity_gain: pd.DataFrame
+    iterations: int
+    converged: bool
+
+
+def what_if(
+    df_rca: pd.DataFrame,
+    scenarios: Mapping[Hashable, Iterable[tuple]],
+    *,
+    cutoff: float = 1,
+    procedure: Literal["max", "sqrt"] = "max",
+    iterations: int = 200,
+    tol: float = 1e-8,
+    locations: Optional[Iterable[Hashable]] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[Hashable, WhatIf]:
+    """Calculates the Complexity indices and the Opportunity Gain after
+    changing the comparative advantages of some locations, for each scenario.
+
+    ### Args:
+    * df_rca (pd.DataFrame) -- Pivotted RCA matrix.
+    * scenarios (Mapping[Hashable, Iterable[tuple]]) -- The edits of each
+        scenario, by name. An edit is a `(location, activity)` pair where the
+        location gains comparative advantages, or a `(location, activity,
+        bool)` tuple to set whether the location has comparative advantages.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrix. Default value: `1`.
+    * procedure (str, optional) -- Determines how to calcule the denominator
+        of the Proximity. Available options are "sqrt" and "max".
+        Default value: `"max"`.
+    * iterations (int, optional) -- Limit of recursive calculations for kp
+        and kc. Default value: `200`.
+    * tol (float, optional) -- Stop the iterations when the largest change of
+        the values between two steps is under this value.
+        Default value: `1e-8`.
+    * locations (Iterable[Hashable], optional) -- The locations to calculate
+        the Opportunity Gain for. By default, the edited locations of each
+        scenario.
+    * max_workers (int, optional) -- The amount of threads used to evaluate
+        the scenarios.
+
+    ### Returns:
+    (Dict[Hashable, WhatIf]) -- The indicators of each scenario, by name.
+    """
+    baseline = prepare_baseline(
+        to_array(df_rca),
+        cutoff=cutoff,
+        procedure=procedure,
+        iterations=iterations,
+        tol=tol,
+    )
+
+    names = list(scenarios)
+    edits = [[_edit(df_rca, edit) for edit in scenarios[name]] for name in names]
+    rows = None if locations is None else [df_rca.index.get_loc(x) for x in locations]
+
+    results = evaluate_scenarios(
+        baseline, edits, locations=rows, max_workers=max_workers
+    )
+
+    eci_baseline = pd.Series(baseline.eci, index=df_rca.index)
+    return {
+        name: _what_if(df_rca, result, eci_baseline)
+        for name, result in zip(names, results)
+    }
+
+
+def _what_if(df_rca: pd.DataFrame, result, eci_baseline: pd.Series) -> WhatIf:
+    eci = pd.Series(result.eci, index=df_rca.index)
+    opportunity_gain = pd.DataFrame(
+        result.opportunity_gain,
+        index=df_rca.index[result.locations],
+        columns=df_rca.columns,
+    )
+    return WhatIf(
+        eci=eci,
+        pci=pd.Series(result.pci, index=df_rca.columns),
+        eci_change=eci - eci_baseline,
+        opportunity_gain=opportunity_gain,
+        iterations=result.iterations,
+        converged=result.converged,
+    )
+
+
+def _edit(df_rca: pd.DataFrame, edit: tuple) -> Edit:
+    """Converts an edit with labels to an edit with positions."""
+    location, activity, *value = edit
+    return (
+        df_rca.index.get_loc(location),
+        df_rca.columns.get_loc(activity),
+        bool(value[0]) if value else True,
+    )
@@ -0,0 +1,152 @@
+"""Portfolio scoring module
+
+Scores new locations, like new subnational units or the portfolio of a firm,
+against a fixed Product Space, without adding them to the RCA matrix:
+
+```
+scorer = PortfolioScorer.from_rca(df_rca)
+scores = scorer.score(df_new_rca)
+scores.relatedness.loc["new_region"].nlargest(20)
+```
+
+See `economic_complexity.numpy.scorer`.
+"""
+
+from typing import Literal, NamedTuple, Optional
+
+import pandas as pd
+
+from ._pandas import to_array
+from .numpy.complexity import calculate_complexity
+from .numpy.product_space import calculate_proximity
+from .numpy.scorer import PortfolioScorer as _Scorer
+
+
+class PortfolioScores(NamedTuple):
+    """The indicators of a batch of new locations."""
+
+    relatedness: pd.DataFrame
+    distance: pd.DataFrame
+    opportunity_gain: pd.DataFrame
+    # the average PCI of the activities with comparative advantages
+    eci: pd.Series
+
+
+class PortfolioScorer:
+    """Scores batches of new locations against a fixed Proximity matrix and
+    PCI vector.
+
+    Use the `PortfolioScorer.from_rca` constructor to build it from the RCA
+    matrix of the reference locations.
+
+    ### Args:
+    * proximities (pd.DataFrame) -- A square matrix with the proximity between
+        the activities, as returned by `proximity`.
+    * pci (pd.Series) -- The PCI of the activities. The activities without a
+        PCI are ignored by the ECI.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrices of the new locations. Default value: `1`.
+    """
+
+    def __init__(
+        self,
+        proximities: pd.DataFrame,
+        pci: pd.Series,
+        *,
+        cutoff: float = 1,
+    ):
+        self.activities = proximities.columns
+        self._scorer = _Scorer(
+            to_array(proximities.reindex(index=self.activities)),
+            pci.reindex(self.activities).to_numpy(dtype=float),
+            cutoff=cutoff,
+        )
+
+    def __repr__(self):
+        return "%s(activities=%d)" % (type(self).__name__, len(self.activities))
+
+    @classmethod
+    def from_rca(
+        cls,
+        df_rca: pd.DataFrame,
+        *,
+        cutoff: float = 1,
+        procedure: Literal["max", "sqrt"] = "max",
+        pci: Optional[pd.Series] = None,
+        iterations: int = 20,
+    ) -> "PortfolioScorer":
+        """Builds the scorer from the RCA matrix of the reference locations.
+
+        ### Args:
+        * df_rca (pd.DataFrame) -- Pivotted RCA matrix.
+
+        ### Keyword Args:
+        * cutoff (float, optional) -- Set the cutoff threshold value for the
+            RCA matrices, of the reference and of the new locations.
+            Default value: `1`.
+        * procedure (str, optional) -- Determines how to calcule the
+            denominator of the Proximity. Available options are "sqrt" and
+            "max". Default value: `"max"`.
+        * pci (pd.Series, optional) -- The PCI of the activities. By default,
+            calculated from `df_rca`.
+        * iterations (int, optional) -- Limit of recursive calculations for kp
+            and kc, when the PCI is calculated. Default value: `20`.
+
+        ### Returns:
+        (PortfolioScorer) -- The scorer.
+        """
+        rcas = to_array(df_rca)
+        proximities = calculate_proximity(rcas, cutoff=cutoff, procedure=procedure)
+        if pci is None:
+            _, values = calculate_complexity(rcas, cutoff=cutoff, iterations=iterations)
+            pci = pd.Series(values, index=df_rca.columns)
+
+        labels = df_rca.columns
+        return cls(
+            pd.DataFrame(proximities, index=labels, columns=labels),
+            pci,
+            cutoff=cutoff,
+        )
+
+    @property
+    def proximities(self) -> pd.DataFrame:
+        """The frozen Proximity matrix."""
+        return pd.DataFrame(
+            self._scorer.proximities, index=self.activities, columns=self.activities
+        )
+
+    @property
+    def pci(self) -> pd.Series:
+        """The frozen PCI vector."""
+        return pd.Series(self._scorer.pci, index=self.activities)
+
+    def score(self, df_rca: pd.DataFrame) -> PortfolioScores:
+        """Calculates the indicators of a batch of new locations.
+
+        ### Args:
+        * df_rca (pd.DataFrame) -- Pivotted RCA matrix of the new locations.
+            A binary matrix can be used with the default cutoff. Activities
+            missing from it are considered without comparative advantages, and
+            activities outside of the Product Space are ignored.
+
+        ### Returns:
+        (PortfolioScores) -- The Relatedness, Distance and Opportunity Gain of
+            each new location and activity, and the subnational ECI of each
+            new location.
+        """
+        if not df_rca.columns.equals(self.activities):
+            df_rca = df_rca.reindex(columns=self.activities)
+
+        result = self._scorer.score(to_array(df_rca))
+
+        def frame(values):
+            return pd.DataFrame(values, index=df_rca.index, columns=self.activities)
+
+        return PortfolioScores(
+            relatedness=frame(result.relatedness),
+            distance=frame(result.distance),
+            opportunity_gain=frame(result.opportunity_gain),
+            eci=pd.Series(result.eci, index=df_rca.index),
+        )
@@ -0,0 +1,273 @@
+"""Shared memory module
+
+Publishes the arrays used by many workers, like the Proximity and the Mcp
+matrices, in shared memory once, so each worker process attaches read-only
+views over the same pages instead of loading or calculating its own copy.
+
+```
+# in the parent process, before starting the workers
+shared = publish_shared({"proximity": df_prox, "mcp": df_mcp}, name="ecplx")
+
+# in each worker
+shared = attach_shared("ecplx")
+relatedness(shared["mcp"], proximities=shared["proximity"])
+
+# in the parent process, after stopping the workers
+shared.unlink()
+```
+
+Numpy arrays and pandas DataFrame/Series with numeric values are supported;
+the labels of pandas objects are published along the values. The views can be
+passed directly to `relatedness`, `opportunity_gain` and `cross_relatedness`,
+which don't copy float64 inputs. To keep the arrays between runs, store them
+as artifacts and load them as memory-mapped files instead.
+"""
+
+import json
+import secrets
+import sys
+import threading
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+import numpy as np
+
+from .artifacts import FORMAT_VERSION, _dump_index, _load_index
+
+_tracker_lock = threading.Lock()
+
+
+class SharedArrays(Mapping[str, Any]):
+    """A set of objects stored in shared memory, by key.
+
+    The process that publishes the objects owns the memory, and must call
+    `unlink` when the workers no longer need it. Every process should call
+    `close` (or use the object as a context manager) to release its views;
+    the objects returned by it can't be used after that.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        segments: Dict[str, SharedMemory],
+        objects: Dict[str, Any],
+        *,
+        owner: bool,
+    ):
+        self.name = name
+        self.owner = owner
+        self._segments = segments
+        self._objects = objects
+
+    def __getitem__(self, key: str) -> Any:
+        return self._objects[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._objects)
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __repr__(self) -> str:
+        return "SharedArrays(name=%r, keys=%r)" % (self.name, list(self._objects))
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the shared memory segments, in bytes."""
+        return sum(segment.size for segment in self._segments.values())
+
+    def close(self):
+        """Releases the views of this process over the shared memory. All the
+        references to the objects must be dropped before."""
+        self._objects.clear()
+        for segment in self._segments.values():
+            segment.close()
+
+    def unlink(self):
+        """Frees the shared memory, once the processes have closed it. Only
+        the process that published the objects should call it."""
+        for segment in self._segments.values():
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def publish_shared(
+    objects: Mapping[str, Any],
+    *,
+    name: Optional[str] = None,
+) -> SharedArrays:
+    """Copies some objects into shared memory, for other processes to attach.
+
+    ### Args:
+    * objects (Mapping[str, Any]) -- The objects to publish, by key. Numpy
+        arrays and pandas DataFrame/Series with numeric values are supported.
+
+    ### Keyword Args:
+    * name (str, optional) -- The name the workers use to attach the objects.
+        By default, a random name, available in the `name` attribute of the
+        result.
+
+    ### Returns:
+    (SharedArrays) -- The published objects, as views over the shared memory.
+    """
+    name = "ecplx_%s" % secrets.token_hex(6) if name is None else name
+
+    segments: Dict[str, SharedMemory] = {}
+    items: Dict[str, Dict[str, Any]] = {}
+    try:
+        for i, (key, obj) in enumerate(objects.items()):
+            values, meta = _split_object(obj)
+            segment_name = "%s_%d" % (name, i)
+            segment = SharedMemory(
+                name=segment_name, create=True, size=max(values.nbytes, 1)
+            )
+            segments[key] = segment
+            np.copyto(_view(segment, values.dtype, values.shape), values)
+            meta.update(
+                segment=segment_name, dtype=values.dtype.str, shape=values.shape
+            )
+            items[key] = meta
+
+        manifest = json.dumps({"format": FORMAT_VERSION, "items": items}).encode()
+        segment = SharedMemory(name=name, create=True, size=len(manifest))
+        segment.buf[: len(manifest)] = manifest
+        segments[""] = segment
+    except BaseException:
+        for segment in segments.values():
+            segment.close()
+            segment.unlink()
+        raise
+
+    return _shared(name, segments, items, owner=True)
+
+
+def attach_shared(name: str) -> SharedArrays:
+    """Attaches the objects published by another process, as read-only views
+    over the shared memory.
+
+    ### Args:
+    * name (str) -- The name used to publish the objects.
+
+    ### Returns:
+    (SharedArrays) -- The published objects.
+    """
+    manifest = _attach_segment(name)
+    segments = {"": manifest}
+    try:
+        content = bytes(manifest.buf).rstrip(b"\x00")
+        meta = json.loads(content)
+        if meta.get("format") != FORMAT_VERSION:
+            raise ValueError(
+                "Shared memory '%s' uses an unsupported format version: %r"
+                % (name, meta.get("format"))
+            )
+        items: Dict[str, Dict[str, Any]] = meta["items"]
+        for key, item in items.items():
+            segments[key] = _attach_segment(item["segment"])
+    except BaseException:
+        for segment in segments.values():
+            segment.close()
+        raise
+
+    return _shared(name, segments, items, owner=False)
+
+
+def _shared(
+    name: str,
+    segments: Dict[str, SharedMemory],
+    items: Dict[str, Dict[str, Any]],
+    *,
+    owner: bool,
+) -> SharedArrays:
+    """Builds the objects over the shared memory segments."""
+    objects = {}
+    for key, item in items.items():
+        values = _view(segments[key], np.dtype(item["dtype"]), tuple(item["shape"]))
+        values.flags.writeable = False
+        objects[key] = _join_object(values, item)
+    return SharedArrays(name, segments, objects, owner=owner)
+
+
+def _view(segment: SharedMemory, dtype: np.dtype, shape: tuple) -> np.ndarray:
+    count = int(np.prod(shape))
+    return np.frombuffer(segment.buf, dtype=dtype, count=count).reshape(shape)
+
+
+def _attach_segment(name: str) -> SharedMemory:
+    """Opens an existing shared memory segment, without registering it in the
+    resource tracker: otherwise, the segment would be unlinked when the
+    worker process exits."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+
+    # the same as `track=False`, which isn't available before python 3.13
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = _untracked
+        try:
+            return SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _untracked(name: str, rtype: str):
+    pass
+
+
+def _split_object(obj: Any):
+    """Returns the values of an object, and the metadata needed to rebuild it."""
+    if isinstance(obj, np.ndarray):
+        values, meta = obj, {"kind": "numpy.ndarray"}
+    else:
+        pd = sys.modules.get("pandas")
+        if pd is not None and isinstance(obj, pd.Series):
+            values = obj.to_numpy()
+            meta = {
+                "kind": "pandas.Series",
+                "name": obj.name,
+                "index": _dump_index(obj.index),
+            }
+        elif pd is not None and isinstance(obj, pd.DataFrame):
+            values = obj.to_numpy()
+            meta = {
+                "kind": "pandas.DataFrame",
+                "index": _dump_index(obj.index),
+                "columns": _dump_index(obj.columns),
+            }
+        else:
+            raise TypeError(
+                "Object of type '%s' can't be published in shared memory" % type(obj)
+            )
+
+    if values.dtype.kind not in "biuf":
+        raise TypeError(
+            "Only numeric arrays can be published in shared memory, got dtype '%s'"
+            % values.dtype
+        )
+    return values, meta
+
+
+def _join_object(values: np.ndarray, meta: Dict[str, Any]) -> Any:
+    """Rebuilds an object over its values in shared memory."""
+    kind = meta["kind"]
+    if kind == "numpy.ndarray":
+        return values
+
+    import pandas as pd
+
+    index = _load_index(meta["index"])
+    if kind == "pandas.Series":
+        return pd.Series(values, index=index, name=meta["name"], copy=False)
+    columns = _load_index(meta["columns"])
+    return pd.DataFrame(values, index=index, columns=columns, copy=False)
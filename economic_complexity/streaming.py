@@ -0,0 +1,205 @@
+"""Streaming tidy output module
+
+Converting the matrices of the relatedness, the distance or the
+cross-relatedness to tidy format with `.unstack().reset_index()` holds both
+the wide and the long forms in memory at the same time. The functions in
+this module calculate these indicators a block of locations at a time, and
+stream each block as an Arrow RecordBatch, or write it as a row group of a
+Parquet file. Requires `pyarrow` (`pip install economic-complexity[arrow]`).
+
+```
+write_tidy("relatedness.parquet", df_rca, "relatedness", top=100)
+```
+"""
+
+import os
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Literal, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ._pandas import aligned, to_array
+from .numpy.cross_space import calculate_cross_relatedness
+from .numpy.product_space import (
+    calculate_distance,
+    calculate_proximity,
+    calculate_relatedness,
+)
+from .numpy.streaming import Calculation, TidyChunk, iter_tidy
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+Indicator = Literal["relatedness", "distance", "cross_relatedness"]
+
+
+def stream_tidy(
+    df_rca: pd.DataFrame,
+    indicator: Indicator,
+    *,
+    cutoff: float = 1,
+    proximities: Optional[pd.DataFrame] = None,
+    x_proximity: Optional[pd.DataFrame] = None,
+    chunksize: Optional[int] = None,
+    threshold: Optional[float] = None,
+    top: Optional[int] = None,
+) -> Iterator["pa.RecordBatch"]:
+    """Calculates an indicator for each location and activity, and yields
+    the result in tidy format, as an Arrow RecordBatch per block of locations.
+
+    The batches have three columns: the location, named after the index of
+    `df_rca` (or `"location"`), the activity, named after the columns of the
+    result (or `"activity"`), and the value, named after the `indicator`.
+    The labels are dictionary-encoded, so they are stored once per batch.
+
+    ### Args:
+    * df_rca (pd.DataFrame) -- A RCA matrix of pivotted values.
+    * indicator (str) -- The indicator to calculate: `"relatedness"`,
+        `"distance"` or `"cross_relatedness"`.
+
+    ### Keyword Args:
+    * cutoff (float, optional) -- Set the cutoff threshold value for the RCA
+        matrix. Default value: `1`.
+    * proximities (pd.DataFrame, optional) -- Matrix with the proximity
+        between the elements, for the relatedness and the distance. If not
+        provided, will be calculated using the "max" procedure, and the same
+        cutoff value for this call.
+    * x_proximity (pd.DataFrame, optional) -- The cross-proximity matrix,
+        required for the cross-relatedness.
+    * chunksize (int, optional) -- The amount of locations in each batch.
+        By default, as many locations as fit in about 32MB of wide values.
+    * threshold (float, optional) -- Only keep the cells with a value greater
+        or equal than this. Missing values are dropped too.
+    * top (int, optional) -- Only keep the `top` activities with the highest
+        values for each location. Missing values are dropped too.
+
+    ### Returns:
+    (Iterator[pyarrow.RecordBatch]) -- The cells of each block of locations.
+    """
+    labels, chunks = _chunks(
+        df_rca,
+        indicator,
+        cutoff=cutoff,
+        proximities=proximities,
+        x_proximity=x_proximity,
+        chunksize=chunksize,
+        threshold=threshold,
+        top=top,
+    )
+    for chunk in chunks:
+        yield _to_batch(chunk, *labels)
+
+
+def write_tidy(
+    path: Union[str, "os.PathLike[str]"],
+    df_rca: pd.DataFrame,
+    indicator: Indicator,
+    **kwargs,
+) -> Path:
+    """Calculates an indicator for each location and activity, and writes the
+    result in tidy format to a Parquet file, a row group per block of
+    locations.
+
+    Accepts the same arguments as `stream_tidy`.
+
+    ### Returns:
+    (Path) -- The path of the Parquet file.
+    """
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    labels, chunks = _chunks(df_rca, indicator, **kwargs)
+
+    # the schema is known beforehand, so the file is valid even without rows
+    empty = TidyChunk(*(np.empty(0, dtype=dtype) for dtype in (int, int, float)))
+    schema = _to_batch(empty, *labels).schema
+
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            writer.write_batch(_to_batch(chunk, *labels))
+
+    return path
+
+
+def _chunks(
+    df_rca: pd.DataFrame,
+    indicator: Indicator,
+    *,
+    cutoff: float = 1,
+    proximities: Optional[pd.DataFrame] = None,
+    x_proximity: Optional[pd.DataFrame] = None,
+    **kwargs,
+) -> Tuple[tuple, Iterator[TidyChunk]]:
+    """Returns the Arrow labels and column names of the result, and the
+    iterator over its blocks in tidy format."""
+    import pyarrow as pa
+
+    calculate, columns = _calculation(
+        df_rca, indicator, cutoff, proximities, x_proximity
+    )
+    labels = (
+        pa.array(df_rca.index.to_list()),
+        pa.array(columns.to_list()),
+        [df_rca.index.name or "location", columns.name or "activity", indicator],
+    )
+    chunks = iter_tidy(calculate, to_array(df_rca), n_columns=len(columns), **kwargs)
+    return labels, chunks
+
+
+def _calculation(
+    df_rca: pd.DataFrame,
+    indicator: Indicator,
+    cutoff: float,
+    proximities: Optional[pd.DataFrame],
+    x_proximity: Optional[pd.DataFrame],
+) -> Tuple[Calculation, pd.Index]:
+    """Returns the function that calculates the indicator for a block of rows
+    of the RCA matrix, and the labels of the columns of the result."""
+    if indicator == "cross_relatedness":
+        if x_proximity is None:
+            raise ValueError("The cross-relatedness requires the `x_proximity` matrix")
+        # cross-proximity rows must follow the order of the RCA columns
+        matrix = aligned(x_proximity, df_rca.columns)
+        return (
+            partial(calculate_cross_relatedness, x_proximity=matrix, cutoff=cutoff),
+            x_proximity.columns,
+        )
+
+    if indicator not in ("relatedness", "distance"):
+        raise ValueError("Indicator '%s' can't be streamed" % indicator)
+
+    # the proximities are calculated once, over all the locations
+    if proximities is None:
+        matrix = calculate_proximity(to_array(df_rca), cutoff=cutoff)
+        columns = df_rca.columns
+    else:
+        matrix = aligned(proximities, df_rca.columns)
+        columns = proximities.columns
+
+    if indicator == "relatedness":
+        function = calculate_relatedness
+    else:
+        function = calculate_distance
+    return partial(function, cutoff=cutoff, proximities=matrix), columns
+
+
+def _to_batch(
+    chunk: TidyChunk,
+    locations: "pa.Array",
+    activities: "pa.Array",
+    names: list,
+) -> "pa.RecordBatch":
+    """Converts a block of cells into a RecordBatch, with dictionary-encoded
+    labels."""
+    import pyarrow as pa
+
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.DictionaryArray.from_arrays(chunk.rows.astype(np.int32), locations),
+            pa.DictionaryArray.from_arrays(chunk.columns.astype(np.int32), activities),
+            pa.array(chunk.values),
+        ],
+        names=names,
+    )
@@ -4,6 +4,9 @@ from typing import Tuple
 
 import pandas as pd
 
+from ._pandas import reindexed, to_array
+from .numpy.subnational import calculate_complexity_subnational
+
 
 def complexity_subnational(
     df_rca: pd.DataFrame,
@@ -29,46 +32,13 @@ def complexity_subnational(
     ((pd.Series, pd.Series)) -- A tuple of ECI and PCI values using the subnational method.
     """
 
-    # This functions computes the ECI for a RCA matrix using an external PCI index.
-    geo_col_name = df_rca.index.name
-
-    # Create an empty Series to store the eci_external values
-    eci_external = pd.Series(dtype=float)
-
-    # Binarize rca input by converting values >= 1 to 1 and < 1 to 0
-    rcas = df_rca.ge(cutoff).astype(int)
-
-    # Drop rows or columns from rcas that are completely empty
-    rcas = rcas.dropna(how="all")
-    rcas = rcas.dropna(how="all", axis=1)
-
-    # Iterate over each row in the rca matrix
-    for index, row in rcas.iterrows():
-        # Create an empty DataFrame to store the selected categories
-        spec_cat = pd.DataFrame()
-
-        # Select the categories with an RCA of 1 for the current geography
-        spec_cat["value"] = row == 1
-        spec_cat = spec_cat[spec_cat["value"] == True]
-        spec_cat = spec_cat.index.values
-
-        # Retrieve the PCI values for the selected products from the external PCI matrix
-        pci_rca = pci_external[pci_external.index.isin(spec_cat)]
-
-        # Compute the ECI for the current country using the retrieved PCI values
-        eci = pci_rca.sum() / len(pci_rca)
-
-        # Append the ECI value to the eci_external DataFrame
-        eci_external = pd.concat(
-            [eci_external, pd.Series({index: eci})],
-            axis=0,
-            ignore_index=False,
-        )
-
-    if standardize == True:
-        # Standardize the ECI values by subtracting the mean and dividing by the standard deviation
-        eci_external = (eci_external - eci_external.mean()) / eci_external.std()
-
-    eci_external.index.name = geo_col_name
+    # Activities without an external PCI are ignored
+    eci_external, _ = calculate_complexity_subnational(
+        to_array(df_rca),
+        reindexed(pci_external, df_rca.columns),
+        cutoff=cutoff,
+        standardize=standardize,
+    )
+    eci_external = pd.Series(eci_external, index=df_rca.index)
 
     return eci_external, pci_external
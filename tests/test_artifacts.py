@@ -0,0 +1,82 @@
+from datetime import date
+
+import pandas as pd
+import polars as pl
+import pytest
+
+import economic_complexity as ec
+import economic_complexity.polars as ecp
+
+
+def test_save_load_dataframe(tmp_path, df_rca):
+    prox = ec.proximity(df_rca)
+    ec.save_artifact(tmp_path / "prox", prox, params={"cutoff": 1})
+
+    loaded = ec.load_artifact(tmp_path / "prox")
+    pd.testing.assert_frame_equal(loaded, prox, check_index_type=False)
+    # memory-mapped arrays are opened read-only, copies would be writeable
+    assert not loaded.to_numpy().flags.writeable
+
+    meta = ec.artifacts.read_metadata(tmp_path / "prox")
+    assert meta["kind"] == "pandas.DataFrame"
+    assert meta["params"] == {"cutoff": 1}
+
+
+def test_save_load_tuple(tmp_path, df_rca):
+    eci, pci = ec.complexity(df_rca)
+    ec.save_artifact(tmp_path / "complexity", (eci, pci))
+
+    eci_loaded, pci_loaded = ec.load_artifact(tmp_path / "complexity", mmap=False)
+    pd.testing.assert_series_equal(eci_loaded, eci, check_index_type=False)
+    pd.testing.assert_series_equal(pci_loaded, pci, check_index_type=False)
+
+
+def test_save_load_polars(tmp_path, df_global_exports):
+    df = pl.from_pandas(df_global_exports)
+    rca = ecp.rca(
+        df, activity="Section ID", location="Country ID", measure="Trade Value"
+    ).collect()
+    ec.save_artifact(tmp_path / "rca", rca)
+
+    loaded = ec.load_artifact(tmp_path / "rca")
+    assert loaded.equals(rca)
+
+
+def test_save_load_polars_dtypes(tmp_path):
+    df = pl.DataFrame(
+        {
+            "date": [date(2020, 1, 1), None, date(2021, 6, 30)],
+            "count": pl.Series([1, None, 3], dtype=pl.Int64),
+            "share": [0.5, None, float("nan")],
+            "label": pl.Series(["a", "b", None], dtype=pl.Categorical),
+        }
+    )
+    ec.save_artifact(tmp_path / "frame", df)
+
+    loaded = ec.load_artifact(tmp_path / "frame")
+    assert loaded.schema == df.schema
+    assert loaded.equals(df)
+
+
+def test_input_hash_rejects_unknown_objects():
+    assert ec.artifacts.input_hash(cutoff=1) == ec.artifacts.input_hash(cutoff=1)
+    assert ec.artifacts.input_hash(pl.DataFrame({"year": [date(2020, 1, 1)]}))
+
+    with pytest.raises(TypeError):
+        ec.artifacts.input_hash(data=object())
+
+
+def test_cached_artifact(tmp_path, df_rca):
+    calls = []
+
+    def counted(df, **kwargs):
+        calls.append(kwargs)
+        return ec.proximity(df, **kwargs)
+
+    first = ec.cached_artifact(tmp_path / "prox", counted, df_rca, cutoff=1)
+    second = ec.cached_artifact(tmp_path / "prox", counted, df_rca, cutoff=1)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second, check_index_type=False)
+
+    ec.cached_artifact(tmp_path / "prox", counted, df_rca, cutoff=2)
+    assert len(calls) == 2
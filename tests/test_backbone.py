@@ -0,0 +1,74 @@
+import numpy as np
+import polars as pl
+
+import economic_complexity as ec
+import economic_complexity.numpy as ecn
+import economic_complexity.polars as ecp
+
+from .conftest import activity, location, measure
+
+
+def _spanning_tree_weight(weights: np.ndarray) -> float:
+    """Kruskal's algorithm, as a reference for the backbone."""
+    n = len(weights)
+    rows, cols = np.triu_indices(n, k=1)
+    order = np.argsort(-weights[rows, cols], kind="stable")
+    parents = list(range(n))
+
+    def find(node):
+        while parents[node] != node:
+            node = parents[node]
+        return node
+
+    total = 0.0
+    for i, j in zip(rows[order], cols[order]):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parents[root_i] = root_j
+            total += weights[i, j]
+    return total
+
+
+def test_backbone(df_rca):
+    prox = ecn.proximity(df_rca.to_numpy())
+    edges, weights = ecn.backbone(prox)
+
+    n = len(prox)
+    assert edges.shape == (n - 1, 2)
+    assert (edges[:, 0] < edges[:, 1]).all()
+    assert np.allclose(weights, prox[edges[:, 0], edges[:, 1]])
+    assert np.isclose(weights.sum(), _spanning_tree_weight(prox))
+
+    edges, weights = ecn.backbone(prox, threshold=0.5, max_links=10)
+    extra = weights[n - 1 :]
+    assert len(extra) <= 10
+    assert (extra >= 0.5).all() and (np.diff(extra) <= 0).all()
+    assert len({tuple(edge) for edge in edges.tolist()}) == len(edges)
+
+
+def test_backbone_disconnected():
+    prox = np.array(
+        [
+            [0, 0.5, np.nan, np.nan],
+            [0.5, 0, np.nan, np.nan],
+            [np.nan, np.nan, 0, 0.2],
+            [np.nan, np.nan, 0.2, 0],
+        ]
+    )
+    edges, weights = ecn.backbone(prox)
+    assert edges.tolist() == [[0, 1], [2, 3]]
+    assert weights.tolist() == [0.5, 0.2]
+
+
+def test_backbone_wrappers(df_global_exports, df_rca):
+    res = ec.backbone(ec.proximity(df_rca), threshold=0.6)
+    assert list(res.columns) == ["source", "target", "proximity"]
+
+    df = pl.from_pandas(df_global_exports)
+    res_pl = ecp.run(
+        "backbone", df, activity=activity, location=location, measure=measure
+    )
+    assert res_pl.columns == [activity, f"{activity}_right", "Proximity"]
+    assert np.isclose(
+        res_pl["Proximity"].sum(), ec.backbone(ec.proximity(df_rca))["proximity"].sum()
+    )
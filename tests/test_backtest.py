@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import economic_complexity as ec
+from economic_complexity.numpy.backtest import (
+    backtest_period,
+    calculate_backtest,
+    precision_at_k,
+    rank_auc,
+    transitions,
+)
+
+
+def _pairwise_auc(scores, positives):
+    pos = scores[positives]
+    neg = scores[~positives]
+    if len(pos) == 0 or len(neg) == 0:
+        return np.nan
+    diff = pos[:, np.newaxis] - neg[np.newaxis, :]
+    return ((diff > 0).sum() + 0.5 * (diff == 0).sum()) / diff.size
+
+
+def test_rank_auc_matches_pairwise():
+    rng = np.random.default_rng(7)
+    # rounded values, so there are ties
+    scores = np.round(rng.random((20, 15)), 1)
+    positives = rng.random((20, 15)) < 0.3
+    valid = rng.random((20, 15)) < 0.8
+
+    result = rank_auc(scores, positives, valid)
+    expected = [
+        _pairwise_auc(row[mask], pos[mask])
+        for row, pos, mask in zip(scores, positives, valid)
+    ]
+    np.testing.assert_allclose(result, expected)
+
+
+def test_precision_at_k():
+    scores = np.array([[0.9, 0.8, 0.1, 0.5], [0.1, 0.2, 0.3, 0.4]])
+    positives = np.array([[True, False, False, True], [False, False, False, False]])
+    valid = np.array([[True, True, True, True], [True, False, False, False]])
+
+    result = precision_at_k(scores, positives, valid, 2)
+    np.testing.assert_allclose(result, [0.5, 0.0])
+
+
+def test_backtest_perfect_predictor(df_rca):
+    rcas_start = df_rca.to_numpy(dtype=float)
+    absent = rcas_start < 1
+
+    # the locations enter the absent activities with the highest scores
+    rng = np.random.default_rng(3)
+    scores = rng.random(rcas_start.shape)
+    rcas_end = rcas_start.copy()
+    rcas_end[absent & (scores > 0.9)] = 2.0
+
+    result = backtest_period(rcas_start, rcas_end, scores, k=3, chunksize=17)
+    assert result.entry_auc == 1.0
+    assert result.entries == (absent & (scores > 0.9)).sum()
+    assert result.exits == 0
+    assert np.isnan(result.exit_auc)
+    assert np.nanmin(result.auc_by_location) == 1.0
+
+
+def test_backtest_chunks(df_rca):
+    rng = np.random.default_rng(5)
+    rcas = df_rca.to_numpy(dtype=float)
+    panel = np.stack([rcas * rng.lognormal(0, 0.5, rcas.shape) for _ in range(4)])
+    panel[1, :5, :5] = np.nan
+
+    full = calculate_backtest(panel, horizon=2, k=5)
+    chunked = calculate_backtest(panel, horizon=2, k=5, chunksize=7, max_workers=2)
+    assert len(full) == 2
+    for a, b in zip(full, chunked):
+        assert a.entry_auc == pytest.approx(b.entry_auc)
+        assert a.exit_auc == pytest.approx(b.exit_auc)
+        assert (a.entries, a.exits) == (b.entries, b.exits)
+        np.testing.assert_allclose(a.auc_by_location, b.auc_by_location)
+        np.testing.assert_allclose(a.precision_at_k, b.precision_at_k)
+
+    # the pairs missing in either period are excluded
+    absent, entries, present, exits = transitions(panel[0], panel[2])
+    assert full[0].entries == entries.sum()
+    assert full[0].exits == exits.sum()
+
+    with pytest.raises(ValueError):
+        calculate_backtest(panel, horizon=4)
+
+
+def test_backtest_pandas(df_rca):
+    rng = np.random.default_rng(11)
+    rcas = {
+        2000 + i: df_rca * rng.lognormal(0, 0.5, df_rca.shape) for i in range(3)
+    }
+    # a location missing in the last period
+    rcas[2002] = rcas[2002].iloc[1:]
+
+    result = ec.backtest(rcas, k=5)
+    assert list(result.summary.index) == [2000, 2001]
+    assert list(result.summary.columns) == [
+        "entry_auc",
+        "exit_auc",
+        "entries",
+        "exits",
+        "precision_at_k",
+    ]
+    assert result.auc.columns.equals(df_rca.index)
+    assert np.isnan(result.auc.iloc[1, 0])
+
+    expected = calculate_backtest(
+        np.stack([df.reindex(df_rca.index).to_numpy() for df in rcas.values()]),
+        k=5,
+    )
+    assert result.summary["entry_auc"].tolist() == pytest.approx(
+        [item.entry_auc for item in expected]
+    )
+    np.testing.assert_allclose(
+        result.precision.to_numpy(), [item.precision_at_k for item in expected]
+    )
+
+    scores = {
+        period: pd.DataFrame(0.5, index=df.index, columns=df.columns)
+        for period, df in rcas.items()
+    }
+    flat = ec.backtest(rcas, scores, k=5)
+    assert flat.summary["entry_auc"].tolist() == [0.5, 0.5]
@@ -0,0 +1,68 @@
+import numpy as np
+import polars as pl
+import pytest
+
+import economic_complexity.polars as ecp
+from economic_complexity.cli import main
+
+params = {"activity": "Section ID", "location": "Country ID", "measure": "Trade Value"}
+arguments = [
+    "--activity", "Section ID",
+    "--location", "Country ID",
+    "--measure", "Trade Value",
+]  # fmt: skip
+
+
+@pytest.fixture
+def inputs(tmp_path, df_global_exports):
+    df = pl.from_pandas(df_global_exports)
+    for year, factor in ((2020, 1.0), (2021, 1.5)):
+        df.with_columns(
+            pl.lit(year).alias("Year"), pl.col("Trade Value") * factor
+        ).write_parquet(tmp_path / ("exports_%d.parquet" % year))
+    return tmp_path
+
+
+def test_cli_by_period(inputs, capsys):
+    output = inputs / "out"
+    status = main(
+        [str(inputs / "*.parquet"), *arguments, "--period", "Year"]
+        + ["--models", "eci", "proximity", "-o", str(output)]
+        + ["--workers", "1", "--profile"]
+    )
+    assert status == 0
+
+    data = pl.scan_parquet(inputs / "*.parquet")
+    for year in (2020, 2021):
+        expected = ecp.run("eci", data.filter(pl.col("Year") == year), **params)
+        result = pl.read_parquet(output / "eci" / ("%d.parquet" % year))
+        assert result.equals(expected)
+        assert (output / "proximity" / ("%d.npy" % year)).exists()
+
+    profile = capsys.readouterr().err
+    assert "eci/2020" in profile
+    assert "peak memory" in profile
+
+
+def test_cli_without_period(inputs):
+    output = inputs / "out"
+    path = str(inputs / "exports_2020.parquet")
+    status = main(
+        [path, *arguments, "--models", "pci", "-o", str(output), "--format", "csv"]
+        + ["--workers", "1"]
+    )
+    assert status == 0
+
+    expected = ecp.run("pci", pl.scan_parquet(path), **params)
+    result = pl.read_csv(output / "pci.csv")
+    assert np.allclose(result["Trade Value PCI"], expected["Trade Value PCI"])
+
+
+def test_cli_errors(inputs, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        main([str(inputs / "*.csv"), *arguments, "--models", "eci", "-o", "out"])
+    assert exc_info.value.code == 2
+    assert "No input files" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit):
+        main([str(inputs), *arguments, "--models", "unknown", "-o", "out"])
@@ -6,3 +6,50 @@ def test_complexity(df_rca):
 
     assert eci.size == 226
     assert pci.size == 21
+
+
+def test_complexity_tolerance(df_rca):
+    eci, pci = ec.complexity(df_rca)
+    eci_state, pci_state, state = ec.complexity(df_rca, return_state=True)
+
+    assert eci.equals(eci_state)
+    assert pci.equals(pci_state)
+    assert state.iterations == 20
+    assert not state.converged
+
+    _, _, state = ec.complexity(df_rca, iterations=500, tol=1e-8, return_state=True)
+
+    assert state.converged
+    assert state.iterations < 500
+    assert state.kc.index.equals(eci.index)
+    assert state.kp.index.equals(pci.index)
+
+
+def test_complexity_warm_start(df_rca):
+    eci, pci, state = ec.complexity(
+        df_rca, iterations=500, tol=1e-8, return_state=True
+    )
+    eci_warm, pci_warm, state_warm = ec.complexity(
+        df_rca,
+        iterations=500,
+        tol=1e-8,
+        initial=(state.kc, state.kp),
+        return_state=True,
+    )
+
+    assert state_warm.converged
+    assert state_warm.iterations < state.iterations
+    assert (eci - eci_warm).abs().max() < 1e-5
+    assert (pci - pci_warm).abs().max() < 1e-5
+
+    # the vectors are aligned by label
+    initial = (state.kc.iloc[::-1], state.kp.iloc[::-1])
+    eci_shuffled, _ = ec.complexity(df_rca, iterations=500, tol=1e-8, initial=initial)
+    assert (eci_warm - eci_shuffled).abs().max() < 1e-12
+
+    for engine in ("sparse", "blocked"):
+        eci_engine, pci_engine = ec.complexity(
+            df_rca, iterations=500, tol=1e-8, initial=initial, engine=engine
+        )
+        assert (eci_warm - eci_engine).abs().max() < 1e-9
+        assert (pci_warm - pci_engine).abs().max() < 1e-9
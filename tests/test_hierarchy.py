@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import economic_complexity as ec
+import economic_complexity.numpy as ecn
+
+from .conftest import activity, location, measure
+
+
+@pytest.fixture
+def df_tbl(df_global_exports):
+    return df_global_exports.pivot(index=location, columns=activity, values=measure)
+
+
+def test_aggregate():
+    tbl = np.arange(12, dtype=float).reshape(3, 4)
+    tbl[0, 0] = np.nan
+
+    rows = np.array([1, 0, 1])
+    columns = np.array([0, 2, 0, 2])
+    result = ecn.aggregate(tbl, rows=rows, columns=columns)
+
+    expected = np.zeros((2, 3))
+    np.add.at(expected, (rows[:, None], columns[None, :]), np.nan_to_num(tbl))
+    np.testing.assert_array_equal(result, expected)
+
+    with pytest.raises(ValueError):
+        ecn.aggregate(tbl, rows=np.array([0, 1]))
+
+
+def test_rollup_base_level(df_tbl):
+    levels = ec.rollup(df_tbl)
+    assert list(levels) == [("base", "base")]
+
+    level = levels[("base", "base")]
+    eci, pci = ec.complexity(ec.rca(df_tbl))
+    pd.testing.assert_frame_equal(level.rca, ec.rca(df_tbl.fillna(0)))
+    pd.testing.assert_series_equal(level.eci, eci, check_names=False)
+    pd.testing.assert_series_equal(level.pci, pci, check_names=False)
+
+
+def test_rollup_levels(df_global_exports, df_tbl):
+    df = df_global_exports
+    sections = pd.Series(df_tbl.columns % 3, index=df_tbl.columns, name="Group")
+    regions = pd.Series(df_tbl.index.str[0], index=df_tbl.index, name="Region")
+
+    levels = ec.rollup(
+        df_tbl,
+        locations={"country": None, "region": regions},
+        activities={"section": None, "group": sections},
+    )
+    assert set(levels) == {
+        ("country", "section"),
+        ("country", "group"),
+        ("region", "section"),
+        ("region", "group"),
+    }
+
+    df = df.assign(
+        Region=df[location].map(regions),
+        Group=df[activity].map(sections),
+    )
+    tbl = df.pivot_table(index="Region", columns="Group", values=measure, aggfunc="sum")
+    level = levels[("region", "group")]
+    pd.testing.assert_frame_equal(level.tbl, tbl, check_names=False, check_dtype=False)
+    pd.testing.assert_frame_equal(level.rca, ec.rca(tbl), check_names=False)
+
+    eci, pci = ec.complexity(ec.rca(tbl))
+    pd.testing.assert_series_equal(level.eci, eci, check_names=False)
+    pd.testing.assert_series_equal(level.pci, pci, check_names=False)
+
+    with pytest.raises(ValueError):
+        ec.rollup(df_tbl, locations={"region": regions.iloc[1:]})
@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import polars as pl
+import pytest
+
+import economic_complexity.polars as ecp
+from economic_complexity.artifacts import load_artifact, read_metadata
+
+params = {"activity": "Section ID", "location": "Country ID", "measure": "Trade Value"}
+
+
+@pytest.fixture
+def df(df_global_exports):
+    return pl.from_pandas(df_global_exports)
+
+
+def test_jobs_match_run(df):
+    jobs = [ecp.Job(model, model, df, **params) for model in ("eci", "relatedness")]
+
+    with ThreadPoolExecutor(2) as pool:
+        results = {item.job.name: item for item in ecp.run_jobs(jobs, executor=pool)}
+
+    assert all(item.ok for item in results.values())
+    for model in ("eci", "relatedness"):
+        expected = ecp.run(model, df, **params)
+        assert results[model].result.equals(expected)
+        assert set(results[model].timings) == {"rca", model}
+
+
+def test_jobs_are_grouped_by_input(df, monkeypatch):
+    from economic_complexity.polars import jobs as jobs_module
+
+    calls = []
+    original = jobs_module._run_group
+    monkeypatch.setattr(
+        jobs_module, "_run_group", lambda group: calls.append(group) or original(group)
+    )
+
+    jobs = [
+        ecp.Job("eci", "eci", df, **params),
+        ecp.Job("pci", "pci", df, **params),
+        ecp.Job("binary", "rca", df, binary=True, **params),
+    ]
+    with ThreadPoolExecutor(2) as pool:
+        results = ecp.run_jobs(jobs, executor=pool)
+
+    assert len(results) == 3
+    assert sorted(len(group) for group in calls) == [1, 2]
+
+
+def test_jobs_binary_with_cutoff(df):
+    jobs = [
+        ecp.Job("eci", "eci", df, binary=True, cutoff=1.5, **params),
+        ecp.Job("expected", "eci", df, cutoff=1.5, **params),
+    ]
+    with ThreadPoolExecutor(2) as pool:
+        results = {item.job.name: item for item in ecp.run_jobs(jobs, executor=pool)}
+
+    assert results["eci"].ok
+    assert results["eci"].result.equals(results["expected"].result)
+
+
+def test_jobs_report_errors_and_write_artifacts(df, tmp_path):
+    jobs = [
+        ecp.Job("eci", "eci", df, **params),
+        ecp.Job("broken", "eci", df, filters={"Year": 1}, **params),
+    ]
+    seen = []
+    with ThreadPoolExecutor(2) as pool:
+        results = ecp.run_jobs(
+            jobs, executor=pool, output=tmp_path, on_result=seen.append
+        )
+
+    assert len(seen) == 2
+    by_name = {item.job.name: item for item in results}
+    assert not by_name["broken"].ok
+    assert by_name["broken"].path is None
+
+    assert by_name["eci"].path == tmp_path / "eci"
+    loaded = load_artifact(tmp_path / "eci", mmap=False)
+    assert np.allclose(
+        loaded["Trade Value ECI"].to_numpy(),
+        by_name["eci"].result["Trade Value ECI"].to_numpy(),
+    )
+    assert read_metadata(tmp_path / "eci")["params"]["model"] == "eci"
+
+
+def test_jobs_require_unique_names(df):
+    jobs = [ecp.Job("eci", "eci", df, **params), ecp.Job("eci", "pci", df, **params)]
+    with pytest.raises(ValueError):
+        ecp.run_jobs(jobs)
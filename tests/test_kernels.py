@@ -0,0 +1,128 @@
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from economic_complexity.numpy import _kernels
+
+pytest.importorskip("numba")
+
+
+@pytest.fixture
+def rcas():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(0, 1, size=(60, 25))
+    values[:, 3] = 0  # an activity without locations
+    values[5] = 0  # a location without activities
+    values[rng.random(values.shape) < 0.05] = np.nan
+    return values
+
+
+def _both(func, *args, **kwargs):
+    """Returns the result of a kernel with the numpy and the numba paths."""
+    enabled = _kernels.ENABLED
+    try:
+        _kernels.ENABLED = False
+        expected = func(*args, **kwargs)
+        _kernels.ENABLED = True
+        result = func(*args, **kwargs)
+    finally:
+        _kernels.ENABLED = enabled
+    return expected, result
+
+
+@pytest.mark.parametrize("sqrt", [False, True])
+def test_proximity_ratio(rcas, sqrt):
+    mcp = np.greater_equal(rcas, 1).astype(float)
+    expected, result = _both(
+        _kernels.proximity_ratio, mcp.T.dot(mcp), mcp.sum(axis=0), sqrt=sqrt
+    )
+    np.testing.assert_allclose(result, expected, atol=1e-12, equal_nan=True)
+
+
+def test_cross_minimum(rcas):
+    mcp_a = np.greater_equal(rcas, 1).astype(float)
+    mcp_b = np.greater_equal(rcas[:, ::-1], 0.5).astype(float)
+    expected, result = _both(
+        _kernels.cross_minimum,
+        mcp_a.T.dot(mcp_b),
+        mcp_a.sum(axis=0),
+        mcp_b.sum(axis=0),
+    )
+    np.testing.assert_allclose(result, expected, atol=1e-12, equal_nan=True)
+
+
+@pytest.mark.parametrize("cutoff", [0, 1])
+def test_masked_zscore(rcas, cutoff):
+    values = np.nan_to_num(rcas) / 10
+    expected, result = _both(_kernels.masked_zscore, values, rcas, cutoff)
+    np.testing.assert_allclose(result, expected, atol=1e-12, equal_nan=True)
+
+
+def test_masked_mean(rcas):
+    pci = np.linspace(-2, 2, rcas.shape[1])
+    pci[[0, 7]] = np.nan
+    expected, result = _both(_kernels.masked_mean, rcas, pci, 1)
+    np.testing.assert_allclose(result, expected, atol=1e-12, equal_nan=True)
+
+
+def test_kernels_in_threads(rcas):
+    mcp = np.greater_equal(rcas, 1).astype(float)
+    expected = _kernels.proximity_ratio(mcp.T.dot(mcp), mcp.sum(axis=0))
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                _kernels.proximity_ratio(mcp.T.dot(mcp), mcp.sum(axis=0))
+            )
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 4
+    for result in results:
+        np.testing.assert_allclose(result, expected, atol=1e-12, equal_nan=True)
+
+
+_VARIANT_SCRIPT = """
+import sys
+import numba
+import numpy as np
+from economic_complexity.numpy import _numba
+
+for name in sys.argv[1:]:
+    kernel = getattr(_numba, name).masked_mean
+    kernel(np.ones((4, 3)), np.ones(3), 1.0)
+    try:
+        layer = numba.threading_layer()
+    except ValueError:
+        layer = None
+    print(name, sum(kernel.stats.cache_hits.values()), layer is not None)
+"""
+
+
+def test_compiled_variants_cached_separately(tmp_path):
+    def run(*variants):
+        result = subprocess.run(
+            [sys.executable, "-c", _VARIANT_SCRIPT, *variants],
+            capture_output=True,
+            check=True,
+            cwd=Path(__file__).parent.parent,
+            env={**os.environ, "NUMBA_CACHE_DIR": str(tmp_path)},
+            text=True,
+        )
+        return result.stdout.split("\n")[0]
+
+    run("parallel", "serial")
+    # loaded from the cache, only the parallel build starts the threading layer
+    assert run("serial") == "serial 1 False"
+    assert run("parallel") == "parallel 1 True"
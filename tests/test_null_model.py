@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import economic_complexity as ec
+from economic_complexity.numpy.null_model import (
+    calculate_proximity_significance,
+    curveball,
+    merge_null_partials,
+    null_partials,
+)
+
+
+def test_curveball_preserves_degrees(df_rca):
+    mcp = df_rca.to_numpy() >= 1
+    rng = np.random.default_rng(0)
+
+    result = curveball(mcp, rng, steps=10)
+    assert result.dtype == bool
+    assert (result != mcp).any()
+    np.testing.assert_array_equal(result.sum(axis=0), mcp.sum(axis=0))
+    np.testing.assert_array_equal(result.sum(axis=1), mcp.sum(axis=1))
+
+
+def test_curveball_is_uniform():
+    # the only two matrices with these degrees are the identity and its mirror
+    mcp = np.eye(2, dtype=bool)
+    rng = np.random.default_rng(1)
+
+    diagonal = sum(curveball(mcp, rng)[0, 0] for _ in range(2000))
+    assert 900 < diagonal < 1100
+
+
+def test_null_partials_merge():
+    rng = np.random.default_rng(2)
+    mcp = rng.random((40, 8)) < 0.4
+
+    partials = null_partials(mcp, 5, samples=30, burn_in=5, thin=2)
+    assert partials.samples == 30
+    np.testing.assert_array_equal(np.diag(partials.total), 30 * mcp.sum(axis=0))
+    np.testing.assert_array_equal(partials.exceedances.diagonal(), 30)
+
+    merged = merge_null_partials(partials, partials)
+    assert merged.samples == 60
+    np.testing.assert_array_equal(merged.squares, 2 * partials.squares)
+
+
+def test_significance_is_reproducible():
+    rng = np.random.default_rng(3)
+    rcas = rng.lognormal(0, 1, (60, 12))
+    # two activities that always appear together
+    rcas[:, 1] = rcas[:, 0]
+
+    kwargs = dict(samples=120, batchsize=25, burn_in=10, thin=2, seed=42)
+    with ThreadPoolExecutor(1) as executor:
+        serial = calculate_proximity_significance(rcas, executor=executor, **kwargs)
+    with ThreadPoolExecutor(3) as executor:
+        parallel = calculate_proximity_significance(rcas, executor=executor, **kwargs)
+
+    assert serial.samples == 120
+    for a, b in zip(serial, parallel):
+        np.testing.assert_array_equal(a, b)
+
+    np.testing.assert_allclose(serial.proximity, ec.numpy.proximity(rcas))
+    assert np.isnan(serial.zscores.diagonal()).all()
+    assert serial.zscores[0, 1] > 3
+    assert serial.pvalues[0, 1] == 1 / 121
+    np.testing.assert_allclose(serial.zscores, serial.zscores.T)
+
+
+def test_significance_pandas(df_rca):
+    result = ec.proximity_significance(
+        df_rca, samples=40, batchsize=20, burn_in=5, seed=0, max_workers=2
+    )
+    assert result.samples == 40
+    assert result.zscores.index.equals(df_rca.columns)
+    assert result.pvalues.columns.equals(df_rca.columns)
+    np.testing.assert_allclose(
+        result.proximity.to_numpy(), ec.proximity(df_rca).to_numpy()
+    )
@@ -0,0 +1,85 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+import economic_complexity as ec
+import economic_complexity.numpy as ecn
+
+
+def test_import_is_lazy():
+    code = "import sys, economic_complexity; print('pandas' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+        text=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_complexity(df_rca):
+    eci, pci = ecn.complexity(df_rca.to_numpy())
+    eci_pd, pci_pd = ec.complexity(df_rca)
+    assert np.allclose(eci, eci_pd.to_numpy())
+    assert np.allclose(pci, pci_pd.to_numpy())
+
+
+def test_proximity(df_rca):
+    prox = ecn.proximity(df_rca.to_numpy())
+    assert prox.shape == (21, 21)
+    assert np.allclose(prox, prox.T)
+    assert np.all(np.diag(prox) == 0)
+
+
+def test_relatedness(df_rca):
+    relt = ecn.relatedness(df_rca.to_numpy())
+    assert np.allclose(relt, ec.relatedness(df_rca).to_numpy())
+
+
+def test_out_buffers(df_rca):
+    rcas = df_rca.to_numpy()
+    prox = np.empty((21, 21))
+    relt = np.empty((226, 21))
+
+    result = ecn.proximity(rcas, out=prox)
+    assert result is prox
+    result = ecn.relatedness(rcas, proximities=prox, out=relt)
+    assert result is relt
+    assert np.allclose(relt, ecn.relatedness(rcas))
+
+    eci, pci = np.empty(226), np.empty(21)
+    ecn.complexity(rcas, out=(eci, pci))
+    assert np.allclose(pci, ecn.complexity(rcas)[1])
+
+    # Fortran-ordered buffers are written in place too
+    relt_f = np.empty((226, 21), order="F")
+    for engine in ("dense", "blocked"):
+        result = ecn.relatedness(rcas, proximities=prox, out=relt_f, engine=engine)
+        assert result is relt_f
+        assert np.allclose(relt_f, relt, equal_nan=True)
+
+
+def test_integer_codes(df_global_exports):
+    locations, loc_codes = ecn.encode(df_global_exports["Country ID"])
+    activities, act_codes = ecn.encode(df_global_exports["Section ID"])
+    tbl = ecn.pivot(df_global_exports["Trade Value"].to_numpy(), loc_codes, act_codes)
+    assert tbl.shape == (len(locations), len(activities))
+
+    rcas = ecn.rca(tbl)
+    pivoted = df_global_exports.pivot(
+        index="Country ID", columns="Section ID", values="Trade Value"
+    )
+    expected = ec.rca(pivoted).to_numpy()
+    assert np.allclose(rcas, expected)
+
+    # reorder the proximity matrix through the label codes
+    prox = ecn.proximity(rcas)
+    shuffled = activities[::-1]
+    positions = ecn.indexer(activities, shuffled)
+    reordered = ecn.take(ecn.take(prox, positions, axis=0), positions, axis=1)
+    back = ecn.indexer(shuffled, activities)
+    restored = ecn.take(ecn.take(reordered, back, axis=0), back, axis=1)
+    assert np.array_equal(restored, prox)
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import economic_complexity as ec
+import economic_complexity.numpy as ecn
+from economic_complexity.numpy.planner import memory_budget, parse_bytes
+
+
+@pytest.fixture
+def small_budget():
+    ecn.set_memory_budget("40KB")
+    yield
+    ecn.set_memory_budget(None)
+
+
+def test_plan():
+    assert parse_bytes("24GB") == 24 * 2**30
+    assert parse_bytes("1.5 M") == int(1.5 * 2**20)
+    with pytest.raises(ValueError):
+        parse_bytes("lots")
+
+    plan = ecn.plan("proximity", (8000, 5000), budget=2**40)
+    assert plan.engine == "dense"
+    assert plan.fits
+    assert set(plan.estimates) == {"dense", "blocked"}
+
+    # many locations and few activities: blocks of locations fit
+    plan = ecn.plan("proximity", (500_000, 1000), budget=2**30)
+    assert plan.engine == "blocked"
+    assert plan.estimates["dense"] > 2**30 >= plan.peak_bytes
+
+    # the sparse strategy depends on the density
+    plan = ecn.plan("complexity", (500_000, 5000), density=0.01, budget=2**30)
+    assert plan.engine == "sparse"
+    plan = ecn.plan("complexity", (500_000, 5000), density=0.5, budget=2**30)
+    assert plan.engine == "blocked"
+
+    # the result doesn't fit, so the strategy with the lowest estimate is used
+    plan = ecn.plan("similarity", (500_000, 5000), budget=2**30)
+    assert plan.engine == "blocked"
+    assert not plan.fits
+
+    with pytest.raises(ValueError):
+        ecn.plan("proximity", (10, 10), engine="sparse")
+
+
+def test_memory_budget(small_budget):
+    assert memory_budget() == 40 * 2**10
+    assert ecn.plan("complexity", (226, 21)).budget == 40 * 2**10
+
+
+@pytest.mark.parametrize("engine", ["sparse", "blocked"])
+def test_complexity_engines(df_rca, engine):
+    eci, pci = ec.complexity(df_rca, engine="dense")
+    eci_engine, pci_engine = ec.complexity(df_rca, engine=engine)
+    pd.testing.assert_series_equal(eci_engine, eci)
+    pd.testing.assert_series_equal(pci_engine, pci)
+
+
+def test_blocked_engines(df_rca):
+    rcas = df_rca.to_numpy()
+    blocked = {"engine": "blocked"}
+
+    np.testing.assert_allclose(
+        ecn.proximity(rcas, **blocked), ecn.proximity(rcas, engine="dense")
+    )
+    np.testing.assert_allclose(
+        ecn.relatedness(rcas, **blocked), ecn.relatedness(rcas, engine="dense")
+    )
+    np.testing.assert_allclose(
+        ecn.similarity(rcas, **blocked), ecn.similarity(rcas, engine="dense")
+    )
+    np.testing.assert_allclose(
+        ecn.cross_proximity(rcas, rcas[:, :10], **blocked),
+        ecn.cross_proximity(rcas, rcas[:, :10], engine="dense"),
+    )
+
+
+def test_auto_engine(df_rca, small_budget, caplog):
+    with caplog.at_level("DEBUG", logger="economic_complexity.numpy.planner"):
+        proximity = ec.proximity(df_rca)
+    assert "blocked engine" in caplog.text
+
+    ecn.set_memory_budget(None)
+    pd.testing.assert_frame_equal(proximity, ec.proximity(df_rca, engine="dense"))
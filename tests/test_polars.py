@@ -0,0 +1,241 @@
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+import economic_complexity as ec
+import economic_complexity.polars as ecp
+from economic_complexity.polars._matrix import empty_matrix, from_matrix, to_matrix
+
+params = {"activity": "Section ID", "location": "Country ID", "measure": "Trade Value"}
+
+
+def _to_dict(df: pl.DataFrame, key: str, value: str):
+    return dict(zip(df[key].to_list(), df[value].to_list()))
+
+
+def test_complexity_matches_pandas(df_global_exports, df_rca):
+    df = pl.from_pandas(df_global_exports)
+    eci, pci = ec.complexity(df_rca)
+
+    res_eci = _to_dict(ecp.run("eci", df, **params), "Country ID", "Trade Value ECI")
+    res_pci = _to_dict(ecp.run("pci", df, **params), "Section ID", "Trade Value PCI")
+
+    assert np.allclose([res_eci[key] for key in eci.index], eci.to_numpy())
+    assert np.allclose([res_pci[key] for key in pci.index], pci.to_numpy())
+
+
+def test_complexity_warm_start_matches_pandas(df_global_exports, df_rca):
+    df = pl.from_pandas(df_global_exports)
+    eci, _, state = ec.complexity(df_rca, iterations=200, tol=1e-8, return_state=True)
+
+    rca = ecp.rca(df, **params)
+    _, _, res_state = ecp.complexity(
+        rca, iterations=200, tol=1e-8, return_state=True, **params
+    )
+    assert res_state.converged
+    assert res_state.iterations == state.iterations
+
+    res_eci, _, res_warm = ecp.complexity(
+        rca,
+        iterations=200,
+        tol=1e-8,
+        initial=(res_state.kc, res_state.kp),
+        return_state=True,
+        **params,
+    )
+    assert res_warm.iterations < res_state.iterations
+
+    res = _to_dict(res_eci, "Country ID", "Trade Value ECI")
+    assert np.allclose([res[key] for key in eci.index], eci.to_numpy(), atol=1e-5)
+
+
+def test_relatedness_matches_pandas(df_global_exports, df_rca):
+    df = pl.from_pandas(df_global_exports)
+    relt = ec.relatedness(df_rca)
+
+    res = ecp.run("relatedness", df, **params)
+    assert res.shape == (226, 22)
+
+    locations = res["Country ID"].to_list()
+    values = res.select([str(col) for col in relt.columns]).to_numpy()
+    assert np.allclose(values, relt.loc[locations].to_numpy())
+
+
+def test_rca_matches_pandas(df_global_exports, df_rca):
+    df = pl.from_pandas(df_global_exports)
+    res = ecp.rca(df, **params).collect()
+
+    keys = list(zip(res["Country ID"], res["Section ID"]))
+    expected = [df_rca.at[key] for key in keys]
+    assert np.allclose(res["Trade Value RCA"].to_numpy(), expected)
+
+
+def test_rca_group_and_sparse(df_global_exports):
+    df = pl.from_pandas(df_global_exports)
+    stacked = pl.concat(
+        [
+            df.with_columns(pl.lit(2020).alias("Year")),
+            df.with_columns(pl.lit(2021).alias("Year"), pl.col("Trade Value") * 2),
+        ]
+    )
+
+    single = ecp.rca(df, **params).collect().sort("Country ID", "Section ID")
+    grouped = ecp.rca(stacked, group="Year", **params).collect()
+    for _, part in grouped.group_by("Year"):
+        part = part.sort("Country ID", "Section ID")
+        assert np.allclose(part["Trade Value RCA"], single["Trade Value RCA"])
+
+    # the groups are not added up when pivoted
+    with pytest.raises(ValueError, match="duplicated"):
+        ecp.complexity(grouped, **params)
+
+    sparse = ecp.rca(df, sparse=True, cutoff=1, **params).collect()
+    assert sparse.height == single.filter(pl.col("Trade Value RCA") >= 1).height
+    assert sparse["Trade Value RCA"].min() >= 1
+
+
+def _assert_tidy_equals(res: pl.DataFrame, expected, value: str):
+    rows, cols = res.columns[:2]
+    assert res.height == expected.size
+    matrix = expected.loc[res[rows].to_list()].to_numpy()
+    positions = expected.columns.get_indexer(res[cols].to_list())
+    assert np.allclose(
+        res[value].to_numpy(),
+        matrix[np.arange(res.height), positions],
+        equal_nan=True,
+    )
+
+
+def test_indicators_match_pandas(df_global_exports, df_rca):
+    rca = ecp.rca(pl.from_pandas(df_global_exports), **params).collect()
+    prox = ecp.proximity(rca, **params)
+    _, pci = ec.complexity(df_rca)
+    _, pl_pci = ecp.complexity(rca, **params)
+
+    _assert_tidy_equals(
+        ecp.distance(rca, prox, **params), ec.distance(df_rca), "Trade Value Distance"
+    )
+    _assert_tidy_equals(
+        ecp.relative_relatedness(rca, prox, **params),
+        ec.relative_relatedness(df_rca),
+        "Trade Value Relative Relatedness",
+    )
+    _assert_tidy_equals(
+        ecp.opportunity_gain(rca, pl_pci, prox, **params),
+        ec.opportunity_gain(df_rca, pci=pci),
+        "Trade Value Opportunity Gain",
+    )
+    _assert_tidy_equals(
+        ecp.similarity(rca, **params),
+        ec.similarity(df_rca),
+        "Trade Value Similarity",
+    )
+
+
+def test_pgi_matches_pandas(df_global_exports, df_rca):
+    rca = ecp.rca(pl.from_pandas(df_global_exports), **params).collect()
+    tbl = df_global_exports.pivot(
+        index="Country ID", columns="Section ID", values="Trade Value"
+    )
+    gini = pd.DataFrame(
+        {"gini": np.linspace(0.2, 0.6, 200)}, index=df_rca.index[:200]
+    )
+
+    expected = ec.pgi(tbl, df_rca, gini)
+    res = ecp.pgi(rca, pl.from_pandas(gini.reset_index()), **params)
+    values = _to_dict(res, "Section ID", "pgi")
+    assert np.allclose([values[key] for key in expected.index], expected["pgi"])
+
+
+def test_cross_space_matches_pandas(df_global_exports, df_rca):
+    rca = ecp.rca(pl.from_pandas(df_global_exports), **params).collect()
+    x_prox = ecp.cross_proximity(
+        rca,
+        rca,
+        location="Country ID",
+        activity_a="Section ID",
+        activity_b="Section ID",
+        measure_a="Trade Value",
+        measure_b="Trade Value",
+    )
+    expected = ec.cross_proximity(df_rca, df_rca)
+    _assert_tidy_equals(x_prox, expected, "Cross Proximity")
+
+    _assert_tidy_equals(
+        ecp.cross_relatedness(rca, x_prox, **params),
+        ec.cross_relatedness(df_rca, expected),
+        "Trade Value Cross Relatedness",
+    )
+
+
+def test_complexity_subnational_matches_pandas(df_global_exports, df_rca):
+    rca = ecp.rca(pl.from_pandas(df_global_exports), **params).collect()
+    _, pci = ec.complexity(df_rca)
+    pci = pci.iloc[:-3]
+
+    eci, _ = ec.complexity_subnational(df_rca, pci)
+    res, _ = ecp.complexity_subnational(
+        rca, pl.from_pandas(pci.rename("PCI").reset_index()), **params
+    )
+    values = _to_dict(res, "Country ID", "Trade Value ECI")
+    assert np.allclose([values[key] for key in eci.index], eci.to_numpy())
+
+
+def test_run_models_with_inputs(df_global_exports):
+    df = pl.from_pandas(df_global_exports)
+    pci = ecp.run("pci", df, **params)
+
+    res = ecp.run("eci_subnational", df, pci_external=pci, **params)
+    assert res.height == 226
+    assert ecp.run("distance", df, **params).height == 226 * 21
+
+    with pytest.raises(ValueError, match="requires the `gini` argument"):
+        ecp.run("pgi", df, **params)
+
+
+def test_run_binary_with_cutoff(df_global_exports, df_rca):
+    df = pl.from_pandas(df_global_exports)
+    # the cutoff is applied once, by the binary RCA
+    mcp = (df_rca >= 1.5).astype(float)
+    eci, _ = ec.complexity(mcp)
+
+    res = ecp.run("eci", df, binary=True, cutoff=1.5, **params)
+    res_eci = _to_dict(res, "Country ID", "Trade Value ECI")
+    assert np.allclose([res_eci[key] for key in eci.index], eci.to_numpy())
+
+    res = ecp.run("relatedness", df, binary=True, cutoff=1.5, **params)
+    relt = ec.relatedness(mcp)
+    values = res.select([str(col) for col in relt.columns]).to_numpy()
+    assert np.allclose(values, relt.loc[res["Country ID"].to_list()].to_numpy())
+
+
+def test_matrix_interchange_without_copies():
+    values = empty_matrix((4, 3))
+    values[:] = np.arange(12).reshape(4, 3)
+    index = pl.Series("loc", list("wxyz"))
+    df = from_matrix(values, columns=["a", "b", "c"], index=index)
+
+    # the columns of the frame are views of the matrix
+    for i, column in enumerate(["a", "b", "c"]):
+        assert np.shares_memory(df.get_column(column).to_numpy(), values[:, i])
+
+    # and the frame is read back as a view of the same matrix
+    matrix, locations, activities = to_matrix(df, location="loc")
+    assert np.shares_memory(matrix, values)
+    assert np.array_equal(matrix, values)
+    assert locations.to_list() == list("wxyz")
+    assert activities.to_list() == ["a", "b", "c"]
+
+
+def test_relatedness_without_copies(df_global_exports):
+    df = pl.from_pandas(df_global_exports)
+    rca = ecp.rca(df, **params).collect()
+    proximities = ecp.proximity(rca, **params)
+    res = ecp.relatedness(rca, proximities, **params)
+
+    # the pivoted result is passed back to the numpy core as a view
+    matrix, _, _ = to_matrix(res, location="Country ID")
+    for column in res.columns[:-1]:
+        assert np.shares_memory(matrix, res.get_column(column).to_numpy())
+    assert np.array_equal(matrix, res.drop("Country ID").to_numpy(), equal_nan=True)
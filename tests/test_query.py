@@ -0,0 +1,37 @@
+import numpy as np
+
+import economic_complexity as ec
+from economic_complexity.query import top_n
+
+
+def test_ranking_index_relatedness(df_rca):
+    relt = ec.relatedness(df_rca)
+    index = ec.RankingIndex.from_frame(relt, n=5, dtype=np.float64)
+    assert index.indices.shape == (226, 5)
+
+    location = relt.index[0]
+    labels, values = index.top(location)
+    expected = relt.loc[location].sort_values(ascending=False, kind="stable")
+    assert list(labels) == list(expected.index[:5])
+    assert np.allclose(values, expected.to_numpy()[:5])
+
+
+def test_ranking_index_similarity(df_rca):
+    simi = ec.similarity(df_rca)
+    index = ec.RankingIndex.from_frame(simi, n=10, exclude_self=True)
+
+    locations = list(simi.index[:3])
+    labels, values = index.top_batch(locations, n=3)
+    assert labels.shape == values.shape == (3, 3)
+    for location, row in zip(locations, labels):
+        assert location not in row
+    assert np.all(np.diff(values, axis=1) <= 0)
+
+
+def test_top_n_excluded_after_nan():
+    values = np.array([[0.0, np.nan, np.nan, 0.5], [np.nan, 0.2, 0.1, np.nan]])
+    indices, top = top_n(values, n=3, exclude=np.array([0, 2]))
+    assert 0 not in indices[0] and 2 not in indices[1]
+    assert indices[:, 0].tolist() == [3, 1]
+    np.testing.assert_array_equal(top[:, 0], [0.5, 0.2])
+    assert np.isnan(top[:, 1:]).all()
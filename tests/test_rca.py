@@ -2,6 +2,7 @@ import numpy as np
 import pandas as pd
 
 import economic_complexity as ec
+import economic_complexity.numpy as ecn
 
 
 def test_rca(df_exports):
@@ -33,3 +34,36 @@ def test_rca(df_exports):
     assert section_9["50%"] == 0.267903
     assert section_9["75%"] == 1.264129
     assert section_9["max"] == 75.963223
+
+
+def test_rca_lean_modes(df_global_exports):
+    tbl = df_global_exports.pivot(
+        index="Country ID", columns="Section ID", values="Trade Value"
+    )
+    original = tbl.copy()
+    expected = ec.rca(tbl)
+
+    chunked = ec.rca(tbl, chunksize=7, dtype=np.float32)
+    assert chunked.dtypes.eq(np.float32).all()
+    assert np.allclose(chunked.to_numpy(), expected.to_numpy(), rtol=1e-6)
+
+    binary = ec.rca(tbl, binary=True, dtype=bool, chunksize=50)
+    assert binary.dtypes.eq(bool).all()
+    assert (binary.to_numpy() == (expected.to_numpy() >= 1)).all()
+
+    # the input frame is never modified
+    pd.testing.assert_frame_equal(tbl, original)
+
+    # integer input is converted once, and that copy holds the result
+    rounded = tbl.fillna(0).round()
+    counts = ec.rca(rounded.astype(np.int64))
+    assert np.allclose(counts.to_numpy(), ec.rca(rounded).to_numpy())
+
+
+def test_rca_in_place():
+    values = np.array([[1.0, np.nan, 3.0], [4.0, 5.0, 0.0], [0.0, 0.0, 0.0]])
+    expected = ecn.rca(values)
+
+    result = ecn.rca(values, out=values, chunksize=1)
+    assert result is values
+    np.testing.assert_allclose(result, expected, equal_nan=True)
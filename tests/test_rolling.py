@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+import economic_complexity as ec
+import economic_complexity.numpy as ecn
+import economic_complexity.polars as ecp
+
+from .conftest import activity, location, measure
+
+
+@pytest.fixture
+def df_periods(df_global_exports):
+    # synthetic yearly data, built by rescaling the fixture
+    rng = np.random.default_rng(0)
+    frames = []
+    for year in range(2015, 2021):
+        df = df_global_exports[[location, activity, measure]].copy()
+        df[measure] = df[measure] * rng.uniform(0.5, 1.5, len(df))
+        frames.append(df.sample(frac=0.95, random_state=year).assign(Year=year))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_window_sums():
+    tbls = np.arange(5 * 2 * 3, dtype=float).reshape(5, 2, 3)
+    sums = [values.copy() for values in ecn.rolling.window_sums(tbls, 2)]
+    assert len(sums) == 4
+    for i, values in enumerate(sums):
+        np.testing.assert_allclose(values, tbls[i : i + 2].sum(axis=0))
+
+    with pytest.raises(ValueError):
+        next(ecn.rolling.window_sums(tbls, 6))
+
+
+def test_rolling_binary_complexity_cutoff():
+    rng = np.random.default_rng(0)
+    tbls = rng.random((4, 30, 20)) * 1000
+
+    binary = ecn.rolling.calculate_rolling_rca(
+        tbls, window=2, binary=True, cutoff=1.5, complexity=True
+    )
+    plain = ecn.rolling.calculate_rolling_rca(
+        tbls, window=2, cutoff=1.5, complexity=True
+    )
+    np.testing.assert_allclose(binary.eci, plain.eci)
+    np.testing.assert_allclose(binary.pci, plain.pci)
+
+
+def test_window_sums_location_leaves():
+    rng = np.random.default_rng(0)
+    tbls = rng.random((6, 5, 4)) * 1000
+    # the first location disappears from the data in the fourth period
+    tbls[3:, 0] = 0
+
+    result = ecn.rolling_rca(tbls, window=3, binary=True)
+    for i in range(len(result.rca)):
+        expected = ecn.rca(tbls[i : i + 3].sum(axis=0), binary=True)
+        np.testing.assert_array_equal(result.rca[i], expected)
+
+    last = ecn.rolling_rca(tbls, window=3).rca[-1]
+    assert np.isnan(last[0]).all()
+    np.testing.assert_allclose(last[1:], ecn.rca(tbls[3:].sum(axis=0))[1:])
+
+
+def test_rolling_rca(df_periods):
+    tbls = {
+        year: df.pivot(index=location, columns=activity, values=measure)
+        for year, df in df_periods.groupby("Year")
+    }
+    windows = ec.rolling_rca(tbls, window=3, complexity=True)
+    assert list(windows) == [2017, 2018, 2019, 2020]
+
+    for end, result in windows.items():
+        df = df_periods[df_periods["Year"].between(end - 2, end)]
+        tbl = df.pivot_table(
+            index=location, columns=activity, values=measure, aggfunc="sum"
+        )
+        expected = ec.rca(tbl.fillna(0))
+        pd.testing.assert_frame_equal(
+            result.rca.loc[expected.index, expected.columns],
+            expected,
+            check_names=False,
+        )
+
+        eci, pci = ec.complexity(expected)
+        pd.testing.assert_series_equal(
+            result.eci.loc[eci.index], eci, check_names=False
+        )
+        pd.testing.assert_series_equal(
+            result.pci.loc[pci.index], pci, check_names=False
+        )
+
+    binary = ec.rolling_rca(tbls, window=2, binary=True)
+    assert binary[2016].eci is None
+    assert set(np.unique(binary[2016].rca.to_numpy())) <= {0.0, 1.0}
+
+
+def test_rolling_rca_polars(df_periods):
+    rca, eci, pci = ecp.rolling_rca(
+        pl.from_pandas(df_periods),
+        activity=activity,
+        location=location,
+        measure=measure,
+        period="Year",
+        window=3,
+        complexity=True,
+    )
+    assert rca.get_column("Year").unique().sort().to_list() == [2017, 2018, 2019, 2020]
+
+    tbls = {
+        year: df.pivot(index=location, columns=activity, values=measure)
+        for year, df in df_periods.groupby("Year")
+    }
+    windows = ec.rolling_rca(tbls, window=3, complexity=True)
+    for end, result in windows.items():
+        frame = rca.filter(pl.col("Year") == end)
+        actual = dict(
+            zip(
+                zip(frame[location].to_list(), frame[activity].to_list()),
+                frame[f"{measure} RCA"].to_list(),
+            )
+        )
+        expected = result.rca
+        np.testing.assert_allclose(
+            [[actual[row, col] for col in expected.columns] for row in expected.index],
+            expected.to_numpy(),
+        )
+
+        frame = eci.filter(pl.col("Year") == end)
+        actual = dict(zip(frame[location].to_list(), frame[f"{measure} ECI"].to_list()))
+        np.testing.assert_allclose(
+            [actual[key] for key in result.eci.index], result.eci.to_numpy()
+        )
+        assert pci.filter(pl.col("Year") == end).height == len(result.pci)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+import economic_complexity as ec
+from economic_complexity.numpy.complexity import calculate_complexity
+from economic_complexity.numpy.product_space import (
+    calculate_opportunity_gain,
+    calculate_proximity,
+)
+from economic_complexity.numpy.scenarios import (
+    evaluate_scenario,
+    evaluate_scenarios,
+    prepare_baseline,
+)
+
+
+def _recalculated(rcas: np.ndarray, edits):
+    rcas = rcas.copy()
+    for row, col, value in edits:
+        rcas[row, col] = 2.0 if value else 0.0
+    eci, pci = calculate_complexity(rcas, iterations=200, tol=1e-8, engine="dense")
+    proximities = calculate_proximity(rcas, engine="dense")
+    opp_gain = calculate_opportunity_gain(rcas, pci=pci, proximities=proximities)
+    return eci, pci, proximities, opp_gain
+
+
+def test_scenarios_match_recalculation(df_rca):
+    rcas = df_rca.to_numpy(dtype=float)
+    baseline = prepare_baseline(rcas)
+    assert baseline.state.converged
+
+    scenarios = [
+        [(0, 3, True), (0, 4, True), (0, 5, True)],
+        [(10, 0, False), (20, 1, True)],
+        # repeated cells use the last edit
+        [(30, 2, True), (30, 2, False)],
+    ]
+    results = evaluate_scenarios(baseline, scenarios, max_workers=2)
+
+    for edits, result in zip(scenarios, results):
+        eci, pci, proximities, opp_gain = _recalculated(rcas, edits)
+        assert result.converged
+        assert np.allclose(result.eci, eci, atol=1e-6, equal_nan=True)
+        assert np.allclose(result.pci, pci, atol=1e-6)
+        assert np.allclose(result.proximities, proximities)
+        assert np.allclose(
+            result.opportunity_gain, opp_gain[result.locations], atol=1e-6
+        )
+
+    assert list(results[0].locations) == [0]
+    assert list(results[1].locations) == [10, 20]
+
+
+def test_scenario_without_changes(df_rca):
+    rcas = df_rca.to_numpy(dtype=float)
+    baseline = prepare_baseline(rcas)
+
+    # the cell is already over the cutoff
+    row, col = np.argwhere(rcas >= 1)[0]
+    result = evaluate_scenario(baseline, [(row, col, True)], locations=[row])
+
+    assert np.allclose(result.eci, baseline.eci, atol=1e-6)
+    assert np.allclose(result.proximities, baseline.proximities)
+    assert result.opportunity_gain.shape == (1, rcas.shape[1])
+
+
+def test_what_if(df_rca):
+    location = df_rca.index[0]
+    gained = [
+        activity for activity in df_rca.columns if df_rca.loc[location, activity] < 1
+    ]
+
+    results = ec.what_if(
+        df_rca,
+        {
+            "gain": [(location, activity) for activity in gained[:3]],
+            "lose": [(location, gained[0], False)],
+        },
+        locations=[location, df_rca.index[1]],
+    )
+
+    gain = results["gain"]
+    assert gain.converged
+    assert gain.eci.index.equals(df_rca.index)
+    assert gain.pci.index.equals(df_rca.columns)
+    assert list(gain.opportunity_gain.index) == [location, df_rca.index[1]]
+    assert gain.eci_change[location] != 0
+
+    # the location didn't have advantages there, so nothing changes
+    assert results["lose"].eci_change.abs().max() < 1e-6
+    assert isinstance(results["lose"].opportunity_gain, pd.DataFrame)
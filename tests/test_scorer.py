@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import economic_complexity as ec
+from economic_complexity.numpy.complexity import calculate_complexity
+from economic_complexity.numpy.product_space import (
+    calculate_distance,
+    calculate_opportunity_gain,
+    calculate_proximity,
+    calculate_relatedness,
+)
+from economic_complexity.numpy.scorer import PortfolioScorer
+from economic_complexity.numpy.subnational import calculate_complexity_subnational
+
+
+def test_scorer_matches_full_calculations(df_rca):
+    rcas = df_rca.to_numpy(dtype=float)
+    reference, new = rcas[:200], rcas[200:]
+
+    scorer = PortfolioScorer.from_rca(reference)
+    scores = scorer.score(new)
+
+    proximities = calculate_proximity(reference)
+    _, pci = calculate_complexity(reference)
+    np.testing.assert_allclose(
+        scores.relatedness,
+        calculate_relatedness(new, proximities=proximities, engine="dense"),
+    )
+    np.testing.assert_allclose(
+        scores.distance, calculate_distance(new, proximities=proximities)
+    )
+    np.testing.assert_allclose(
+        scores.opportunity_gain,
+        calculate_opportunity_gain(new, pci=pci, proximities=proximities),
+        atol=1e-12,
+    )
+    eci, _ = calculate_complexity_subnational(new, pci)
+    np.testing.assert_allclose(scores.eci, eci)
+
+    # a binary row scores the same as its RCA row
+    binary = scorer.score((new[0] >= 1).astype(float))
+    np.testing.assert_allclose(binary.relatedness, scores.relatedness[:1])
+
+    with pytest.raises(ValueError):
+        scorer.score(new[:, 1:])
+
+
+def test_scorer_ignores_unknown_pci(df_rca):
+    rcas = df_rca.to_numpy(dtype=float)
+    pci = np.linspace(-1, 1, rcas.shape[1])
+    pci[2] = np.nan
+
+    scorer = PortfolioScorer(calculate_proximity(rcas), pci)
+    eci, _ = calculate_complexity_subnational(rcas, pci)
+    np.testing.assert_allclose(scorer.score(rcas).eci, eci, atol=1e-12)
+
+
+def test_scorer_pandas(df_rca):
+    reference, new = df_rca.iloc[:200], df_rca.iloc[200:]
+
+    scorer = ec.PortfolioScorer.from_rca(reference)
+    assert scorer.proximities.index.equals(df_rca.columns)
+
+    # the columns are aligned, and the missing ones have no advantages
+    shuffled = new[new.columns[::-1]]
+    scores = scorer.score(shuffled)
+    assert scores.relatedness.index.equals(new.index)
+    assert scores.relatedness.columns.equals(df_rca.columns)
+
+    expected = ec.relatedness(new, proximities=scorer.proximities)
+    pd.testing.assert_frame_equal(scores.relatedness, expected)
+
+    partial = scorer.score(new.drop(columns=new.columns[0]))
+    zeroed = new.copy()
+    zeroed[new.columns[0]] = 0.0
+    pd.testing.assert_frame_equal(
+        partial.relatedness, scorer.score(zeroed).relatedness
+    )
@@ -0,0 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+
+import economic_complexity.numpy as ecn
+
+
+def test_sharded_complexity(df_rca):
+    rcas = df_rca.to_numpy()
+    blocks = np.array_split(rcas, 5)
+
+    with ThreadPoolExecutor(2) as executor:
+        eci, pci = ecn.sharded_complexity(blocks, executor=executor)
+
+    expected_eci, expected_pci = ecn.complexity(rcas)
+    assert np.allclose(eci, expected_eci)
+    assert np.allclose(pci, expected_pci)
+
+
+def test_sharded_proximity_from_files(tmp_path, df_rca):
+    rcas = df_rca.to_numpy()
+    blocks = []
+    for i, block in enumerate(np.array_split(rcas, 3)):
+        path = tmp_path / f"block_{i}.npy"
+        np.save(path, block)
+        blocks.append(partial(np.load, path))
+
+    prox = ecn.sharded_proximity(blocks)
+    assert np.allclose(prox, ecn.proximity(rcas))
@@ -0,0 +1,66 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import economic_complexity as ec
+from economic_complexity._pandas import to_array
+from economic_complexity.numpy.rca import binarize
+
+
+def _relatedness_sum(name: str) -> float:
+    with ec.attach_shared(name) as shared:
+        relatedness = ec.relatedness(shared["mcp"], proximities=shared["proximity"])
+        return float(np.nansum(relatedness.to_numpy()))
+
+
+def test_publish_attach(df_rca):
+    prox = ec.proximity(df_rca)
+    mcp = pd.DataFrame(binarize(df_rca.to_numpy()), df_rca.index, df_rca.columns)
+    pci = ec.complexity(df_rca)[1]
+
+    with ec.publish_shared({"proximity": prox, "mcp": mcp, "pci": pci}) as shared:
+        attached = ec.attach_shared(shared.name)
+        assert list(attached) == ["proximity", "mcp", "pci"]
+        pd.testing.assert_frame_equal(attached["proximity"], prox)
+        pd.testing.assert_series_equal(attached["pci"], pci)
+
+        # the objects are read-only views, passed to the calculations as-is
+        values = attached["proximity"].to_numpy()
+        assert not values.flags.writeable
+        assert np.shares_memory(values, to_array(attached["proximity"]))
+
+        opp_gain = ec.opportunity_gain(
+            attached["mcp"], pci=attached["pci"], proximities=attached["proximity"]
+        )
+        expected = ec.opportunity_gain(df_rca, pci=pci, proximities=prox)
+        pd.testing.assert_frame_equal(opp_gain, expected)
+
+        del values, opp_gain
+        attached.close()
+
+    with pytest.raises(FileNotFoundError):
+        ec.attach_shared(shared.name)
+
+
+def test_attach_from_workers(df_rca):
+    prox = ec.proximity(df_rca)
+    mcp = pd.DataFrame(binarize(df_rca.to_numpy()), df_rca.index, df_rca.columns)
+    expected = np.nansum(ec.relatedness(df_rca, proximities=prox).to_numpy())
+
+    with ec.publish_shared({"proximity": prox, "mcp": mcp}) as shared:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=2, mp_context=context) as pool:
+            results = list(pool.map(_relatedness_sum, [shared.name] * 2))
+
+        # the workers exiting doesn't remove the shared memory
+        ec.attach_shared(shared.name).close()
+
+    assert np.allclose(results, expected)
+
+
+def test_publish_rejects_objects():
+    with pytest.raises(TypeError):
+        ec.publish_shared({"labels": np.array(["a", "b"], dtype=object)})
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import economic_complexity as ec
+import economic_complexity.numpy as ecn
+
+
+def test_iter_tidy(df_rca):
+    rcas = df_rca.to_numpy()
+    expected = ecn.relatedness(rcas)
+
+    def calculate(block, out):
+        return ecn.relatedness(block, proximities=ecn.proximity(rcas), out=out)
+
+    chunks = list(ecn.iter_tidy(calculate, rcas, chunksize=50))
+    assert len(chunks) == 5
+
+    rows = np.concatenate([chunk.rows for chunk in chunks])
+    columns = np.concatenate([chunk.columns for chunk in chunks])
+    values = np.concatenate([chunk.values for chunk in chunks])
+    np.testing.assert_array_equal(values, expected[rows, columns])
+    assert len(values) == expected.size
+
+    chunks = ecn.iter_tidy(calculate, rcas, chunksize=50, top=3, threshold=0.2)
+    for chunk in chunks:
+        assert (chunk.values >= 0.2).all()
+        assert np.bincount(chunk.rows).max() <= 3
+        for row in np.unique(chunk.rows):
+            top = np.sort(expected[row])[::-1][:3]
+            np.testing.assert_allclose(chunk.values[chunk.rows == row], top[top >= 0.2])
+
+
+def test_stream_tidy(df_rca, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    batches = list(ec.stream_tidy(df_rca, "distance", chunksize=100))
+    assert len(batches) == 3
+    assert all(isinstance(batch, pa.RecordBatch) for batch in batches)
+
+    expected = ec.distance(df_rca).unstack().reset_index(name="distance")
+    table = pa.Table.from_batches(batches).to_pandas()
+    actual = table.astype({"Country ID": str, "Section ID": int})
+    actual = actual.set_index(["Section ID", "Country ID"])["distance"]
+    pd.testing.assert_series_equal(
+        actual.loc[expected.set_index(["Section ID", "Country ID"]).index],
+        expected.set_index(["Section ID", "Country ID"])["distance"],
+    )
+
+    x_proximity = ec.cross_proximity(df_rca, df_rca)
+    path = ec.write_tidy(
+        tmp_path / "x.parquet",
+        df_rca,
+        "cross_relatedness",
+        x_proximity=x_proximity,
+        chunksize=60,
+        top=5,
+    )
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_row_groups == 4
+    assert metadata.num_rows == 5 * len(df_rca)
+
+    with pytest.raises(ValueError):
+        next(ec.stream_tidy(df_rca, "cross_relatedness"))
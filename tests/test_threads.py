@@ -0,0 +1,76 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from economic_complexity.numpy.threads import (
+    HAS_THREADPOOLCTL,
+    available_cores,
+    executor_or_pool,
+    process_pool,
+    split_threads,
+    thread_budget,
+    thread_pool,
+)
+
+
+def test_split_threads(monkeypatch):
+    monkeypatch.setenv("ECONOMIC_COMPLEXITY_THREADS", "8")
+    assert available_cores() == 8
+    assert split_threads() == (8, 1)
+    assert split_threads(2) == (2, 4)
+    assert split_threads(3) == (3, 2)
+    # the spare cores go to the BLAS threads
+    assert split_threads(None, tasks=2) == (2, 4)
+    assert split_threads(16) == (16, 1)
+    assert split_threads(0) == (1, 8)
+
+
+def test_thread_pool(monkeypatch):
+    monkeypatch.setenv("ECONOMIC_COMPLEXITY_THREADS", "4")
+    with thread_pool(tasks=2) as pool:
+        assert pool._max_workers == 2
+        assert list(pool.map(abs, [-1, -2, 3])) == [1, 2, 3]
+
+
+@pytest.mark.skipif(not HAS_THREADPOOLCTL, reason="threadpoolctl not installed")
+def test_thread_budget_blas():
+    from threadpoolctl import threadpool_info
+
+    with thread_budget(1):
+        assert all(item["num_threads"] == 1 for item in threadpool_info())
+
+
+def test_thread_budget_numba():
+    numba = pytest.importorskip("numba")
+
+    previous = numba.get_num_threads()
+    with thread_budget(1):
+        assert numba.get_num_threads() == 1
+    assert numba.get_num_threads() == previous
+
+    with thread_budget(None):
+        assert numba.get_num_threads() == previous
+
+
+def test_process_pool(monkeypatch):
+    monkeypatch.setenv("ECONOMIC_COMPLEXITY_THREADS", "4")
+    with process_pool(2) as pool:
+        # set in each worker when it starts, as polars isn't imported yet
+        assert pool.submit(os.getenv, "POLARS_MAX_THREADS").result() == "2"
+
+
+def test_executor_or_pool(monkeypatch):
+    monkeypatch.setenv("ECONOMIC_COMPLEXITY_THREADS", "4")
+    with ThreadPoolExecutor(1) as executor:
+        with executor_or_pool(executor, processes=True) as pool:
+            assert pool is executor
+        # the provided executor is not shut down
+        assert executor.submit(abs, -1).result() == 1
+
+    with executor_or_pool(None, tasks=2) as pool:
+        assert isinstance(pool, ThreadPoolExecutor)
+        assert pool._max_workers == 2
+
+    with executor_or_pool(None, 2, processes=True) as pool:
+        assert isinstance(pool, ProcessPoolExecutor)